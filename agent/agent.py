@@ -3,6 +3,7 @@ import asyncio
 import logging
 import sys
 from datetime import datetime
+from typing import Any, List, Optional
 from dotenv import load_dotenv
 from livekit import agents, rtc
 from livekit.agents import AutoSubscribe, JobContext, WorkerOptions, cli, llm
@@ -55,29 +56,60 @@ from response_cache import response_cache
 from clean_text_agent import CleanTextAssistant
 from clean_tts_wrapper import CleanTTSWrapper
 
-# Import the property context tool if MCP is not available
+# MCP-backed PMS tools (circuit breaker, hedged context) and the fallback context tool
 try:
-    from pms_mcp_tools import get_customer_properties_context
-except (ImportError, AttributeError):
+    from pms_mcp_tools import get_customer_properties_context, build_mcp_pms_tools, close_pms_mcp_client
+except (ImportError, AttributeError) as e:
+    logger.warning(f"PMS MCP tools not available: {e}")
     get_customer_properties_context = None
+    build_mcp_pms_tools = None
+    close_pms_mcp_client = None
+
+# In-process PMS tools (PMS_TOOLS_MODE=inprocess) skip the MCP HTTP/SSE hop
+try:
+    from pms_inprocess_tools import (
+        inprocess_mode_enabled, build_inprocess_pms_tools, start_inprocess_pms_tools, close_inprocess_pms_tools
+    )
+except ImportError as e:
+    logger.warning(f"In-process PMS tools not available: {e}")
+    inprocess_mode_enabled = lambda: False
+    build_inprocess_pms_tools = None
+    start_inprocess_pms_tools = None
+    close_inprocess_pms_tools = None
 
 # Get MCP server URL from environment
 PMS_MCP_SERVER_URL = os.getenv("PMS_MCP_SERVER_URL", "http://localhost:3001/sse")
+# "mcp" (default): PMS tools call the MCP server through PMSMCPClient, behind the circuit breaker;
+# "mcp_sse": LiveKit's own MCP client over SSE (no breaker); "inprocess": no server hop at all
+PMS_TOOLS_MODE = os.getenv("PMS_TOOLS_MODE", "mcp").lower()
 
 # Production mode detection
 IS_PRODUCTION = os.getenv("ENVIRONMENT", "development").lower() == "production"
 if IS_PRODUCTION:
     logger.info("Running in PRODUCTION mode")
 
+async def build_pms_tools() -> Optional[List[Any]]:
+    """PMS function tools for the configured mode, or None to let LiveKit's MCP client serve them"""
+    if inprocess_mode_enabled():
+        logger.info("Using in-process PMS tools")
+        return build_inprocess_pms_tools()
+    if PMS_TOOLS_MODE == "mcp" and build_mcp_pms_tools:
+        logger.info("Using MCP-backed PMS tools with circuit breaker")
+        return await build_mcp_pms_tools()
+    return None
+
+
 class Assistant(CleanTextAssistant):
-    def __init__(self) -> None:
+    def __init__(self, pms_tools: Optional[List[Any]] = None) -> None:
         logger.info("Initializing Assistant")
         # Initialize with tools - use direct tool if MCP not available
         tools = []
         mcp_servers = []
         
-        # Try to use MCP if available, otherwise fall back to direct tool
-        if mcp:
+        # Prefer tools built by build_pms_tools(), then LiveKit's MCP client, then the direct fallback tool
+        if pms_tools:
+            tools = pms_tools
+        elif mcp:
             logger.info("MCP module is available, attempting to configure MCP server")
             try:
                 mcp_servers = [
@@ -121,8 +153,8 @@ Guiding guests through the reservation process
 Answering common questions about the property and surrounding area
 Handling requests for changes or cancellations to reservations
 Escalating issues to the owner for non-standard or urgent cases
-Property Information Access via MCP: get_customer_properties_context tool
-Availability and Pricing Check via MCP: check_property_availability_and_pricing tool
+Property Information Access via MCP: get_customer_properties_context and get_property_details tools
+Availability and Pricing Check via MCP: check_property_availability_and_pricing and search_available_properties tools
 
 PRIMARY OBJECTIVE
 
@@ -204,20 +236,31 @@ PROPERTY CONTEXT USAGE
 
 ALWAYS use the get_customer_properties_context tool when:
 Guest asks about available properties
+Guest asks what properties do you have
+You need a property ID for another tool
+
+It returns one line per property: name, ID, status, type, city, guest capacity and bedrooms.
+
+ALWAYS use the get_property_details tool when:
 Guest wants specific property details
 Guest asks about amenities or features
 You need to provide location information
-Guest asks what properties do you have
 
-The tool provides:
-Complete property listings
-Property status (active/inactive)
-Locations and addresses
-Capacity and occupancy limits
-Property types and features
-Detailed descriptions
-WiFi credentials and door codes
-Property manager information
+Pass the property ID and only the sections the question needs:
+overview: capacity, property type, check-in and check-out times, property manager
+location: address, coordinates, time zone, nearby places
+access: WiFi credentials and door codes
+pricing: nightly prices, fees and taxes
+amenities: amenities and features
+descriptions: property descriptions
+policies: booking settings
+channels: booking channels and listings
+knowledge_base: answers to common guest questions
+media: photos, files and rooms
+other: license, custom fields and tags
+Pass language with the guest's language code (for example en) so only descriptions in that language come back.
+If the result says sections were left out, ask for just those sections when you need them.
+If get_property_details is not available, the property list already includes every detail.
 
 HANDLING PROPERTY QUESTIONS:
 If context is already loaded: Use the information immediately
@@ -238,8 +281,14 @@ Guest asks How much would it cost for X nights
 Guest mentions bringing pets (use include_pets parameter)
 You need to check if dates are available
 
+ALWAYS use the search_available_properties tool when:
+Guest asks what is free for dates without naming a property
+Guest asks which properties can host their group for dates
+It checks every property in one call and lists the available ones cheapest first with total prices.
+Never call check_property_availability_and_pricing once per property to answer these questions.
+
 REQUIRED INFORMATION TO COLLECT FIRST:
-Property ID from property context
+Property ID from property context (not needed for search_available_properties)
 Check-in date format: YYYY-MM-DD
 Check-out date format: YYYY-MM-DD
 Number of guests
@@ -279,7 +328,8 @@ Share the results conversationally
 
 RESPONSE HANDLING:
 If available: Great news! The villa is available from dates. The total cost for X nights with Y guests would be total, which includes breakdown.
-If not available: I'm sorry, but those dates are already booked. The property has reservations from conflicting dates. Would you like me to check alternative dates?
+If not available: I'm sorry, but those dates are already booked. The result lists the nearest available dates of the same length, so offer those right away, for example: Those dates are taken, but the villa is free from the 17th to the 20th, or from the 31st. Would either work?
+If availability could not be verified: Never say the dates are available. Share the price, explain you can't confirm the dates right now, and offer to check again in a moment
 If too many guests: Explain the maximum occupancy limit
 
 COMMON QUESTIONS AND RESPONSES
@@ -378,9 +428,17 @@ async def entrypoint(ctx: JobContext):
         
         # Continue without session logging
         
+        # Release the shared PMS MCP connection pool when the worker shuts down
+        if close_pms_mcp_client:
+            ctx.add_shutdown_callback(close_pms_mcp_client)
+        if close_inprocess_pms_tools and inprocess_mode_enabled():
+            # Same prewarm as the MCP server's startup, so the first calls aren't cold
+            await start_inprocess_pms_tools()
+            ctx.add_shutdown_callback(close_inprocess_pms_tools)
+        
         # Create the assistant first
         logger.info("Creating Assistant instance")
-        assistant = Assistant()
+        assistant = Assistant(await build_pms_tools())
         logger.info("Assistant created successfully")
         
         # Configure the voice session with optimized parameters for v1.1.4
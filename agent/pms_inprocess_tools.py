@@ -0,0 +1,89 @@
+"""
+In-process PMS tools for the LiveKit voice agent
+
+This module registers the PMS MCP server's tools directly as LiveKit function
+tools, so a tool call is a plain function call instead of an HTTP POST plus an
+SSE event. All tools share a single PMSAPIClient. The external MCP server
+keeps running for other clients.
+
+Enable with PMS_TOOLS_MODE=inprocess.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List
+from livekit.agents import llm
+
+# The MCP server package ships next to the agent (see Dockerfile)
+from pms_mcp_server.src.api_client import PMSAPIClient
+from pms_mcp_server.src.tools import PMSTools
+
+logger = logging.getLogger(__name__)
+
+PMS_TOOLS_MODE = os.getenv("PMS_TOOLS_MODE", "mcp").lower()
+PMS_BASE_URL = os.getenv("PMS_BASE_URL", "https://pms.botel.ai")
+
+# Process-wide PMS client and tools shared by every in-process tool call
+_api_client: Optional[PMSAPIClient] = None
+_pms_tools: Optional[PMSTools] = None
+_start_task: Optional[asyncio.Task] = None
+
+
+def inprocess_mode_enabled() -> bool:
+    return PMS_TOOLS_MODE == "inprocess"
+
+
+def get_pms_tools() -> PMSTools:
+    """Return the shared PMSTools instance, creating it on first use"""
+    global _api_client, _pms_tools
+    if _pms_tools is None:
+        _api_client = PMSAPIClient(base_url=PMS_BASE_URL, api_key=os.getenv("PMS_API_KEY"))
+        _pms_tools = PMSTools(_api_client)
+    return _pms_tools
+
+
+async def start_inprocess_pms_tools():
+    """Prewarm the shared tools' context snapshot and occupancy indexes in the background"""
+    global _start_task
+    if _start_task is None:
+        _start_task = asyncio.create_task(get_pms_tools().start())
+
+
+async def close_inprocess_pms_tools():
+    """Close the shared PMS tools and API client (call on worker shutdown)"""
+    global _api_client, _pms_tools, _start_task
+    if _start_task is not None and not _start_task.done():
+        _start_task.cancel()
+    _start_task = None
+    if _pms_tools is not None:
+        await _pms_tools.close()
+    if _api_client is not None:
+        await _api_client.close()
+    _api_client = None
+    _pms_tools = None
+
+
+def _make_function_tool(name: str, description: str, parameters: Dict[str, Any]):
+    async def call_pms_tool(raw_arguments: Dict[str, Any]) -> str:
+        contents = await get_pms_tools().execute_tool(name, raw_arguments or {})
+        return "\n".join(item.text for item in contents)
+    
+    return llm.function_tool(
+        call_pms_tool,
+        raw_schema={
+            "name": name,
+            "description": description,
+            "parameters": parameters,
+        },
+    )
+
+
+def build_inprocess_pms_tools() -> List[Any]:
+    """Wrap every PMSTools tool as a LiveKit function tool"""
+    pms_tools = get_pms_tools().get_available_tools()
+    logger.info(f"Registering {len(pms_tools)} in-process PMS tools: {', '.join(tool.name for tool in pms_tools)}")
+    return [
+        _make_function_tool(tool.name, tool.description or "", tool.inputSchema)
+        for tool in pms_tools
+    ]
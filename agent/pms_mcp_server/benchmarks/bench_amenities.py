@@ -0,0 +1,124 @@
+"""
+Microbenchmark amenity classification and rendering
+
+Compares the former if/elif substring chain with the compiled
+AMENITY_CATEGORIES matcher, uncached and memoized, on a portfolio of
+generated amenities, and checks that every typeCode lands in the same
+category.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_amenities [--properties 500] [--amenities 40] [--codes 300] [--runs 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from src.property_renderer import AMENITY_CATEGORIES, classify_amenity, render_property_detail
+
+# Realistic codes plus composites that hit several categories
+BASE_CODES = [keyword for _, keywords in AMENITY_CATEGORIES for keyword in keywords] + [
+    "HAIR_DRYER", "IRON", "WASHER", "DRYER", "ELEVATOR", "GYM", "SAUNA", "WORKSPACE", "LUGGAGE_DROPOFF",
+]
+
+
+def legacy_category(type_code: str) -> str:
+    """The if/elif chain AMENITY_CATEGORIES replaced"""
+    if "KITCHEN" in type_code or "REFRIGERATOR" in type_code or "OVEN" in type_code or "MICROWAVE" in type_code:
+        return "Kitchen"
+    elif "BATHROOM" in type_code or "TUB" in type_code or "SHOWER" in type_code or "BIDET" in type_code:
+        return "Bathroom"
+    elif "BEDROOM" in type_code or "BED" in type_code or "LINENS" in type_code:
+        return "Bedroom"
+    elif "SAFETY" in type_code or "DETECTOR" in type_code or "EXTINGUISHER" in type_code or "FIRST_AID" in type_code:
+        return "Safety"
+    elif "CHILD" in type_code or "BABY" in type_code or "INFANT" in type_code:
+        return "Family"
+    elif "PARKING" in type_code or "GARAGE" in type_code:
+        return "Parking"
+    elif "POOL" in type_code or "BEACH" in type_code or "WATERFRONT" in type_code:
+        return "Water Features"
+    elif "INTERNET" in type_code or "WIFI" in type_code or "WIRELESS" in type_code:
+        return "Internet"
+    elif "TV" in type_code or "CABLE" in type_code or "SOUND" in type_code or "VIDEO" in type_code:
+        return "Entertainment"
+    elif "AIR_CONDITIONING" in type_code or "HEATING" in type_code or "FAN" in type_code:
+        return "Climate Control"
+    elif "OUTDOOR" in type_code or "GARDEN" in type_code or "BALCONY" in type_code or "PATIO" in type_code:
+        return "Outdoor"
+    return "Other"
+
+
+def make_codes(count: int, rng: random.Random) -> List[str]:
+    codes = set(BASE_CODES)
+    while len(codes) < count:
+        words = rng.sample(BASE_CODES, rng.randint(1, 3))
+        codes.add("_".join(words + [rng.choice(["", "PRIVATE", "SHARED", "OUTDOOR", "EXTRA"])]).strip("_"))
+    return sorted(codes)
+
+
+def make_portfolio(properties: int, amenities: int, codes: List[str], rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"prop-{i}",
+            "amenities": [
+                {"typeCode": code, "attributes": code.replace("_", " ").title(), "isPresent": True}
+                for code in rng.choices(codes, k=amenities)
+            ]
+        }
+        for i in range(properties)
+    ]
+
+
+def time_it(fn: Callable[[], Any], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=500)
+    parser.add_argument("--amenities", type=int, default=40, help="amenities per property")
+    parser.add_argument("--codes", type=int, default=300, help="distinct typeCodes in the portfolio")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    codes = make_codes(args.codes, rng)
+    portfolio = make_portfolio(args.properties, args.amenities, codes, rng)
+    type_codes = [a["typeCode"] for p in portfolio for a in p["amenities"]]
+
+    mismatches = [code for code in codes if legacy_category(code) != classify_amenity(code)]
+    print(f"{len(type_codes)} amenities, {len(codes)} distinct typeCodes, {len(mismatches)} category mismatches")
+    for code in mismatches[:10]:
+        print(f"  {code}: legacy {legacy_category(code)}, table {classify_amenity(code)}")
+
+    uncached = classify_amenity.__wrapped__
+
+    def cached():
+        for code in type_codes:
+            classify_amenity(code)
+
+    def render():
+        for detail in portfolio:
+            render_property_detail(detail, [], ["amenities"])
+
+    results = {
+        "if/elif chain": time_it(lambda: [legacy_category(code) for code in type_codes], args.runs),
+        "compiled matcher": time_it(lambda: [uncached(code) for code in type_codes], args.runs),
+        "memoized matcher": time_it(cached, args.runs),
+        "render amenities section": time_it(render, args.runs),
+    }
+    for name, ms in results.items():
+        print(f"{name:>26}: {ms:8.2f} ms ({ms * 1e6 / len(type_codes):6.0f} ns per amenity)")
+    print(f"cache: {classify_amenity.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark availability checks against a latency-injected fake backend
+
+Compares the former check (one 1,000-reservation request, strptime and a
+linear scan per call) with the occupancy index, cold and warm, and counts
+the queries whose answer differs from a brute-force check over every
+reservation.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_availability [--properties 10] [--reservations 2500] \\
+        [--queries 200] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.fake_backend import FakePMSBackend
+from src.occupancy import OccupancyStore
+
+Query = Tuple[str, date, date]
+
+
+async def legacy_conflicts(client: Any, property_id: str, check_in: date, check_out: date) -> List[str]:
+    """The streamed scan the occupancy index replaced"""
+    check_in_dt = datetime(check_in.year, check_in.month, check_in.day)
+    check_out_dt = datetime(check_out.year, check_out.month, check_out.day)
+    conflicts = []
+    async for reservation in client.stream_items("/api/Reservation/Get", params={
+        "propertyId": property_id,
+        "pageSize": 1000
+    }):
+        if not isinstance(reservation, dict) or reservation.get("status") in ["Cancelled", "Declined"]:
+            continue
+        res_in = datetime.strptime(reservation["checkIn"].split("T")[0], "%Y-%m-%d")
+        res_out = datetime.strptime(reservation["checkOut"].split("T")[0], "%Y-%m-%d")
+        if not (check_out_dt <= res_in or check_in_dt >= res_out):
+            conflicts.append(f"{res_in.strftime('%Y-%m-%d')} to {res_out.strftime('%Y-%m-%d')}")
+    return conflicts
+
+
+def brute_force_available(reservations: List[Dict[str, Any]], check_in: date, check_out: date) -> bool:
+    for reservation in reservations:
+        if reservation["status"] in ("Cancelled", "Declined"):
+            continue
+        res_in = date.fromisoformat(reservation["checkIn"][:10])
+        res_out = date.fromisoformat(reservation["checkOut"][:10])
+        if res_in < check_out and check_in < res_out:
+            return False
+    return True
+
+
+def make_queries(backend: FakePMSBackend, count: int, rng: random.Random) -> List[Query]:
+    queries = []
+    for _ in range(count):
+        prop = rng.choice(backend.properties)
+        last = backend.reservations[prop["id"]][-1]["checkOut"][:10]
+        span = (date.fromisoformat(last) - date(2025, 1, 1)).days
+        check_in = date(2025, 1, 1) + timedelta(days=rng.randint(0, span))
+        queries.append((prop["id"], check_in, check_in + timedelta(days=rng.randint(1, 7))))
+    return queries
+
+
+async def run(properties: int, reservations: int, queries: int, latency: float):
+    backend = FakePMSBackend(
+        property_count=properties, inactive_every=0, reservations_per_property=reservations, latency=latency, jitter=0
+    )
+    client = backend.client()
+    workload = make_queries(backend, queries, random.Random(7))
+    truth = [brute_force_available(backend.reservations[p], i, o) for p, i, o in workload]
+
+    async def measure(name: str, check) -> None:
+        requests = backend.requests
+        timings, wrong = [], 0
+        for (property_id, check_in, check_out), expected in zip(workload, truth):
+            started = time.perf_counter()
+            available = await check(property_id, check_in, check_out)
+            timings.append((time.perf_counter() - started) * 1000)
+            wrong += available != expected
+        ordered = sorted(timings)
+        print(
+            f"{name:>22}: mean {statistics.mean(timings):8.3f} ms | p50 {ordered[len(ordered) // 2]:8.3f} ms | "
+            f"{backend.requests - requests:5d} requests | {wrong} wrong answers"
+        )
+
+    async def legacy(property_id, check_in, check_out):
+        return not await legacy_conflicts(client, property_id, check_in, check_out)
+
+    store = OccupancyStore(client)
+
+    async def indexed(property_id, check_in, check_out):
+        return (await store.get(property_id)).is_available(check_in, check_out)
+
+    print(f"{properties} properties x {reservations} reservations, {queries} queries, {latency * 1000:.0f} ms latency")
+    await measure("legacy scan", legacy)
+    await measure("occupancy index, cold", indexed)
+    await measure("occupancy index, warm", indexed)
+    print(f"occupancy: {store.get_stats()}")
+    await store.close()
+    await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=10)
+    parser.add_argument("--reservations", type=int, default=2500, help="reservations per property")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.properties, args.reservations, args.queries, args.latency))
@@ -0,0 +1,130 @@
+"""
+Benchmark JSON decoding of large PMS list responses
+
+Compares decode time of the standard library against orjson and msgspec (when
+installed) and the peak memory of decoding a whole reservation list against
+streaming it item by item through src.json_codec.iter_items.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_json [--items 5000] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+from src import json_codec
+
+
+def make_reservations(count: int) -> bytes:
+    """A Reservation/Get style page: reservations with guest and pricing details"""
+    rng = random.Random(42)
+    start = date(2025, 1, 1)
+    items = []
+    for i in range(count):
+        check_in = start + timedelta(days=rng.randint(0, 365))
+        items.append({
+            "id": f"res-{i:06d}",
+            "propertyId": f"prop-{rng.randint(1, 40):03d}",
+            "status": rng.choice(["Confirmed", "Confirmed", "Pending", "Cancelled"]),
+            "checkIn": f"{check_in.isoformat()}T15:00:00",
+            "checkOut": f"{(check_in + timedelta(days=rng.randint(1, 14))).isoformat()}T11:00:00",
+            "guest": {
+                "firstName": "Guest",
+                "lastName": f"Number{i}",
+                "email": f"guest{i}@example.com",
+                "phone": f"+1555{i:07d}"
+            },
+            "guestCount": rng.randint(1, 6),
+            "totalPrice": round(rng.uniform(80, 4000), 2),
+            "currency": "EUR",
+            "notes": "Late arrival, needs parking. " * rng.randint(0, 4)
+        })
+    return json.dumps({"items": items, "totalCount": count}).encode()
+
+
+def available_decoders() -> Dict[str, Callable[[bytes], Any]]:
+    decoders = {"json": json.loads}
+    try:
+        import orjson
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+    return decoders
+
+
+def time_decode(decode: Callable[[bytes], Any], body: bytes, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(body)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def chunked(body: bytes, chunk_size: int = 16 * 1024):
+    for offset in range(0, len(body), chunk_size):
+        yield body[offset:offset + chunk_size]
+
+
+def count_active_full(body: bytes) -> int:
+    data = json_codec.loads(body)
+    return sum(1 for item in data["items"] if item["status"] != "Cancelled")
+
+
+async def count_active_streamed(body: bytes) -> int:
+    active = 0
+    async for item in json_codec.iter_items(chunked(body)):
+        if item["status"] != "Cancelled":
+            active += 1
+    return active
+
+
+def peak_memory(fn: Callable[[], Any]) -> float:
+    """Peak traced allocation in MiB while running fn"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main(items: int, repeat: int):
+    body = make_reservations(items)
+    print(f"{items} reservations, {len(body) / 1024:.0f} KiB, decode backend: {json_codec.JSON_BACKEND}")
+
+    baseline = None
+    for name, decode in available_decoders().items():
+        timings = time_decode(decode, body, repeat)
+        mean = statistics.mean(timings)
+        baseline = baseline or mean
+        print(f"{name:<8} mean {mean:.2f} ms | min {min(timings):.2f} ms | {baseline / mean:.1f}x vs json")
+
+    full_peak = peak_memory(lambda: count_active_full(body))
+    print(f"full decode    peak {full_peak:.1f} MiB")
+    if json_codec.STREAMING_AVAILABLE:
+        streamed_peak = peak_memory(lambda: asyncio.run(count_active_streamed(body)))
+        print(f"ijson stream   peak {streamed_peak:.1f} MiB")
+    else:
+        print("ijson not installed, streaming skipped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
@@ -0,0 +1,57 @@
+"""
+Benchmark get_customer_properties_context against a latency-injected fake backend
+
+Compares serial property detail fetching (concurrency 1, the old behaviour)
+with concurrent fetching at several semaphore sizes, and checks that the
+rendered context is identical in every case.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_property_context [--properties 60] [--latency 0.05] \\
+        [--jitter 0.01] [--concurrency 1 4 8 16] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List
+
+from benchmarks.fake_backend import FakePMSBackend
+from src.tools import PMSTools
+
+
+async def run(properties: int, latency: float, jitter: float, concurrency: List[int], runs: int):
+    reference = None
+    for limit in concurrency:
+        timings = []
+        for _ in range(runs):
+            backend = FakePMSBackend(property_count=properties, latency=latency, jitter=jitter)
+            client = backend.client()
+            tools = PMSTools(client, detail_concurrency=limit)
+            started = time.perf_counter()
+            result = await tools.execute_tool("get_customer_properties_context", {"format": "full"}, deadline=600)
+            timings.append((time.perf_counter() - started) * 1000)
+            await tools.close()
+            await client.close()
+
+        text = result[0].text
+        if reference is None:
+            reference = text
+        same = "identical" if text == reference else "DIFFERENT"
+        print(
+            f"concurrency {limit:>3}: mean {statistics.mean(timings):8.1f} ms | "
+            f"min {min(timings):8.1f} ms | {backend.requests} requests | output {same} ({len(text)} chars)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.properties, args.latency, args.jitter, args.concurrency, args.runs))
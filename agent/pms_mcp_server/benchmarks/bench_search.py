@@ -0,0 +1,62 @@
+"""
+Benchmark portfolio-wide availability search against a latency-injected fake backend
+
+Times one search_available_properties call against checking every property
+with check_property_availability_and_pricing, with warm occupancy indexes.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_search [--properties 200] [--reservations 200] [--latency 0.05] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.fake_backend import FakePMSBackend
+from src.tools import PMSTools
+
+STAY = {"check_in_date": "2025-03-10", "check_out_date": "2025-03-14", "guest_count": 4}
+
+
+async def timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return (time.perf_counter() - started) * 1000
+
+
+async def run(properties: int, reservations: int, latency: float, runs: int):
+    backend = FakePMSBackend(
+        property_count=properties, inactive_every=0, reservations_per_property=reservations, latency=latency, jitter=0
+    )
+    client = backend.client()
+    tools = PMSTools(client, snapshots=False)
+    await tools.start()
+    print(f"{properties} properties x {reservations} reservations, {latency * 1000:.0f} ms latency, indexes warm")
+
+    async def check_each():
+        for prop in backend.properties:
+            await tools.execute_tool("check_property_availability_and_pricing", {"property_id": prop["id"], **STAY})
+
+    for name, call in (
+        ("one search call", lambda: tools.execute_tool("search_available_properties", STAY)),
+        ("one check per property", check_each),
+    ):
+        requests = backend.requests
+        timings = [await timed(call()) for _ in range(runs)]
+        print(f"{name:>24}: {statistics.median(timings):9.1f} ms | {(backend.requests - requests) / runs:6.0f} requests per run")
+
+    await tools.close()
+    await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=200)
+    parser.add_argument("--reservations", type=int, default=200, help="reservations per property")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.properties, args.reservations, args.latency, args.runs))
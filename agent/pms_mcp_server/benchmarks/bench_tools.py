@@ -0,0 +1,88 @@
+"""
+Benchmark PMS tool calls against recorded PMS API traffic
+
+Record a fixture once against the live API, e.g. by running the server with
+PMS_RECORD_PATH=fixtures/pms.jsonl and making the tool calls you care about,
+then replay it here as often as needed without network access.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_tools --fixtures fixtures/pms.jsonl \\
+        --tool get_customer_properties_context [--args '{}'] [--runs 20] \\
+        [--latency 0.05] [--jitter 0.02] [--warm]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from src.api_client import PMSAPIClient
+from src.cache import ResponseCache
+from src.replay import replay_transport
+from src.tools import PMSTools
+
+
+async def run(
+    fixtures: str,
+    tool: str,
+    arguments: Dict[str, Any],
+    runs: int,
+    latency: Optional[float],
+    jitter: float,
+    warm: bool,
+    customer_id: Optional[str]
+) -> List[float]:
+    timings = []
+    client = None
+    for i in range(runs):
+        # A fresh client per run measures cold-cache calls unless --warm is given
+        if client is None or not warm:
+            if client is not None:
+                await client.close()
+            client = PMSAPIClient(
+                api_key="replay",
+                customer_id=customer_id,
+                cache=ResponseCache(),
+                transport=replay_transport(fixtures, latency=latency, jitter=jitter, seed=i)
+            )
+            # Measure the tool itself, not the client-side rate limit
+            client.rate_limiter = None
+        # Without snapshots every run measures the full build, not a snapshot read
+        tools = PMSTools(client, snapshots=False)
+        started = time.perf_counter()
+        result = await tools.execute_tool(tool, arguments)
+        timings.append((time.perf_counter() - started) * 1000)
+        if i == 0:
+            text = "".join(content.text for content in result)
+            print(f"first result: {len(text)} chars")
+    await client.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="JSONL fixture file recorded with PMS_RECORD_PATH")
+    parser.add_argument("--tool", required=True)
+    parser.add_argument("--args", default="{}", help="tool arguments as JSON")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=None, help="fixed latency per request (default: as recorded)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--warm", action="store_true", help="reuse one client so the response cache stays warm")
+    parser.add_argument("--customer-id", default=None, help="customerId the fixture was recorded with")
+    args = parser.parse_args()
+
+    timings = asyncio.run(run(
+        args.fixtures, args.tool, json.loads(args.args), args.runs,
+        args.latency, args.jitter, args.warm, args.customer_id
+    ))
+    ordered = sorted(timings)
+    print(
+        f"{args.tool}: {len(timings)} runs | mean {statistics.mean(timings):.1f} ms | "
+        f"p50 {ordered[len(ordered) // 2]:.1f} ms | p95 {ordered[int(len(ordered) * 0.95)]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
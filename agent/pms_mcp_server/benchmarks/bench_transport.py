@@ -0,0 +1,100 @@
+"""
+Benchmark tool-call round-trip latency over loopback TCP vs a Unix domain socket
+
+Runs the HTTP MCP server in-process with an echo tool so that only transport
+and HTTP framing costs are measured.
+
+Usage (from the pms_mcp_server directory):
+    python -m benchmarks.bench_transport [--calls 2000] [--payload-bytes 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+from aiohttp import web
+from mcp.types import TextContent
+
+from src import http_server
+
+
+class EchoTools:
+    """Minimal stand-in for PMSTools that returns a fixed-size text payload"""
+    
+    def __init__(self, payload_bytes: int):
+        self.text = "x" * payload_bytes
+    
+    def get_available_tools(self) -> List[Any]:
+        return []
+    
+    async def execute_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        return [TextContent(type="text", text=self.text)]
+
+
+async def run_calls(session: aiohttp.ClientSession, url: str, calls: int) -> List[float]:
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "tools/call",
+        "params": {"name": "echo", "arguments": {}},
+        "id": 1
+    }
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        async with session.post(url, json=payload) as response:
+            await response.json()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: List[float]):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[int(len(ordered) * 0.95)]
+    p99 = ordered[int(len(ordered) * 0.99)]
+    print(f"{label:<5} mean {statistics.mean(latencies):.3f} ms | p50 {p50:.3f} ms | p95 {p95:.3f} ms | p99 {p99:.3f} ms")
+
+
+async def main(calls: int, payload_bytes: int):
+    app = await http_server.init_app()
+    http_server.pms_tools = EchoTools(payload_bytes)
+    
+    socket_path = os.path.join(tempfile.mkdtemp(), "pms_mcp_bench.sock")
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    tcp_site = web.TCPSite(runner, "127.0.0.1", 0)
+    unix_site = web.UnixSite(runner, socket_path)
+    await tcp_site.start()
+    await unix_site.start()
+    port = runner.addresses[0][1]
+    
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector()) as session:
+            tcp_url = f"http://127.0.0.1:{port}/rpc"
+            await run_calls(session, tcp_url, 50)  # warm-up
+            tcp = await run_calls(session, tcp_url, calls)
+        
+        async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=socket_path)) as session:
+            unix_url = "http://localhost/rpc"
+            await run_calls(session, unix_url, 50)  # warm-up
+            uds = await run_calls(session, unix_url, calls)
+    finally:
+        await runner.cleanup()
+    
+    print(f"{calls} sequential tools/call round-trips, {payload_bytes} byte result")
+    summarize("TCP", tcp)
+    summarize("UDS", uds)
+    print(f"UDS mean speed-up: {(1 - statistics.mean(uds) / statistics.mean(tcp)) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--payload-bytes", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.payload_bytes))
@@ -0,0 +1,171 @@
+"""
+Latency-injected fake PMS API for benchmarks
+
+Serves deterministic, realistically shaped property, property detail and
+reservation data through httpx.MockTransport, delaying every response by a
+fixed latency plus uniform jitter.
+"""
+
+import asyncio
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.api_client import PMSAPIClient
+from src.cache import ResponseCache
+from src.rate_limit import RateLimiter
+
+AMENITY_CODES = [
+    "KITCHEN", "REFRIGERATOR", "MICROWAVE", "SHOWER", "BATHTUB", "BED_LINENS", "SMOKE_DETECTOR",
+    "FIRE_EXTINGUISHER", "BABY_CRIB", "FREE_PARKING", "POOL", "WIFI", "TV", "AIR_CONDITIONING",
+    "HEATING", "BALCONY", "GARDEN", "WASHER", "IRON", "HAIR_DRYER",
+]
+CITIES = ["Lisbon", "Porto", "Faro", "Madrid", "Barcelona", "Seville"]
+
+
+class FakePMSBackend:
+    def __init__(
+        self,
+        property_count: int = 60,
+        inactive_every: int = 10,
+        reservations_per_property: int = 40,
+        latency: float = 0.05,
+        jitter: float = 0.01,
+        seed: int = 7
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self.properties = [self._make_property(i, inactive_every) for i in range(property_count)]
+        self.details = {p["id"]: self._make_detail(p) for p in self.properties}
+        self.reservations = {
+            p["id"]: self._make_reservations(p["id"], reservations_per_property) for p in self.properties
+        }
+
+    def _make_property(self, i: int, inactive_every: int) -> Dict[str, Any]:
+        return {
+            "id": f"prop-{i:04d}",
+            "name": f"Casa {i}",
+            "internalName": f"CASA-{i:04d}",
+            "status": not (inactive_every and i % inactive_every == inactive_every - 1),
+            "typeCode": self._rng.choice(["APARTMENT", "VILLA", "HOUSE"]),
+            "city": self._rng.choice(CITIES),
+            "maxOccupancy": self._rng.randint(2, 10),
+            "bedrooms": self._rng.randint(1, 5),
+            "knowledgePercentage": self._rng.randint(0, 100),
+        }
+
+    def _make_detail(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        rng = self._rng
+        detail = dict(summary)
+        detail.update({
+            "street": f"Rua {rng.randint(1, 200)}",
+            "zipCode": f"{rng.randint(1000, 9999)}-{rng.randint(100, 999)}",
+            "countryCode": "PT",
+            "maxAdults": summary["maxOccupancy"],
+            "bathrooms": rng.randint(1, 3),
+            "beds": summary["bedrooms"] + rng.randint(0, 2),
+            "checkInFrom": "15:00",
+            "checkInUntil": "22:00",
+            "checkOutFrom": "11:00",
+            "checkOutUntil": "11:00",
+            "wifiNetwork": f"Casa{summary['id'][-4:]}",
+            "wifiPassword": f"pw{rng.randint(10000, 99999)}",
+            "doorCode": str(rng.randint(1000, 9999)),
+            "pricingSettings": {
+                "currency": "EUR",
+                "basePrice": rng.randint(60, 400),
+                "weekendBasePrice": rng.randint(80, 450),
+                "cleaningFee": rng.randint(20, 80),
+                "securityDepositFee": rng.choice([0, 200, 500]),
+                "petFee": rng.choice([0, 15, 30]),
+                "extraPersonFee": rng.choice([0, 10, 20]),
+                "guestsIncludedInRegularFee": 2,
+                "weeklyPriceFactor": 0.9,
+                "monthlyPriceFactor": 0.75,
+            },
+            "taxes": [{"name": "Tourist tax", "rate": 2}],
+            "amenities": [
+                {"typeCode": code, "attributes": code.replace("_", " ").title(), "isPresent": True}
+                for code in rng.sample(AMENITY_CODES, rng.randint(8, len(AMENITY_CODES)))
+            ],
+            "descriptions": [
+                {"typeCode": "SUMMARY", "language": lang, "text": f"A bright {summary['typeCode'].lower()} " * 30}
+                for lang in ("en", "pt", "de")
+            ],
+            "images": [{"url": f"https://img.example/{summary['id']}/{n}.jpg"} for n in range(rng.randint(5, 30))],
+            "integrations": [{"source": "airbnb", "otaId": str(rng.randint(10 ** 6, 10 ** 7))}],
+            "bookingSettings": {"minNights": rng.randint(1, 4), "instantBooking": rng.choice([True, False])},
+            "latitude": 38.7 + rng.random(),
+            "longitude": -9.1 + rng.random(),
+            "timeZone": "Europe/Lisbon",
+            "updatedAt": "2025-01-01T00:00:00Z",
+        })
+        return detail
+
+    def _make_reservations(self, property_id: str, count: int) -> List[Dict[str, Any]]:
+        rng = self._rng
+        start = date(2025, 1, 1)
+        reservations = []
+        day = 0
+        for n in range(count):
+            day += rng.randint(0, 6)
+            nights = rng.randint(1, 7)
+            check_in = start + timedelta(days=day)
+            reservations.append({
+                "id": f"{property_id}-res-{n}",
+                "propertyId": property_id,
+                "status": "Cancelled" if rng.random() < 0.1 else "Confirmed",
+                "checkIn": f"{check_in.isoformat()}T15:00:00",
+                "checkOut": f"{(check_in + timedelta(days=nights)).isoformat()}T11:00:00",
+            })
+            day += nights
+        return reservations
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        params = request.url.params
+        path = request.url.path
+        if path == "/api/Property/GetAll":
+            page_index = int(params.get("PageIndex", 1))
+            page_size = int(params.get("PageSize", 100))
+            items = self.properties
+            if params.get("Status") == "true":
+                items = [p for p in items if p["status"]]
+            start = (page_index - 1) * page_size
+            return httpx.Response(200, json={"items": items[start:start + page_size], "totalCount": len(items)})
+        if path == "/api/Property/Get":
+            detail = self.details.get(params.get("Id"))
+            return httpx.Response(200, json=detail) if detail else httpx.Response(404)
+        if path == "/api/Reservation/Get":
+            items = self.reservations.get(params.get("propertyId"), [])
+            page_index = int(params.get("pageIndex", 0))
+            page_size = int(params.get("pageSize", 100))
+            start = page_index * page_size
+            return httpx.Response(200, json={"items": items[start:start + page_size], "totalCount": len(items)})
+        return httpx.Response(404)
+
+    def client(self, cache: Optional[ResponseCache] = None, rate_limit: bool = True) -> PMSAPIClient:
+        """
+        A PMSAPIClient wired to this backend.
+        
+        It gets its own rate limiter with the default rates, so runs don't
+        share token buckets; rate_limit=False turns throttling off.
+        """
+        client = PMSAPIClient(
+            api_key="bench",
+            customer_id="bench-customer",
+            cache=cache or ResponseCache(),
+            rate_limiter=RateLimiter(),
+            transport=httpx.MockTransport(self.handler)
+        )
+        if not rate_limit:
+            client.rate_limiter = None
+        return client
@@ -1,111 +1,591 @@
 import httpx
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Callable, Awaitable, AsyncIterator
+from collections import OrderedDict, deque
 import os
 from urllib.parse import urljoin
 import base64
 import asyncio
 import logging
+import time
+
+from .cache import ResponseCache, revalidating
+from .retry import RetryPolicy
+from .rate_limit import RateLimiter, default_rate_limiter, parse_retry_after
+from .metrics import metrics, METRICS_ENABLED
+from .replay import transport_from_env
+from .uploads import UploadSource, BodyFactory, is_restartable, multipart_body, base64_json_body
+from .json_codec import loads as json_loads, iter_items, STREAMING_AVAILABLE
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Pool limits for the process-wide HTTP client shared by all tenants
+MAX_CONNECTIONS = int(os.getenv("PMS_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PMS_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("PMS_KEEPALIVE_EXPIRY", "60"))
+# Number of per-tenant client views kept by for_customer()
+TENANT_CACHE_SIZE = int(os.getenv("PMS_TENANT_CACHE_SIZE", "256"))
+CACHE_ENABLED = os.getenv("PMS_CACHE_ENABLED", "true").lower() != "false"
+# Concurrency limit and default deadline (seconds) for composite fan-out methods
+COMPOSITE_CONCURRENCY = int(os.getenv("PMS_COMPOSITE_CONCURRENCY", "6"))
+COMPOSITE_DEADLINE = float(os.getenv("PMS_COMPOSITE_DEADLINE", "10"))
+# Pages requested ahead of the one being consumed by PageIterator
+PAGE_PREFETCH = int(os.getenv("PMS_PAGE_PREFETCH", "2"))
+# Per-attempt timeout (seconds) for streaming uploads, still capped by the tool deadline
+UPLOAD_TIMEOUT = float(os.getenv("PMS_UPLOAD_TIMEOUT", "300"))
+
+# One connection pool per base URL, shared by every tenant in the process
+_shared_http_clients: Dict[str, httpx.AsyncClient] = {}
+# Root clients using each shared pool; the last one to close it closes the pool
+_shared_http_client_refs: Dict[str, int] = {}
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def _new_http_client(base_url: str, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=base_url,
+        # Tenant identity and auth are sent per request, never as client defaults
+        headers={"Accept": "application/json"},
+        http2=HTTP2_AVAILABLE,
+        limits=_pool_limits(),
+        timeout=httpx.Timeout(30.0, connect=10.0),  # 30s total, 10s connect
+        transport=transport
+    )
+
+
+def get_shared_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Return the process-wide HTTP client for base_url, creating it on first use.
+    
+    Every call takes a reference; hand it back with release_shared_http_client().
+    """
+    client = _shared_http_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = _new_http_client(base_url)
+        _shared_http_clients[base_url] = client
+        _shared_http_client_refs[base_url] = 0
+    _shared_http_client_refs[base_url] += 1
+    return client
+
+
+async def release_shared_http_client(base_url: str, client: httpx.AsyncClient):
+    """Drop one reference to the shared client, closing the pool when it was the last"""
+    if _shared_http_clients.get(base_url) is not client:
+        # Replaced after being closed elsewhere; nobody else holds this one
+        await client.aclose()
+        return
+    _shared_http_client_refs[base_url] -= 1
+    if _shared_http_client_refs[base_url] <= 0:
+        del _shared_http_clients[base_url]
+        del _shared_http_client_refs[base_url]
+        await client.aclose()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests onto one in-flight task.
+    
+    Every caller awaits the shared task through asyncio.shield, so a caller
+    being cancelled never cancels the request for the others.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class PageIterator:
+    """
+    Async iterator over the item lists of a paginated PMS list endpoint.
+    
+    While the caller consumes one page, the next ``prefetch`` pages are already
+    being fetched. Iteration stops at ``totalCount``, on a short page or on an
+    empty page, so memory stays bounded by the read-ahead window. Once the
+    first page is in, ``total_count`` holds the server-reported total. A first
+    page shorter than both ``page_size`` and the total means the server caps
+    the page size, and later pages are requested at that size.
+    """
+    
+    def __init__(
+        self,
+        client: "PMSAPIClient",
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        page_index_param: str = "pageIndex",
+        page_size_param: str = "pageSize",
+        first_page_index: int = 0,
+        prefetch: int = PAGE_PREFETCH,
+        items_key: str = "items",
+        total_key: str = "totalCount"
+    ):
+        self.client = client
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.page_index_param = page_index_param
+        self.page_size_param = page_size_param
+        self.first_page_index = first_page_index
+        self.prefetch = max(prefetch, 0)
+        self.items_key = items_key
+        self.total_key = total_key
+        self.total_count: Optional[int] = None
+    
+    def __aiter__(self):
+        return self._pages()
+    
+    async def items(self):
+        """Iterate over individual items instead of pages"""
+        async for page in self:
+            for item in page:
+                yield item
+    
+    def _fetch(self, page_index: int) -> asyncio.Task:
+        params = {**self.params, self.page_index_param: page_index, self.page_size_param: self.page_size}
+        return asyncio.create_task(self.client.get(self.endpoint, params=params))
+    
+    async def _pages(self):
+        next_index = self.first_page_index
+        last_index: Optional[int] = None
+        window: "deque[asyncio.Task]" = deque()
+        
+        def fill_window():
+            nonlocal next_index
+            while len(window) < self.prefetch and (last_index is None or next_index <= last_index):
+                window.append(self._fetch(next_index))
+                next_index += 1
+        
+        # Only the first page is requested until the total is known
+        window.append(self._fetch(next_index))
+        next_index += 1
+        seen = 0
+        
+        try:
+            while window:
+                page = await window.popleft()
+                if not isinstance(page, dict):
+                    break
+                
+                items = page.get(self.items_key) or []
+                total = page.get(self.total_key)
+                if total is not None and self.total_count is None:
+                    self.total_count = total
+                    if items and len(items) < min(self.page_size, total):
+                        # The server capped the page size; later page indexes follow its size
+                        logger.info(f"{self.endpoint} returned {len(items)} of {self.page_size} requested items per page")
+                        self.page_size = len(items)
+                    last_index = self.first_page_index + max(-(-total // self.page_size), 1) - 1
+                
+                if not items:
+                    break
+                
+                seen += len(items)
+                finished = len(items) < self.page_size or (total is not None and seen >= total)
+                if not finished:
+                    # Keep the read-ahead window full while the caller works on this page
+                    fill_window()
+                
+                yield items
+                
+                if finished:
+                    break
+                if not window:
+                    # Without read-ahead the next page is requested only now
+                    window.append(self._fetch(next_index))
+                    next_index += 1
+        finally:
+            for task in window:
+                task.cancel()
+
+
 class PMSAPIClient:
-    def __init__(self, base_url: str = "https://pms.botel.ai", api_key: Optional[str] = None, customer_id: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str = "https://pms.botel.ai",
+        api_key: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
         self.base_url = base_url
         self.api_key = api_key or os.getenv("PMS_API_KEY")
         self.customer_id = customer_id or os.getenv("PMS_CUSTOMER_ID", "ae0c85c5-7fa7-4e09-8a94-0df5da38e72e")
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers=self._get_headers(),
-            timeout=httpx.Timeout(30.0, connect=10.0)  # 30s total, 10s connect
-        )
-        self.max_retries = 3
-        self.retry_delay = 1.0  # Initial retry delay in seconds
+        if http_client is None and transport is None:
+            # PMS_RECORD_PATH / PMS_REPLAY_PATH swap the network for a fixture file
+            transport = transport_from_env(lambda: httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=_pool_limits()))
+        if http_client is not None:
+            self.client = http_client
+        elif transport is not None:
+            # A custom transport (record/replay) gets its own client instead of the shared pool
+            self.client = _new_http_client(self.base_url, transport)
+        else:
+            self.client = get_shared_http_client(self.base_url)
+        self._uses_shared_pool = http_client is None and transport is None
+        self._released_shared_pool = False
+        self.headers = self._get_headers()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Per-tenant token buckets; retries draw from them too
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.metrics = metrics if METRICS_ENABLED else None
+        # GET response cache, shared with tenant views (keys include the customer)
+        self.cache = cache if cache is not None else (ResponseCache() if CACHE_ENABLED else None)
+        self._revalidations: Dict[str, asyncio.Task] = {}
+        # Identical in-flight GETs (same tenant, path and params) share one request
+        self._single_flight = SingleFlight()
+        # Per-tenant views created by for_customer(), least recently used first
+        self._tenants: "OrderedDict[tuple, PMSAPIClient]" = OrderedDict()
+        self._is_tenant_view = False
     
     def _get_headers(self) -> Dict[str, str]:
         headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
             "customerId": self.customer_id
         }
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
     
-    async def _retry_request(self, method: str, *args, **kwargs):
-        """Execute request with retry logic and exponential backoff"""
-        last_exception = None
+    def for_customer(self, customer_id: str, api_key: Optional[str] = None) -> "PMSAPIClient":
+        """
+        Return a client for another tenant that shares this client's connection pool.
+        
+        Views are kept in a bounded LRU so per-tenant state survives between calls.
+        """
+        api_key = api_key or self.api_key
+        key = (customer_id, api_key)
+        tenant = self._tenants.get(key)
+        if tenant is not None:
+            self._tenants.move_to_end(key)
+            return tenant
         
-        for attempt in range(self.max_retries):
+        tenant = self._create_tenant_view(customer_id, api_key)
+        self._tenants[key] = tenant
+        if len(self._tenants) > TENANT_CACHE_SIZE:
+            self._tenants.popitem(last=False)
+        return tenant
+    
+    def _create_tenant_view(self, customer_id: str, api_key: Optional[str]) -> "PMSAPIClient":
+        tenant = PMSAPIClient(
+            base_url=self.base_url,
+            api_key=api_key,
+            customer_id=customer_id,
+            http_client=self.client,
+            cache=self.cache,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter
+        )
+        tenant._is_tenant_view = True
+        tenant._single_flight = self._single_flight
+        return tenant
+    
+    async def _send(self, method: str, *args, **kwargs) -> httpx.Response:
+        if method == "GET":
+            return await self.client.get(*args, **kwargs)
+        elif method == "POST":
+            return await self.client.post(*args, **kwargs)
+        elif method == "PUT":
+            return await self.client.put(*args, **kwargs)
+        elif method == "DELETE":
+            return await self.client.delete(*args, **kwargs)
+        raise ValueError(f"Unknown method: {method}")
+    
+    async def _retry_request(
+        self,
+        method: str,
+        *args,
+        body_factory: Optional[BodyFactory] = None,
+        attempt_timeout: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Execute request under the retry policy (jittered backoff, retry budget, deadline).
+        
+        A streamed body is passed as body_factory, which must return a fresh
+        stream for every attempt so a retry resends it from the start.
+        """
+        policy = self.retry_policy
+        policy.budget.record_request()
+        delay = policy.base_delay
+        
+        # Tenant identity and auth travel with each request over the shared pool
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        
+        endpoint = args[0]
+        for attempt in range(policy.max_attempts):
+            await self._throttle(method)
+            # Never let one attempt outlive the tool call's deadline
+            timeout = policy.timeout_for_attempt(attempt_timeout)
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=min(10.0, timeout))
+            if body_factory is not None:
+                kwargs["content"] = body_factory()
+            
+            started = time.perf_counter()
             try:
-                if method == "GET":
-                    response = await self.client.get(*args, **kwargs)
-                elif method == "POST":
-                    response = await self.client.post(*args, **kwargs)
-                elif method == "PUT":
-                    response = await self.client.put(*args, **kwargs)
-                elif method == "DELETE":
-                    response = await self.client.delete(*args, **kwargs)
-                else:
-                    raise ValueError(f"Unknown method: {method}")
+                response = await asyncio.wait_for(self._send(method, *args, **kwargs), timeout=timeout)
+                self._record(method, endpoint, started, str(response.status_code), len(response.content))
                 
-                response.raise_for_status()
+                # 304 answers a conditional GET and is handled by the cache layer
+                if response.status_code != 304:
+                    response.raise_for_status()
                 return response
                 
-            except (httpx.TimeoutException, httpx.ConnectError, httpx.ReadTimeout) as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay}s...")
+            except (httpx.TimeoutException, httpx.ConnectError, httpx.ReadTimeout, httpx.WriteError, asyncio.TimeoutError) as e:
+                self._record(method, endpoint, started, type(e).__name__)
+                delay = policy.next_delay(delay)
+                if policy.should_retry(attempt, delay):
+                    self._record_retry(method, endpoint)
+                    logger.warning(f"Request failed (attempt {attempt + 1}/{policy.max_attempts}): {e}. Retrying in {delay:.2f}s...")
                     await asyncio.sleep(delay)
                 else:
-                    logger.error(f"Request failed after {self.max_retries} attempts: {e}")
+                    logger.error(f"Request failed after {attempt + 1} attempts: {e}")
                     raise
             except httpx.HTTPStatusError as e:
-                # Don't retry on 4xx errors (client errors)
-                if 400 <= e.response.status_code < 500:
+                status = e.response.status_code
+                # Don't retry on 4xx errors (client errors), except 429 Too Many Requests
+                if 400 <= status < 500 and status != 429:
                     raise
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2 ** attempt)
-                    logger.warning(f"HTTP {e.response.status_code} (attempt {attempt + 1}/{self.max_retries}). Retrying in {delay}s...")
+                delay = policy.next_delay(delay)
+                if status in (429, 503):
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        # Back off for at least as long as the upstream asked, for every caller of this tenant
+                        delay = max(delay, retry_after)
+                        if self.rate_limiter:
+                            self.rate_limiter.pause(self.customer_id, method, retry_after)
+                if policy.should_retry(attempt, delay):
+                    self._record_retry(method, endpoint)
+                    logger.warning(f"HTTP {e.response.status_code} (attempt {attempt + 1}/{policy.max_attempts}). Retrying in {delay:.2f}s...")
                     await asyncio.sleep(delay)
                 else:
-                    logger.error(f"Request failed after {self.max_retries} attempts with HTTP {e.response.status_code}")
+                    logger.error(f"Request failed after {attempt + 1} attempts with HTTP {e.response.status_code}")
                     raise
-        
-        raise last_exception
 
+    def _record(self, method: str, endpoint: str, started: float, status: str, response_bytes: int = 0):
+        if self.metrics:
+            self.metrics.observe(method, endpoint, status, time.perf_counter() - started, response_bytes)
+    
+    def _record_retry(self, method: str, endpoint: str):
+        if self.metrics:
+            self.metrics.record_retry(method, endpoint)
+    
+    async def _throttle(self, method: str):
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(self.customer_id, method)
+    
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        key = ResponseCache.make_key(endpoint, params, self.customer_id)
+        ttl = self.cache.ttl_for(endpoint) if self.cache else 0.0
+        if ttl <= 0:
+            return await self._single_flight.do(key, lambda: self._fetch(endpoint, params))
+        
+        if revalidating():
+            # Must see upstream edits now; a 304 keeps this cheap when nothing changed
+            return await self._single_flight.do(key, lambda: self._fetch_into_cache(key, endpoint, params, ttl))
+        
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.is_fresh():
+                return entry.value
+            if self.cache.is_servable_stale(entry):
+                # Serve stale immediately and refresh in the background
+                if key not in self._revalidations:
+                    task = asyncio.create_task(self._fetch_into_cache(key, endpoint, params, ttl, background=True))
+                    self._revalidations[key] = task
+                    task.add_done_callback(lambda _t, k=key: self._revalidations.pop(k, None))
+                return entry.value
+        
+        return await self._single_flight.do(key, lambda: self._fetch_into_cache(key, endpoint, params, ttl))
+    
+    async def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         response = await self._retry_request("GET", endpoint, params=params)
+        return self._decode(response)
+    
+    async def _fetch_into_cache(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        ttl: float,
+        background: bool = False
+    ) -> Dict[str, Any]:
+        """GET endpoint (conditionally, if an ETag is cached) and store the result"""
+        entry = self.cache.peek(key)
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else None
+        try:
+            response = await self._retry_request("GET", endpoint, params=params, headers=headers)
+        except Exception as e:
+            if background:
+                logger.warning(f"Background revalidation of {endpoint} failed: {e}")
+                return {}
+            raise
+        
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return entry.value
         
+        value = self._decode(response)
+        self.cache.set(key, value, response.headers.get("ETag"), ttl, len(response.content))
+        return value
+    
+    @staticmethod
+    def _decode(response: httpx.Response) -> Dict[str, Any]:
         # Handle 204 No Content responses
         if response.status_code == 204:
             return {}
             
-        return response.json()
+        return json_loads(response.content)
+    
+    async def stream_items(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        items_key: str = "items"
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the elements of a list response's `items_key` array as they are parsed.
+        
+        Large responses (e.g. a year of reservations) are never held decoded in
+        full. Bypasses the cache and falls back to a plain GET without ijson.
+        """
+        if not STREAMING_AVAILABLE:
+            data = await self.get(endpoint, params=params)
+            for item in (data.get(items_key) if items_key else data) or []:
+                yield item
+            return
+        
+        await self._throttle("GET")
+        attempt_timeout = self.retry_policy.timeout_for_attempt()
+        started = time.perf_counter()
+        async with self.client.stream(
+            "GET",
+            endpoint,
+            params=params,
+            headers=self.headers,
+            timeout=httpx.Timeout(attempt_timeout, connect=min(10.0, attempt_timeout))
+        ) as response:
+            try:
+                response.raise_for_status()
+                if response.status_code == 204:
+                    return
+                async for item in iter_items(response.aiter_bytes(), items_key):
+                    yield item
+            finally:
+                # Latency covers the whole streamed body, not just the headers
+                self._record("GET", endpoint, started, str(response.status_code), response.num_bytes_downloaded)
+    
+    def _invalidate_cache(self, endpoint: str):
+        """Drop this tenant's cached GETs for the controller a write went to"""
+        if not self.cache:
+            return
+        parts = endpoint.split("?", 1)[0].strip("/").split("/")
+        controller = "/" + "/".join(parts[:2]) + "/" if len(parts) >= 2 else endpoint
+        self.cache.invalidate(f"{self.customer_id}|{controller}")
+    
+    async def upload(
+        self,
+        endpoint: str,
+        body_factory: BodyFactory,
+        headers: Dict[str, str],
+        restartable: bool = True
+    ) -> Dict[str, Any]:
+        """
+        POST a streamed body.
+        
+        Restartable bodies (read from a path) go through the retry policy;
+        one-shot streams are sent exactly once.
+        """
+        if restartable:
+            response = await self._retry_request(
+                "POST", endpoint, body_factory=body_factory, headers=headers, attempt_timeout=UPLOAD_TIMEOUT
+            )
+        else:
+            await self._throttle("POST")
+            timeout = self.retry_policy.timeout_for_attempt(UPLOAD_TIMEOUT)
+            started = time.perf_counter()
+            response = await self.client.post(
+                endpoint,
+                content=body_factory(),
+                headers={**self.headers, **headers},
+                timeout=httpx.Timeout(timeout, connect=min(10.0, timeout))
+            )
+            self._record("POST", endpoint, started, str(response.status_code), len(response.content))
+            response.raise_for_status()
+        self._invalidate_cache(endpoint)
+        return self._decode(response)
     
     async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, files: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if files:
             # File uploads don't use retry logic
-            response = await self.client.post(endpoint, files=files, data=data)
+            await self._throttle("POST")
+            started = time.perf_counter()
+            response = await self.client.post(endpoint, files=files, data=data, headers=self.headers)
+            self._record("POST", endpoint, started, str(response.status_code), len(response.content))
             response.raise_for_status()
         else:
             response = await self._retry_request("POST", endpoint, json=data)
-        return response.json()
+        self._invalidate_cache(endpoint)
+        return self._decode(response)
     
     async def put(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         response = await self._retry_request("PUT", endpoint, json=data)
-        return response.json()
+        self._invalidate_cache(endpoint)
+        return self._decode(response)
     
     async def delete(self, endpoint: str) -> Dict[str, Any]:
         response = await self._retry_request("DELETE", endpoint)
+        self._invalidate_cache(endpoint)
         try:
-            return response.json()
+            return json_loads(response.content)
         except:
             return {"status": "success"}
     
     async def close(self):
-        await self.client.aclose()
+        """
+        Release the connection pool; tenant views leave it to their parent.
+        
+        The shared pool is only closed once every root client using it has closed.
+        """
+        if self._is_tenant_view:
+            return
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        self._tenants.clear()
+        if not self._uses_shared_pool:
+            await self.client.aclose()
+        elif not self._released_shared_pool:
+            self._released_shared_pool = True
+            await release_shared_http_client(self.base_url, self.client)
     
     # Channel endpoints
     async def get_channels(self) -> Dict[str, Any]:
@@ -332,6 +812,11 @@ class PMSAPIClient:
             "filename": filename
         })
     
+    async def upload_task_image(self, task_id: int, source: UploadSource, filename: str) -> Dict[str, Any]:
+        """Upload a task image from a path or async byte iterator, base64-encoding it on the fly"""
+        body, headers = base64_json_body(source, "base64Image", {"taskId": task_id, "filename": filename})
+        return await self.upload("/api/Task/UploadBase64", body, headers, restartable=is_restartable(source))
+    
     # Review endpoints
     async def get_reviews(self, **params) -> Dict[str, Any]:
         return await self.get("/api/Review/Get", params=params)
@@ -447,10 +932,24 @@ class PMSAPIClient:
             "customerId": customer_id
         })
     
-    async def upload_file_multipart(self, file_path: str, customer_id: int) -> Dict[str, Any]:
-        with open(file_path, 'rb') as f:
-            files = {'file': (os.path.basename(file_path), f, 'application/octet-stream')}
-            return await self.post("/api/File/UploadMultipart", data={"customerId": customer_id}, files=files)
+    async def upload_file_stream(self, source: UploadSource, filename: str, customer_id: int) -> Dict[str, Any]:
+        """Upload a file from a path or async byte iterator through UploadBase64, encoding it on the fly"""
+        body, headers = base64_json_body(source, "fileData", {"filename": filename, "customerId": customer_id})
+        return await self.upload("/api/File/UploadBase64", body, headers, restartable=is_restartable(source))
+    
+    async def upload_file_multipart(
+        self,
+        file_path: UploadSource,
+        customer_id: int,
+        filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stream a file (path or async byte iterator) as multipart/form-data"""
+        if filename is None:
+            if not is_restartable(file_path):
+                raise ValueError("filename is required when uploading from a stream")
+            filename = os.path.basename(file_path)
+        body, headers = multipart_body(file_path, filename, fields={"customerId": customer_id}, content_type="application/octet-stream")
+        return await self.upload("/api/File/UploadMultipart", body, headers, restartable=is_restartable(file_path))
     
     # Settings endpoints
     async def get_settings(self, customer_id: int) -> Dict[str, Any]:
@@ -486,51 +985,122 @@ class PMSAPIClient:
     async def delete_saved_message_template(self, template_id: int) -> Dict[str, Any]:
         return await self.delete(f"/api/SavedMessageTemplates/Delete?id={template_id}")
     
+    # Paginated listings
+    def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **options) -> PageIterator:
+        """Stream a paginated list endpoint page by page (see PageIterator for options)"""
+        return PageIterator(self, endpoint, params, **options)
+    
+    def iter_all_properties(self, include_inactive: bool = False, page_size: int = 100) -> PageIterator:
+        # The customerId header scopes the listing; PMS API uses 1-based page indexing here
+        return self.iter_pages("/api/Property/GetAll", {
+            "Status": None if include_inactive else True  # True = active only, None = all
+        }, page_size=page_size, page_index_param="PageIndex", page_size_param="PageSize", first_page_index=1)
+    
+    def iter_properties(self, customer_id: int, page_size: int = 100) -> PageIterator:
+        return self.iter_pages("/api/Property/Get", {"customerId": customer_id}, page_size=page_size)
+    
+    def iter_reservations(self, page_size: int = 100, **params) -> PageIterator:
+        return self.iter_pages("/api/Reservation/Get", params, page_size=page_size)
+    
+    def iter_customer_contacts(self, customer_id: int, page_size: int = 100) -> PageIterator:
+        return self.iter_pages("/api/CustomerContacts/Search", {"customerId": customer_id}, page_size=page_size)
+    
+    def iter_message_history(self, customer_id: int, page_size: int = 100) -> PageIterator:
+        return self.iter_pages("/api/Message/GetHistory", {"customerId": customer_id}, page_size=page_size)
+    
     # Cross-API complex operations
-    async def get_customer_full_profile(self, customer_id: int) -> Dict[str, Any]:
-        """Get complete customer profile including all related data"""
-        customer = await self.get_customer(Id=customer_id)
-        contacts = await self.search_customer_contacts(customer_id)
-        departments = await self.get_departments_by_customer(customer_id)
-        channels = await self.get_all_customer_channels(customer_id)
-        subscription = await self.get_customer_subscription(customer_id)
-        custom_fields = await self.get_customer_custom_fields(customer_id)
+    async def _fan_out(
+        self,
+        calls: Dict[str, Callable[[], Awaitable[Any]]],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run independent calls concurrently (at most COMPOSITE_CONCURRENCY at once)
+        and report each one as {"success": True, "data": ...} or
+        {"success": False, "error": "..."}. Calls still running when the
+        deadline expires are cancelled and reported as errors.
+        """
+        deadline = COMPOSITE_DEADLINE if deadline is None else deadline
+        semaphore = asyncio.Semaphore(COMPOSITE_CONCURRENCY)
         
-        return {
-            "customer": customer,
-            "contacts": contacts,
-            "departments": departments,
-            "channels": channels,
-            "subscription": subscription,
-            "customFields": custom_fields
-        }
-    
-    async def get_property_full_details(self, property_id: int) -> Dict[str, Any]:
-        """Get complete property details including rate plans and availability"""
-        property_data = await self.get_property(property_id)
-        rate_plans = await self.get_rate_plans(property_id)
+        async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await call()
         
-        return {
-            "property": property_data,
-            "ratePlans": rate_plans
-        }
-    
-    async def get_reservation_complete_info(self, reservation_id: int) -> Dict[str, Any]:
-        """Get complete reservation information including property and customer details"""
-        reservation = await self.get_reservation(reservation_id)
+        tasks = {name: asyncio.create_task(run(call)) for name, call in calls.items()}
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=max(deadline, 0.0))
+            for task in pending:
+                task.cancel()
         
+        results = {}
+        for name, task in tasks.items():
+            if task in pending:
+                results[name] = {"success": False, "error": f"Deadline of {deadline:.1f}s exceeded"}
+            elif task.exception() is not None:
+                logger.warning(f"Composite section '{name}' failed: {task.exception()}")
+                results[name] = {"success": False, "error": str(task.exception())}
+            else:
+                results[name] = {"success": True, "data": task.result()}
+        return results
+    
+    async def get_customer_full_profile(self, customer_id: int, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Get complete customer profile including all related data
+        
+        Sections are fetched concurrently; each one reports success or an error.
+        """
+        return await self._fan_out({
+            "customer": lambda: self.get_customer(Id=customer_id),
+            "contacts": lambda: self.search_customer_contacts(customer_id),
+            "departments": lambda: self.get_departments_by_customer(customer_id),
+            "channels": lambda: self.get_all_customer_channels(customer_id),
+            "subscription": lambda: self.get_customer_subscription(customer_id),
+            "customFields": lambda: self.get_customer_custom_fields(customer_id)
+        }, deadline)
+    
+    async def get_property_full_details(self, property_id: int, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Get complete property details including rate plans and availability
+        
+        Sections are fetched concurrently; each one reports success or an error.
+        """
+        return await self._fan_out({
+            "property": lambda: self.get_property(property_id),
+            "ratePlans": lambda: self.get_rate_plans(property_id)
+        }, deadline)
+    
+    async def get_reservation_complete_info(self, reservation_id: int, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Get complete reservation information including property and customer details
+        
+        The property and customer are fetched concurrently once the reservation
+        is known; each section reports success or an error. "status" is
+        "complete", "partial" (a related section failed) or "failed" (the
+        reservation itself could not be fetched).
+        """
+        deadline = COMPOSITE_DEADLINE if deadline is None else deadline
+        started = time.monotonic()
+        
+        first = await self._fan_out({
+            "reservation": lambda: self.get_reservation(reservation_id)
+        }, deadline)
+        if not first["reservation"]["success"]:
+            # Property and customer are only known from the reservation
+            skipped = {"success": False, "error": "Reservation could not be fetched"}
+            return {"status": "failed", "reservation": first["reservation"], "property": skipped, "customer": skipped}
+        reservation = first["reservation"].get("data") or {}
+        
+        related = {}
         if reservation.get("propertyId"):
-            property_data = await self.get_property(reservation["propertyId"])
-        else:
-            property_data = None
-            
+            related["property"] = lambda: self.get_property(reservation["propertyId"])
         if reservation.get("customerId"):
-            customer_data = await self.get_customer(Id=reservation["customerId"])
-        else:
-            customer_data = None
+            related["customer"] = lambda: self.get_customer(Id=reservation["customerId"])
+        
+        remaining = deadline - (time.monotonic() - started)
+        results = await self._fan_out(related, remaining)
         
         return {
-            "reservation": reservation,
-            "property": property_data,
-            "customer": customer_data
-        }
\ No newline at end of file
+            "status": "complete" if all(r["success"] for r in results.values()) else "partial",
+            "reservation": first["reservation"],
+            "property": results.get("property", {"success": True, "data": None}),
+            "customer": results.get("customer", {"success": True, "data": None})
+        }
@@ -0,0 +1,174 @@
+"""
+Response cache for PMS API GET requests
+
+Entries are keyed by customer, endpoint and query params, expire after a
+per-endpoint TTL, can be served stale for a grace window while they are
+revalidated in the background, and are evicted least-recently-used once the
+cache grows past its memory budget. GETs made inside revalidate_scope() skip
+cached values and always ask the server (conditionally, with the cached ETag).
+"""
+
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, per endpoint path.
+# Endpoints without an entry (or with 0) are never cached.
+DEFAULT_ENDPOINT_TTLS: Dict[str, float] = {
+    "/api/Property/GetAll": 60.0,
+    "/api/Property/Get": 300.0,
+    "/api/Property/GetById": 300.0,
+    "/api/Property/GetFiles": 300.0,
+    "/api/RatePlan/Get": 120.0,
+    "/api/Channel/Get": 600.0,
+    "/api/Settings/Get": 300.0,
+}
+
+DEFAULT_MAX_BYTES = int(os.getenv("PMS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_STALE_WHILE_REVALIDATE = float(os.getenv("PMS_CACHE_STALE_WHILE_REVALIDATE", "60"))
+
+# Set while the current task's GETs must revalidate instead of being served from the cache
+_revalidate: ContextVar[bool] = ContextVar("pms_cache_revalidate", default=False)
+
+
+@contextmanager
+def revalidate_scope():
+    """Make every cached GET inside the block (and its tasks) go to the server"""
+    token = _revalidate.set(True)
+    try:
+        yield
+    finally:
+        _revalidate.reset(token)
+
+
+def revalidating() -> bool:
+    return _revalidate.get()
+
+
+class CacheEntry:
+    __slots__ = ("value", "etag", "stored_at", "ttl", "size")
+
+    def __init__(self, value: Any, etag: Optional[str], ttl: float, size: int):
+        self.value = value
+        self.etag = etag
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+        self.size = size
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.monotonic()) - self.stored_at
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.age(now) < self.ttl
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache for decoded GET responses.
+
+    Cached values are shared between callers and must be treated as read-only.
+    Subclass and override get/set/invalidate to plug in another store.
+    """
+
+    def __init__(
+        self,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE
+    ):
+        self.endpoint_ttls = dict(DEFAULT_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls)
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL configured for endpoint's path (0 = not cacheable)"""
+        return self.endpoint_ttls.get(endpoint.split("?", 1)[0], 0.0)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]], customer_id: Optional[str]) -> str:
+        query = json.dumps(
+            {k: v for k, v in (params or {}).items() if v is not None},
+            sort_keys=True,
+            default=str
+        )
+        return f"{customer_id}|{endpoint}|{query}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return the entry for key if it can still be used: fresh, stale within the
+        revalidation window, or expired but carrying an ETag to revalidate with.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.is_fresh() or self.is_servable_stale(entry):
+            self.hits += 1
+        elif entry.etag:
+            self.misses += 1
+        else:
+            # Too old to serve and nothing to revalidate with
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key without touching LRU order or statistics"""
+        return self._entries.get(key)
+
+    def is_servable_stale(self, entry: CacheEntry) -> bool:
+        return entry.age() < entry.ttl + self.stale_while_revalidate
+
+    def set(self, key: str, value: Any, etag: Optional[str], ttl: float, size: int):
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = CacheEntry(value, etag, ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def touch(self, key: str):
+        """Mark an entry fresh again after a 304 Not Modified"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = time.monotonic()
+            self.revalidations += 1
+
+    def invalidate(self, prefix: str = ""):
+        """Drop every entry whose key starts with prefix (all entries by default)"""
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": (self.hits / total * 100) if total > 0 else 0
+        }
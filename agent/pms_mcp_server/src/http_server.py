@@ -7,12 +7,14 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
+from typing import Optional
 from aiohttp import web
 from dotenv import load_dotenv
 
 from .api_client import PMSAPIClient
 from .tools import PMSTools
+from .metrics import metrics
+from .rpc import rpc_error, dispatch_rpc_body
 
 # Load environment variables
 load_dotenv()
@@ -31,6 +33,13 @@ async def health_check(request: web.Request) -> web.Response:
     return web.json_response({"status": "healthy", "service": "pms-mcp-server"})
 
 
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    """PMS API request metrics in the Prometheus text format (?format=json for a summary)"""
+    if request.query.get("format") == "json":
+        return web.json_response(metrics.snapshot())
+    return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+
 async def list_tools(request: web.Request) -> web.Response:
     """List all available tools"""
     global pms_tools
@@ -49,9 +58,11 @@ async def list_tools(request: web.Request) -> web.Response:
 
 
 async def handle_rpc(request: web.Request) -> web.Response:
-    """Handle JSON-RPC requests"""
-    global pms_tools
+    """Handle JSON-RPC requests
     
+    A POST body may also be a JSON-RPC batch (a list of requests); the items
+    are executed concurrently and answered in a single response.
+    """
     try:
         # Parse request - handle both GET and POST
         if request.method == "POST":
@@ -63,71 +74,19 @@ async def handle_rpc(request: web.Request) -> web.Response:
                 "params": json.loads(request.query.get("params", "{}")),
                 "id": request.query.get("id", 1)
             }
-        
-        method = data.get("method")
-        params = data.get("params", {})
-        request_id = data.get("id", 1)
-        
-        # Check authorization if token is set
-        auth_token = os.getenv("MCP_AUTH_TOKEN")
-        if auth_token:
-            auth_header = request.headers.get("Authorization", "")
-            if not auth_header.startswith("Bearer ") or auth_header[7:] != auth_token:
-                return web.json_response({
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32001, "message": "Unauthorized"},
-                    "id": request_id
-                }, status=401)
-        
-        # Route methods
-        if method == "tools/list":
-            tools = pms_tools.get_available_tools()
-            result = {"tools": [tool.dict() for tool in tools]}
-        
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if not tool_name:
-                return web.json_response({
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32602, "message": "Tool name required"},
-                    "id": request_id
-                }, status=400)
-            
-            # Execute tool
-            result = await pms_tools.execute_tool(tool_name, arguments)
-            # Convert TextContent to dict
-            result = {"content": [{"type": item.type, "text": item.text} for item in result]}
-        
-        else:
-            return web.json_response({
-                "jsonrpc": "2.0",
-                "error": {"code": -32601, "message": f"Method not found: {method}"},
-                "id": request_id
-            }, status=404)
-        
-        # Return success response
-        return web.json_response({
-            "jsonrpc": "2.0",
-            "result": result,
-            "id": request_id
-        })
-        
     except json.JSONDecodeError:
-        return web.json_response({
-            "jsonrpc": "2.0",
-            "error": {"code": -32700, "message": "Parse error"},
-            "id": None
-        }, status=400)
+        return web.json_response(rpc_error(-32700, "Parse error", None), status=400)
     
-    except Exception as e:
-        logger.error(f"Error handling RPC request: {e}")
-        return web.json_response({
-            "jsonrpc": "2.0",
-            "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-            "id": request_id
-        }, status=500)
+    # Check authorization if token is set
+    auth_token = os.getenv("MCP_AUTH_TOKEN")
+    if auth_token:
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer ") or auth_header[7:] != auth_token:
+            request_id = data.get("id", 1) if isinstance(data, dict) else None
+            return web.json_response(rpc_error(-32001, "Unauthorized", request_id), status=401)
+    
+    response, status = await dispatch_rpc_body(pms_tools, data)
+    return web.json_response(response, status=status)
 
 
 async def init_app() -> web.Application:
@@ -150,6 +109,7 @@ async def init_app() -> web.Application:
     
     # Add routes
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics_endpoint)
     app.router.add_get("/tools", list_tools)
     app.router.add_post("/rpc", handle_rpc)
     app.router.add_get("/rpc", handle_rpc)  # Support GET for SSE transport
@@ -166,8 +126,19 @@ async def init_app() -> web.Application:
     
     app.middlewares.append(cors_middleware)
     
+    # Build the default customer's properties context snapshot in the background
+    async def start_snapshots(app):
+        app["snapshot_prewarm"] = asyncio.create_task(pms_tools.start())
+    
+    app.on_startup.append(start_snapshots)
+    
     # Cleanup on shutdown
     async def cleanup(app):
+        prewarm = app.get("snapshot_prewarm")
+        if prewarm and not prewarm.done():
+            prewarm.cancel()
+        if pms_tools:
+            await pms_tools.close()
         if api_client:
             await api_client.close()
     
@@ -179,14 +150,19 @@ async def init_app() -> web.Application:
 def main():
     """Main entry point"""
     port = int(os.getenv("PORT", "3001"))
+    unix_socket = os.getenv("PMS_MCP_UNIX_SOCKET") or None
     
     logger.info(f"Starting PMS MCP HTTP Server on port {port}")
     logger.info(f"Health check: http://localhost:{port}/health")
     logger.info(f"RPC endpoint: http://localhost:{port}/rpc")
     
+    if unix_socket:
+        logger.info(f"Also listening on Unix socket: {unix_socket}")
+    
     app = init_app()
-    # Only listen on localhost for security (same container access only)
-    web.run_app(app, host="127.0.0.1", port=port)
+    # Only listen on localhost for security (same container access only).
+    # The optional Unix socket lets the co-located agent skip loopback TCP.
+    web.run_app(app, host="127.0.0.1", port=port, path=unix_socket)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+"""
+JSON decoding for PMS API responses
+
+Uses orjson (or msgspec) when installed and falls back to the standard
+library. Large list responses can be streamed item by item with ijson so the
+whole document never has to be decoded at once.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        _decoder = msgspec.json.Decoder()
+
+        def loads(data: bytes) -> Any:
+            return _decoder.decode(data)
+
+        JSON_BACKEND = "msgspec"
+    except ImportError:
+        def loads(data: bytes) -> Any:
+            return json.loads(data)
+
+        JSON_BACKEND = "json"
+
+try:
+    import ijson
+    STREAMING_AVAILABLE = True
+except ImportError:
+    ijson = None
+    STREAMING_AVAILABLE = False
+
+
+class _AsyncByteReader:
+    """Adapts an async byte iterator to the read() interface ijson expects"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+async def iter_items(chunks: AsyncIterator[bytes], items_key: str = "items") -> AsyncIterator[Any]:
+    """
+    Yield the elements of the `items_key` array of a JSON object as the bytes arrive.
+
+    Requires ijson; without it the document is buffered and decoded in one go.
+    """
+    if STREAMING_AVAILABLE:
+        prefix = f"{items_key}.item" if items_key else "item"
+        async for item in ijson.items(_AsyncByteReader(chunks), prefix, use_float=True):
+            yield item
+        return
+
+    body = b"".join([chunk async for chunk in chunks])
+    if not body:
+        return
+    data = loads(body)
+    items = data.get(items_key) if items_key and isinstance(data, dict) else data
+    for item in items or []:
+        yield item
@@ -0,0 +1,157 @@
+"""
+Request metrics for the PMS API client
+
+Latency histograms, status codes, retries and response sizes are kept per
+method and endpoint template (ids in the path collapsed to {id}) and exposed
+in the Prometheus text format by the servers' /metrics route.
+"""
+
+import os
+import re
+import bisect
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("PMS_METRICS_ENABLED", "true").lower() != "false"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that identify a record rather than a route
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$"
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """'/api/Property/123?x=1' -> '/api/Property/{id}' (query strings are dropped)"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class EndpointStats:
+    __slots__ = ("bucket_counts", "latency_sum", "count", "statuses", "retries", "response_bytes")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.latency_sum = 0.0
+        self.count = 0
+        self.statuses: Dict[str, int] = {}
+        self.retries = 0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """In-process metrics store; every PMSAPIClient records into the module-level `metrics`"""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        # Items a tool result had to leave out, by kind (e.g. property details that failed to load)
+        self._missing: Dict[str, int] = {}
+
+    def _get(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method, endpoint_template(endpoint))
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = EndpointStats()
+        return stats
+
+    def observe(self, method: str, endpoint: str, status: str, seconds: float, response_bytes: int = 0):
+        """Record one attempt; status is the HTTP status code or the exception name"""
+        stats = self._get(method, endpoint)
+        stats.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.latency_sum += seconds
+        stats.count += 1
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.response_bytes += response_bytes
+
+    def record_retry(self, method: str, endpoint: str):
+        self._get(method, endpoint).retries += 1
+
+    def record_missing(self, kind: str, count: int = 1):
+        self._missing[kind] = self._missing.get(kind, 0) + count
+
+    def reset(self):
+        self._stats.clear()
+        self._missing.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-endpoint summary, slowest (by mean latency) first"""
+        endpoints = []
+        for (method, template), stats in self._stats.items():
+            endpoints.append({
+                "method": method,
+                "endpoint": template,
+                "requests": stats.count,
+                "mean_seconds": stats.latency_sum / stats.count if stats.count else 0.0,
+                "p95_seconds": self._quantile(stats, 0.95),
+                "statuses": dict(stats.statuses),
+                "retries": stats.retries,
+                "response_bytes": stats.response_bytes
+            })
+        endpoints.sort(key=lambda e: e["mean_seconds"], reverse=True)
+        return {"endpoints": endpoints, "missing": dict(self._missing)}
+
+    @staticmethod
+    def _quantile(stats: EndpointStats, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if it is in +Inf)"""
+        if not stats.count:
+            return None
+        target = q * stats.count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = [
+            "# HELP pms_api_request_duration_seconds PMS API request latency per attempt",
+            "# TYPE pms_api_request_duration_seconds histogram",
+        ]
+        for (method, template), stats in sorted(self._stats.items()):
+            labels = f'method="{method}",endpoint="{template}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                cumulative += count
+                lines.append(f'pms_api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'pms_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"pms_api_request_duration_seconds_sum{{{labels}}} {stats.latency_sum:.6f}")
+            lines.append(f"pms_api_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        lines += [
+            "# HELP pms_api_responses_total PMS API attempts by status code (or exception name)",
+            "# TYPE pms_api_responses_total counter",
+        ]
+        for (method, template), stats in sorted(self._stats.items()):
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'pms_api_responses_total{{method="{method}",endpoint="{template}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP pms_api_retries_total PMS API retries",
+            "# TYPE pms_api_retries_total counter",
+        ]
+        for (method, template), stats in sorted(self._stats.items()):
+            lines.append(f'pms_api_retries_total{{method="{method}",endpoint="{template}"}} {stats.retries}')
+
+        lines += [
+            "# HELP pms_api_response_bytes_total PMS API response body bytes",
+            "# TYPE pms_api_response_bytes_total counter",
+        ]
+        for (method, template), stats in sorted(self._stats.items()):
+            lines.append(f'pms_api_response_bytes_total{{method="{method}",endpoint="{template}"}} {stats.response_bytes}')
+
+        lines += [
+            "# HELP pms_tool_missing_items_total Items left out of tool results because they could not be loaded",
+            "# TYPE pms_tool_missing_items_total counter",
+        ]
+        for kind, count in sorted(self._missing.items()):
+            lines.append(f'pms_tool_missing_items_total{{kind="{kind}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
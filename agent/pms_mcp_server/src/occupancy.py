@@ -0,0 +1,350 @@
+"""
+Per-property booked-night index for availability checks
+
+Each property's reservations are kept as day intervals sorted by check-in,
+so an availability query is a bisect plus a short scan instead of a download
+of the reservation list. Indexes are built on first use (or prewarmed),
+served for PMS_OCCUPANCY_TTL seconds, then refreshed in the background while
+the current index keeps answering, up to PMS_OCCUPANCY_MAX_STALENESS. A
+refresh only applies the reservations that were added, changed or cancelled
+since the last one.
+
+nearest_free_windows() suggests alternative dates of the same length around
+an unavailable stay with one sliding-window pass over the booked nights.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+
+from .retry import clear_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+OCCUPANCY_ENABLED = os.getenv("PMS_OCCUPANCY_INDEX", "true").lower() != "false"
+# Seconds an index is served before a background refresh
+OCCUPANCY_TTL = float(os.getenv("PMS_OCCUPANCY_TTL", "300"))
+# An index older than this (the background refresh is late or failing) is rebuilt
+# before answering; keep it close to the TTL, a stale index can miss new bookings
+OCCUPANCY_MAX_STALENESS = float(os.getenv("PMS_OCCUPANCY_MAX_STALENESS", str(OCCUPANCY_TTL + 60)))
+# Property indexes kept per process, least recently used dropped first
+OCCUPANCY_MAX_PROPERTIES = int(os.getenv("PMS_OCCUPANCY_MAX_PROPERTIES", "2000"))
+# Reservations requested per page while (re)building an index
+RESERVATION_PAGE_SIZE = int(os.getenv("PMS_RESERVATION_PAGE_SIZE", "500"))
+# Deadline for one background refresh
+REFRESH_DEADLINE = float(os.getenv("PMS_OCCUPANCY_REFRESH_DEADLINE", "60"))
+# Build the active properties' indexes at startup
+OCCUPANCY_PREWARM = os.getenv("PMS_OCCUPANCY_PREWARM", "true").lower() != "false"
+# Days before and after the requested check-in searched for alternative dates
+ALTERNATIVE_HORIZON_DAYS = int(os.getenv("PMS_ALTERNATIVE_HORIZON_DAYS", "60"))
+
+# Reservations with these statuses don't occupy nights
+INACTIVE_STATUSES = ("Cancelled", "Declined")
+
+Stay = Tuple[int, int, str]
+IndexKey = Tuple[Optional[str], str]
+
+
+def _day(value: Any) -> Optional[int]:
+    """Day ordinal of an ISO date or datetime string"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def stay_of(reservation: Dict[str, Any]) -> Optional[Stay]:
+    """(check-in day, check-out day, reservation key) of a reservation occupying nights, else None"""
+    if not isinstance(reservation, dict) or reservation.get("status") in INACTIVE_STATUSES:
+        return None
+    check_in = _day(reservation.get("checkIn"))
+    check_out = _day(reservation.get("checkOut"))
+    if check_in is None or check_out is None or check_out <= check_in:
+        return None
+    key = str(reservation.get("id") or f"{check_in}-{check_out}")
+    return (check_in, check_out, key)
+
+
+def reservation_key(reservation: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(reservation, dict):
+        return None
+    if reservation.get("id"):
+        return str(reservation["id"])
+    stay = stay_of(reservation)
+    return stay[2] if stay else None
+
+
+async def fetch_reservations(api_client: Any, property_id: str, page_size: int = RESERVATION_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Every reservation of the property, read with the client's PageIterator.
+    
+    Raises if fewer reservations arrive than the API's totalCount, since an
+    index missing stays would report booked nights as free.
+    """
+    pages = api_client.iter_reservations(page_size=page_size, propertyId=property_id)
+    reservations: List[Dict[str, Any]] = []
+    async for page in pages:
+        reservations.extend(page)
+    if pages.total_count is not None and len(reservations) < pages.total_count:
+        raise RuntimeError(
+            f"Read {len(reservations)} of {pages.total_count} reservations for property {property_id}"
+        )
+    return reservations
+
+
+class OccupancyIndex:
+    """Booked stays of one property, sorted by check-in day"""
+
+    def __init__(self, stays: Optional[List[Stay]] = None):
+        self._stays: List[Stay] = sorted(stays or [])
+        self._by_key: Dict[str, Stay] = {stay[2]: stay for stay in self._stays}
+        # Longest stay bounds how far before a query a conflicting check-in can be
+        self._max_nights = max((out - in_ for in_, out, _ in self._stays), default=0)
+
+    @classmethod
+    def from_reservations(cls, reservations: List[Dict[str, Any]]) -> "OccupancyIndex":
+        stays = {}
+        for reservation in reservations:
+            stay = stay_of(reservation)
+            if stay is not None:
+                stays[stay[2]] = stay
+        return cls(list(stays.values()))
+
+    def __len__(self) -> int:
+        return len(self._stays)
+
+    def keys(self) -> List[str]:
+        return list(self._by_key)
+
+    def upsert(self, reservation: Dict[str, Any]) -> bool:
+        """Add or update one reservation (cancelled ones are removed); True if the index changed"""
+        stay = stay_of(reservation)
+        if stay is None:
+            key = reservation_key(reservation)
+            return self.discard(key) if key else False
+        if self._by_key.get(stay[2]) == stay:
+            return False
+        self.discard(stay[2])
+        insort(self._stays, stay)
+        self._by_key[stay[2]] = stay
+        self._max_nights = max(self._max_nights, stay[1] - stay[0])
+        return True
+
+    def discard(self, key: str) -> bool:
+        stay = self._by_key.pop(key, None)
+        if stay is None:
+            return False
+        del self._stays[bisect_left(self._stays, stay)]
+        if stay[1] - stay[0] == self._max_nights:
+            self._max_nights = max((out - in_ for in_, out, _ in self._stays), default=0)
+        return True
+
+    def _overlapping(self, start: int, end: int) -> List[Stay]:
+        # Only stays checking in after start - longest stay and before end can overlap
+        lo = bisect_left(self._stays, (start - self._max_nights + 1,))
+        hi = bisect_left(self._stays, (end,))
+        return [stay for stay in self._stays[lo:hi] if stay[1] > start]
+
+    def conflicts(self, check_in: date, check_out: date) -> List[Tuple[date, date]]:
+        """Booked stays overlapping [check_in, check_out), in check-in order"""
+        return [
+            (date.fromordinal(in_), date.fromordinal(out))
+            for in_, out, _ in self._overlapping(check_in.toordinal(), check_out.toordinal())
+        ]
+
+    def is_available(self, check_in: date, check_out: date) -> bool:
+        return not self.conflicts(check_in, check_out)
+
+    def booked_nights(self, start: int, end: int) -> bytearray:
+        """One byte per night of day ordinals [start, end), 1 where booked"""
+        nights = bytearray(end - start)
+        for in_, out, _ in self._overlapping(start, end):
+            lo = max(in_, start) - start
+            hi = min(out, end) - start
+            nights[lo:hi] = b"\x01" * (hi - lo)
+        return nights
+
+    def nearest_free_windows(
+        self,
+        check_in: date,
+        nights: int,
+        k: int,
+        horizon: int = ALTERNATIVE_HORIZON_DAYS,
+        earliest: Optional[date] = None
+    ) -> List[date]:
+        """
+        Check-in dates of the k free stays of `nights` nights closest to check_in, in date order.
+        
+        Searches up to horizon days earlier (but not before earliest) and later.
+        """
+        target = check_in.toordinal()
+        first = target - horizon
+        if earliest is not None:
+            first = max(first, earliest.toordinal())
+        last = target + horizon
+        if k <= 0 or nights <= 0 or first > last:
+            return []
+        
+        # Slide a window of `nights` nights over the calendar, keeping its booked-night count
+        booked = self.booked_nights(first, last + nights)
+        count = sum(booked[:nights])
+        free = []
+        for offset in range(last - first + 1):
+            if offset:
+                count += booked[offset + nights - 1] - booked[offset - 1]
+            if count == 0 and first + offset != target:
+                free.append(first + offset)
+        
+        nearest = sorted(free, key=lambda day: (abs(day - target), day))[:k]
+        return [date.fromordinal(day) for day in sorted(nearest)]
+
+
+class _Entry:
+    __slots__ = ("index", "built_at")
+
+    def __init__(self, index: OccupancyIndex):
+        self.index = index
+        self.built_at = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+
+class OccupancyStore:
+    """OccupancyIndex per (customer, property), refreshed in the background after a TTL"""
+
+    def __init__(
+        self,
+        api_client: Any,
+        ttl: float = OCCUPANCY_TTL,
+        max_staleness: float = OCCUPANCY_MAX_STALENESS,
+        max_properties: int = OCCUPANCY_MAX_PROPERTIES,
+        page_size: int = RESERVATION_PAGE_SIZE
+    ):
+        self.api_client = api_client
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.max_properties = max(max_properties, 1)
+        self.page_size = page_size
+        self._entries: "OrderedDict[IndexKey, _Entry]" = OrderedDict()
+        self._building: Dict[IndexKey, asyncio.Task] = {}
+        self.hits = 0
+        self.builds = 0
+        self.refreshes = 0
+        self.changes = 0
+
+    def _key(self, property_id: str) -> IndexKey:
+        return (self.api_client.customer_id, str(property_id))
+
+    async def get(self, property_id: str) -> OccupancyIndex:
+        """The property's index; only a missing or very stale index is fetched inline"""
+        key = self._key(property_id)
+        entry = self._entries.get(key)
+        if entry is None or entry.age() > self.max_staleness:
+            entry = await self._refresh(key)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if entry.age() > self.ttl and key not in self._building:
+                self._start_refresh(key, background=True)
+        return entry.index
+
+    def apply(self, property_id: str, reservation: Dict[str, Any]) -> bool:
+        """Record a reservation created, changed or cancelled through this process"""
+        entry = self._entries.get(self._key(property_id))
+        return entry is not None and entry.index.upsert(reservation)
+
+    def _start_refresh(self, key: IndexKey, background: bool = False) -> asyncio.Task:
+        task = asyncio.create_task(self._sync(key, background))
+        self._building[key] = task
+        task.add_done_callback(lambda t, k=key: self._on_refreshed(k, t))
+        return task
+
+    def _on_refreshed(self, key: IndexKey, task: asyncio.Task):
+        self._building.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Refreshing occupancy index for property {key[1]} failed: {task.exception()}")
+
+    async def _refresh(self, key: IndexKey) -> _Entry:
+        """Build or refresh the index for key; concurrent callers share one fetch"""
+        task = self._building.get(key) or self._start_refresh(key)
+        return await asyncio.shield(task)
+
+    async def _sync(self, key: IndexKey, background: bool) -> _Entry:
+        if background:
+            # Started from inside a tool call; don't inherit that call's deadline
+            clear_deadline()
+            with deadline_scope(REFRESH_DEADLINE):
+                return await self._sync(key, background=False)
+
+        started = time.perf_counter()
+        reservations = await fetch_reservations(self.api_client, key[1], self.page_size)
+        previous = self._entries.get(key)
+
+        if previous is None:
+            entry = _Entry(OccupancyIndex.from_reservations(reservations))
+            self.builds += 1
+            changed = len(entry.index)
+        else:
+            # Apply only what changed, so readers keep using the same index object
+            index = previous.index
+            seen = set()
+            changed = 0
+            for reservation in reservations:
+                key_of = reservation_key(reservation)
+                if key_of:
+                    seen.add(key_of)
+                changed += index.upsert(reservation)
+            for stale in [k for k in index.keys() if k not in seen]:
+                changed += index.discard(stale)
+            entry = _Entry(index)
+            self.refreshes += 1
+            self.changes += changed
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_properties:
+            self._entries.popitem(last=False)
+        logger.info(
+            f"Occupancy index for property {key[1]} {'refreshed' if previous else 'built'} in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms: {len(reservations)} reservations, "
+            f"{len(entry.index)} stays" + (f", {changed} changes" if previous else "")
+        )
+        return entry
+
+    async def prewarm(self, property_ids: List[str], concurrency: int = 4):
+        """Build the indexes for property_ids, at most concurrency at a time"""
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def warm(property_id: str):
+            async with semaphore:
+                try:
+                    with deadline_scope(REFRESH_DEADLINE):
+                        await self._refresh(self._key(property_id))
+                except Exception as e:
+                    logger.warning(f"Prewarming occupancy index for property {property_id} failed: {e}")
+
+        await asyncio.gather(*(warm(property_id) for property_id in property_ids))
+
+    async def close(self):
+        tasks = list(self._building.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "properties": len(self._entries),
+            "stays": sum(len(entry.index) for entry in self._entries.values()),
+            "hits": self.hits,
+            "builds": self.builds,
+            "refreshes": self.refreshes,
+            "changes": self.changes
+        }
@@ -0,0 +1,681 @@
+"""
+Rendering of PMS property details into voice-agent context text
+
+Details are rendered section by section (see SECTIONS) so callers can ask
+for just the parts of a property they need, and can fit them into a token
+budget in SECTION_PRIORITY order (see fit_to_budget).
+"""
+
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+NO_PROPERTIES_TEXT = "No properties found for this customer."
+
+# Descriptions are cut to this many characters when rendering under a token budget
+DESCRIPTION_MAX_CHARS = int(os.getenv("PMS_DESCRIPTION_MAX_CHARS", "600"))
+
+# Roughly four characters per token for English text
+CHARS_PER_TOKEN = 4
+
+
+def _render_address(property_detail: Dict[str, Any], parts: List[str]):
+    # Basic Location info
+    street = property_detail.get("street", "")
+    city = property_detail.get("city", "")
+    state = property_detail.get("state", "")
+    country = property_detail.get("countryCode", "")
+    address = property_detail.get("address", "")
+    zip_code = property_detail.get("zipCode", "")
+    region = property_detail.get("region", "")
+    apt = property_detail.get("apt", "")
+
+    if any([street, city, state, address]):
+        location_parts = []
+        if apt:
+            location_parts.append(f"Apt {apt}")
+        location_parts.extend(filter(None, [address, street, city, state, zip_code, country]))
+        if region:
+            location_parts.append(f"Region: {region}")
+        full_address = ', '.join(location_parts)
+        parts.append(f"The property is located at {full_address}.\n")
+
+
+def _render_capacity(property_detail: Dict[str, Any], parts: List[str]):
+    # Capacity and Accommodation info
+    max_occupancy = property_detail.get("maxOccupancy")
+    max_adults = property_detail.get("maxAdults")
+    bedrooms = property_detail.get("bedrooms")
+    bathrooms = property_detail.get("bathrooms")
+    beds = property_detail.get("beds")
+
+    if max_occupancy:
+        parts.append(f"The property can accommodate up to {max_occupancy} guests.\n")
+    if max_adults:
+        parts.append(f"Maximum {max_adults} adults allowed.\n")
+    if bedrooms:
+        parts.append(f"The property has {int(bedrooms)} bedrooms.\n")
+    if bathrooms:
+        parts.append(f"There are {bathrooms} bathrooms.\n")
+    if beds:
+        parts.append(f"The property has {int(beds)} beds.\n")
+
+
+def _render_property_type(property_detail: Dict[str, Any], parts: List[str]):
+    # Property type and details
+    property_type = property_detail.get("typeCode")
+    if property_type:
+        parts.append(f"This is a {property_type}.\n")
+
+    # Additional property details
+    classification = property_detail.get("classification")
+    if classification:
+        parts.append(f"Classification: {classification}\n")
+
+    area_sqft = property_detail.get("areaSquareFeet")
+    if area_sqft:
+        parts.append(f"Area: {area_sqft} sq ft\n")
+
+    min_occupancy = property_detail.get("minOccupancy")
+    if min_occupancy:
+        parts.append(f"Min Occupancy: {min_occupancy} guests\n")
+
+    max_pets = property_detail.get("maxPets")
+    if max_pets is not None:
+        parts.append(f"Max Pets: {max_pets}\n")
+
+    num_units = property_detail.get("numberOfUnits")
+    if num_units:
+        parts.append(f"Number of Units: {num_units}\n")
+
+
+def _render_check_in_out(property_detail: Dict[str, Any], parts: List[str]):
+    # Check-in/Check-out times
+    check_in_from = property_detail.get("checkInFrom")
+    check_in_until = property_detail.get("checkInUntil")
+    check_out_from = property_detail.get("checkOutFrom")
+    check_out_until = property_detail.get("checkOutUntil")
+
+    if check_in_from or check_in_until:
+        check_in_time = f"{check_in_from}" + (f"-{check_in_until}" if check_in_until != check_in_from else "")
+        parts.append(f"Check in time is {check_in_time}.\n")
+    if check_out_from or check_out_until:
+        check_out_time = f"{check_out_from}" + (f"-{check_out_until}" if check_out_until != check_out_from else "")
+        parts.append(f"Check out time is {check_out_time}.\n")
+
+
+def _render_access(property_detail: Dict[str, Any], parts: List[str]):
+    # WiFi and Access Codes
+    wifi_network = property_detail.get("wifiNetwork")
+    wifi_password = property_detail.get("wifiPassword")
+    door_code = property_detail.get("doorCode")
+    lock_code = property_detail.get("lockCode")
+
+    if wifi_network:
+        parts.append(f"The WiFi network name is {wifi_network}.\n")
+    if wifi_password:
+        parts.append(f"The WiFi password is {wifi_password}.\n")
+    if door_code:
+        parts.append(f"The door access code is {door_code}.\n")
+    if lock_code:
+        parts.append(f"The lock code is {lock_code}.\n")
+
+
+def _render_manager(property_detail: Dict[str, Any], parts: List[str]):
+    # Property Manager
+    property_manager = property_detail.get("propertyManager")
+    if property_manager:
+        parts.append(f"The property is managed by {property_manager}.\n")
+
+
+def _render_pricing(property_detail: Dict[str, Any], parts: List[str]):
+    # Pricing Settings
+    pricing_settings = property_detail.get("pricingSettings")
+    if pricing_settings:
+        currency = pricing_settings.get("currency", "EUR")
+        base_price = pricing_settings.get("basePrice")
+        weekend_base_price = pricing_settings.get("weekendBasePrice")
+        cleaning_fee = pricing_settings.get("cleaningFee")
+        security_deposit = pricing_settings.get("securityDepositFee")
+        pet_fee = pricing_settings.get("petFee")
+        extra_person_fee = pricing_settings.get("extraPersonFee")
+        monthly_factor = pricing_settings.get("monthlyPriceFactor")
+        weekly_factor = pricing_settings.get("weeklyPriceFactor")
+        guests_included = pricing_settings.get("guestsIncludedInRegularFee")
+        weekend_days = pricing_settings.get("weekendDays")
+
+        parts.append(f"\nHere is the pricing information.\n")
+        if base_price is not None:
+            parts.append(f"The base price is {base_price} {currency} per night.\n")
+        if weekend_base_price and weekend_base_price > 0:
+            parts.append(f"The weekend price is {weekend_base_price} {currency} per night.\n")
+        if weekend_days:
+            parts.append(f"Weekend Days: {weekend_days}\n")
+        if cleaning_fee:
+            parts.append(f"Cleaning Fee: {currency} {cleaning_fee}\n")
+        if security_deposit:
+            parts.append(f"Security Deposit: {currency} {security_deposit}\n")
+        if pet_fee:
+            parts.append(f"Pet Fee: {currency} {pet_fee}\n")
+        if extra_person_fee:
+            parts.append(f"Extra Person Fee: {currency} {extra_person_fee}\n")
+        if guests_included is not None:
+            parts.append(f"Guests Included in Base Price: {guests_included}\n")
+        if monthly_factor and monthly_factor != 1.0:
+            parts.append(f"Monthly Discount: {(1 - monthly_factor) * 100:.0f}%\n")
+        if weekly_factor and weekly_factor != 1.0:
+            parts.append(f"Weekly Discount: {(1 - weekly_factor) * 100:.0f}%\n")
+
+
+def _render_fees_and_taxes(property_detail: Dict[str, Any], parts: List[str]):
+    # Additional Fees and Taxes
+    currency = (property_detail.get("pricingSettings") or {}).get("currency", "EUR")
+    fees = property_detail.get("fees", [])
+    if fees:
+        parts.append(f"\nAdditional Fees:\n")
+        for fee in fees:
+            fee_name = fee.get("name", "Unknown Fee")
+            fee_amount = fee.get("amount", 0)
+            fee_type = fee.get("type", "")
+            parts.append(f"  - {fee_name}: {currency} {fee_amount} ({fee_type})\n")
+
+    taxes = property_detail.get("taxes", [])
+    if taxes:
+        parts.append(f"\nTaxes:\n")
+        for tax in taxes:
+            tax_name = tax.get("name", "Unknown Tax")
+            tax_rate = tax.get("rate", 0)
+            parts.append(f"  {tax_name} is {tax_rate} percent.\n")
+
+
+# Amenity categories in match order: a typeCode belongs to the first category
+# with a keyword contained in it, and to "Other" when none matches
+AMENITY_CATEGORIES = (
+    ("Kitchen", ("KITCHEN", "REFRIGERATOR", "OVEN", "MICROWAVE")),
+    ("Bathroom", ("BATHROOM", "TUB", "SHOWER", "BIDET")),
+    ("Bedroom", ("BEDROOM", "BED", "LINENS")),
+    ("Safety", ("SAFETY", "DETECTOR", "EXTINGUISHER", "FIRST_AID")),
+    ("Family", ("CHILD", "BABY", "INFANT")),
+    ("Parking", ("PARKING", "GARAGE")),
+    ("Water Features", ("POOL", "BEACH", "WATERFRONT")),
+    ("Internet", ("INTERNET", "WIFI", "WIRELESS")),
+    ("Entertainment", ("TV", "CABLE", "SOUND", "VIDEO")),
+    ("Climate Control", ("AIR_CONDITIONING", "HEATING", "FAN")),
+    ("Outdoor", ("OUTDOOR", "GARDEN", "BALCONY", "PATIO")),
+)
+
+# One anchored alternation of lookaheads, tried in table order, so the first
+# matching category wins regardless of where its keyword occurs
+_AMENITY_MATCHER = re.compile(
+    "|".join(
+        f"(?P<c{idx}>(?=.*(?:{'|'.join(map(re.escape, keywords))})))"
+        for idx, (_, keywords) in enumerate(AMENITY_CATEGORIES)
+    ),
+    re.DOTALL
+)
+
+# Distinct typeCodes whose category is remembered
+AMENITY_CATEGORY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=AMENITY_CATEGORY_CACHE_SIZE)
+def classify_amenity(type_code: str) -> str:
+    """Category of an amenity typeCode (see AMENITY_CATEGORIES)"""
+    if not isinstance(type_code, str):
+        return "Other"
+    match = _AMENITY_MATCHER.match(type_code)
+    if match is None:
+        return "Other"
+    return AMENITY_CATEGORIES[int(match.lastgroup[1:])][0]
+
+
+def _render_amenities(property_detail: Dict[str, Any], parts: List[str]):
+    # Amenities with full details
+    amenities = property_detail.get("amenities", [])
+    if amenities:
+        parts.append(f"\nThis property has {len(amenities)} amenities.\n")
+
+        # Group amenities by category
+        amenity_categories = {}
+        for amenity in amenities:
+            if isinstance(amenity, dict) and not amenity.get("isDeleted", False):
+                type_code = amenity.get("typeCode", "OTHER")
+                attributes = amenity.get("attributes", "")
+                instruction = amenity.get("instruction", "")
+                is_present = amenity.get("isPresent")
+
+                category = classify_amenity(type_code)
+
+                if category not in amenity_categories:
+                    amenity_categories[category] = []
+
+                amenity_info = attributes
+                if instruction:
+                    amenity_info += f" (Note: {instruction})"
+                if is_present is False:
+                    amenity_info += " [NOT PRESENT]"
+
+                amenity_categories[category].append(amenity_info)
+
+        # Display amenities by category
+        for category in sorted(amenity_categories.keys()):
+            parts.append(f"  In the {category} category, there are {len(amenity_categories[category])} items.\n")
+            for amenity in amenity_categories[category]:  # Show ALL amenities
+                parts.append(f"    {amenity}\n")
+
+
+def _render_license(property_detail: Dict[str, Any], parts: List[str]):
+    # License info
+    license_code = property_detail.get("licenseCode")
+    license_date = property_detail.get("licenseDate")
+    if license_code:
+        parts.append(f"License code is {license_code}")
+        if license_date:
+            parts.append(f" issued on {license_date}")
+        parts.append("\n")
+
+
+def _render_base_currency(property_detail: Dict[str, Any], parts: List[str]):
+    # Currency info
+    base_currency = property_detail.get("baseCurrency")
+    if base_currency:
+        parts.append(f"The base currency is {base_currency}.\n")
+
+
+def _render_coordinates(property_detail: Dict[str, Any], parts: List[str]):
+    # Coordinates
+    lat = property_detail.get("latitude")
+    lon = property_detail.get("longitude")
+    if lat and lon:
+        parts.append(f"The property is located at latitude {lat} and longitude {lon}.\n")
+
+
+def _render_time_zone(property_detail: Dict[str, Any], parts: List[str]):
+    # Time Zone
+    time_zone = property_detail.get("timeZone")
+    if time_zone:
+        parts.append(f"The property is in the {time_zone} time zone.\n")
+
+
+def _render_descriptions(property_detail: Dict[str, Any], parts: List[str]):
+    # Description (showing FULL descriptions for voice agent context)
+    descriptions = property_detail.get("descriptions", [])
+    if descriptions:
+        parts.append(f"\nThe property has {len(descriptions)} descriptions.\n")
+        for desc_idx, desc in enumerate(descriptions, 1):
+            if isinstance(desc, dict) and desc.get("text"):
+                description_text = desc["text"]
+                desc_type = desc.get("typeCode", "Unknown")
+                desc_lang = desc.get("language", "Default")
+                parts.append(f"  Description {desc_idx} (Type: {desc_type}, Language: {desc_lang}):\n")
+                parts.append(f"  {description_text}\n\n")
+
+
+def _render_images(property_detail: Dict[str, Any], parts: List[str]):
+    # Images count only (details removed per user request)
+    images = property_detail.get("images", [])
+    if images:
+        parts.append(f"\nTotal Images Available: {len(images)}\n")
+
+
+def _render_integrations(property_detail: Dict[str, Any], parts: List[str]):
+    # Integrations (OTA connections)
+    integrations = property_detail.get("integrations", [])
+    if integrations:
+        parts.append(f"\nOTA Integrations:\n")
+        for integration in integrations:
+            source = integration.get("source", "Unknown")
+            ota_id = integration.get("otaId", "")
+            ota_url = integration.get("otaUrl", "")
+            if ota_id:
+                parts.append(f"  - {source.title()}: ID {ota_id}\n")
+            if ota_url:
+                parts.append(f"    URL: {ota_url}\n")
+
+
+def _render_knowledge_base(property_detail: Dict[str, Any], parts: List[str]):
+    # Knowledge Base Status
+    knowledge_percentage = property_detail.get("knowledgePercentage")
+    knowledge_conflict = property_detail.get("knowledgeConflict")
+    knowledge_last_sync = property_detail.get("knowledgeLastSync")
+    conversation_rag = property_detail.get("conversationRagStatus")
+    document_rag = property_detail.get("documentRagStatus")
+    kb_rag_status = property_detail.get("knowledgeBaseRagStatus")
+
+    if any([knowledge_percentage is not None, knowledge_conflict is not None, knowledge_last_sync]):
+        parts.append(f"\nKnowledge Base Status:\n")
+        if knowledge_percentage is not None:
+            parts.append(f"  Completion: {knowledge_percentage}%\n")
+        if knowledge_conflict is not None:
+            parts.append(f"  Conflicts: {knowledge_conflict}\n")
+        if knowledge_last_sync:
+            parts.append(f"  Last Sync: {knowledge_last_sync}\n")
+        if conversation_rag is not None:
+            parts.append(f"  Conversation RAG Status: {conversation_rag}\n")
+        if document_rag is not None:
+            parts.append(f"  Document RAG Status: {document_rag}\n")
+        if kb_rag_status is not None:
+            parts.append(f"  KB RAG Status: {'Active' if kb_rag_status else 'Inactive'}\n")
+
+
+def _render_channel(property_detail: Dict[str, Any], parts: List[str]):
+    # Channel and Listing Information
+    channel_code = property_detail.get("channelCode")
+    listing_id = property_detail.get("listingId")
+    customer_channel_id = property_detail.get("customerChannelId")
+    is_channel = property_detail.get("isChannel")
+
+    if any([channel_code, listing_id, customer_channel_id, is_channel is not None]):
+        parts.append(f"\nChannel Information:\n")
+        if channel_code:
+            parts.append(f"  Channel Code: {channel_code}\n")
+        if listing_id:
+            parts.append(f"  Listing ID: {listing_id}\n")
+        if customer_channel_id:
+            parts.append(f"  Customer Channel ID: {customer_channel_id}\n")
+        if is_channel is not None:
+            parts.append(f"  Is Channel: {'Yes' if is_channel else 'No'}\n")
+
+
+def _render_booking_settings(property_detail: Dict[str, Any], parts: List[str]):
+    # Booking Settings
+    booking_settings = property_detail.get("bookingSettings")
+    if booking_settings:
+        parts.append(f"\nBooking Settings:\n")
+        for key, value in booking_settings.items():
+            if value is not None:
+                parts.append(f"  {key}: {value}\n")
+
+
+def _render_nearest_places(property_detail: Dict[str, Any], parts: List[str]):
+    # Nearest Places
+    nearest_places = property_detail.get("nearestPlaces")
+    if nearest_places:
+        parts.append(f"\nNearby Attractions:\n")
+        for place in nearest_places:
+            place_name = place.get("name", "Unknown")
+            distance = place.get("distance", "")
+            parts.append(f"  - {place_name}: {distance}\n")
+
+
+def _render_custom_fields(property_detail: Dict[str, Any], parts: List[str]):
+    # Custom Fields
+    custom_fields = property_detail.get("customFields", [])
+    if custom_fields:
+        parts.append(f"\nCustom Fields:\n")
+        for field in custom_fields:
+            field_name = field.get("name", "Unknown Field")
+            field_value = field.get("value", "")
+            parts.append(f"  {field_name}: {field_value}\n")
+
+
+def _render_tags(property_detail: Dict[str, Any], parts: List[str]):
+    # Tags
+    tags = property_detail.get("tags", [])
+    if tags:
+        tag_names = [tag.get("name", "") for tag in tags if tag.get("name")]
+        if tag_names:
+            parts.append(f"\nTags: {', '.join(tag_names)}\n")
+
+
+def _render_files(property_detail: Dict[str, Any], parts: List[str]):
+    # Files
+    files = property_detail.get("files", [])
+    if files:
+        parts.append(f"\nAdditional Files ({len(files)} total):\n")
+        for file in files:
+            file_name = file.get("name", "Unknown")
+            file_type = file.get("type", "")
+            file_url = file.get("url", "")
+            file_size = file.get("size", "")
+            parts.append(f"  - {file_name}")
+            if file_type:
+                parts.append(f" (Type: {file_type})")
+            if file_size:
+                parts.append(f" [Size: {file_size}]")
+            parts.append("\n")
+            if file_url:
+                parts.append(f"    URL: {file_url}\n")
+
+
+def _render_sub_rooms(property_detail: Dict[str, Any], parts: List[str]):
+    # Sub-rooms
+    sub_rooms = property_detail.get("subRooms", [])
+    if sub_rooms:
+        parts.append(f"\nSub-rooms/Units ({len(sub_rooms)} total):\n")
+        for room in sub_rooms:  # Show ALL sub-rooms
+            room_name = room.get("name", "Unnamed Room")
+            room_type = room.get("type", "")
+            room_id = room.get("id", "")
+            room_desc = room.get("description", "")
+            parts.append(f"  - {room_name}")
+            if room_type:
+                parts.append(f" (Type: {room_type})")
+            if room_id:
+                parts.append(f" [ID: {room_id}]")
+            parts.append("\n")
+            if room_desc:
+                parts.append(f"    Description: {room_desc}\n")
+
+
+# (section, renderer) in output order; a section may span several renderers
+_RENDERERS = [
+    ("location", _render_address),
+    ("overview", _render_capacity),
+    ("overview", _render_property_type),
+    ("overview", _render_check_in_out),
+    ("access", _render_access),
+    ("overview", _render_manager),
+    ("pricing", _render_pricing),
+    ("pricing", _render_fees_and_taxes),
+    ("amenities", _render_amenities),
+    ("other", _render_license),
+    ("pricing", _render_base_currency),
+    ("location", _render_coordinates),
+    ("location", _render_time_zone),
+    ("descriptions", _render_descriptions),
+    ("media", _render_images),
+    ("channels", _render_integrations),
+    ("knowledge_base", _render_knowledge_base),
+    ("channels", _render_channel),
+    ("policies", _render_booking_settings),
+    ("location", _render_nearest_places),
+    ("other", _render_custom_fields),
+    ("other", _render_tags),
+    ("media", _render_files),
+    ("media", _render_sub_rooms),
+]
+
+SECTIONS = (
+    "overview", "location", "access", "pricing", "amenities", "descriptions",
+    "policies", "channels", "knowledge_base", "media", "other",
+)
+
+# Order in which sections claim a token budget
+SECTION_PRIORITY = (
+    "overview", "pricing", "amenities", "descriptions", "location", "access",
+    "policies", "knowledge_base", "channels", "media", "other",
+)
+
+
+def render_property_detail(
+    property_detail: Dict[str, Any],
+    parts: List[str],
+    sections: Optional[Sequence[str]] = None
+):
+    """
+    Append the context lines for one property's /api/Property/Get response to parts.
+    
+    Without sections every section is rendered in the full-context order;
+    otherwise only the given sections, in the order given. A section that
+    fails to render is skipped without affecting the others.
+    """
+    if sections is None:
+        renderers = _RENDERERS
+    else:
+        renderers = [
+            (section, renderer)
+            for wanted in dict.fromkeys(sections)
+            for section, renderer in _RENDERERS if section == wanted
+        ]
+    for section, renderer in renderers:
+        mark = len(parts)
+        try:
+            renderer(property_detail, parts)
+        except Exception as e:
+            del parts[mark:]
+            logger.warning(f"Could not render {section} details for property {property_detail.get('id')}: {e}")
+
+
+def render_property_index(properties: List[Dict[str, Any]], total_count: int) -> str:
+    """One line per property from the GetAll summaries, pointing at get_property_details"""
+    if not properties:
+        return NO_PROPERTIES_TEXT
+    
+    active_count = len([p for p in properties if p.get("status", False)])
+    lines = [
+        f"Customer Property Index\n",
+        f"You have {total_count} properties in total, {active_count} active and {total_count - active_count} inactive.\n\n"
+    ]
+    
+    for idx, prop in enumerate(properties, 1):
+        fields = [f"{idx}. {prop.get('name', 'Unknown')}", f"ID {prop.get('id')}"]
+        if not prop.get("status", False):
+            fields.append("inactive")
+        if prop.get("typeCode"):
+            fields.append(str(prop["typeCode"]).replace("_", " ").lower())
+        if prop.get("city"):
+            fields.append(str(prop["city"]))
+        if prop.get("maxOccupancy"):
+            fields.append(f"up to {prop['maxOccupancy']} guests")
+        if prop.get("bedrooms"):
+            fields.append(f"{prop['bedrooms']} bedrooms")
+        lines.append(" | ".join(fields) + "\n")
+    
+    lines.append(
+        f"\nFor anything else about a property call get_property_details with its ID and the sections you need: "
+        f"{', '.join(SECTIONS)}.\n"
+    )
+    return "".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate from the character count"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _language_code(value: Any) -> str:
+    return str(value or "").lower().replace("_", "-").split("-")[0]
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:.") + "..."
+
+
+def select_descriptions(
+    property_detail: Dict[str, Any],
+    language: Optional[str] = None,
+    max_chars: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    property_detail with only the descriptions in language, each cut to max_chars.
+    
+    All descriptions are kept when none is in the requested language.
+    """
+    descriptions = property_detail.get("descriptions")
+    if not descriptions or not (language or max_chars):
+        return property_detail
+    
+    if language:
+        wanted = _language_code(language)
+        matching = [d for d in descriptions if isinstance(d, dict) and _language_code(d.get("language")) == wanted]
+        descriptions = matching or descriptions
+    if max_chars:
+        descriptions = [
+            dict(d, text=_truncate(d["text"], max_chars)) if isinstance(d, dict) and isinstance(d.get("text"), str) else d
+            for d in descriptions
+        ]
+    return dict(property_detail, descriptions=descriptions)
+
+
+def render_sections(
+    property_detail: Dict[str, Any],
+    sections: Sequence[str],
+    language: Optional[str] = None,
+    description_max_chars: Optional[int] = None
+) -> List[Tuple[str, str]]:
+    """(section, text) for each of sections with anything to say, in the order given"""
+    property_detail = select_descriptions(property_detail, language, description_max_chars)
+    rendered = []
+    for section in sections:
+        parts: List[str] = []
+        render_property_detail(property_detail, parts, [section])
+        if parts:
+            rendered.append((section, "".join(parts)))
+    return rendered
+
+
+def fit_to_budget(
+    candidates: Sequence[Sequence[Tuple[str, str]]],
+    max_tokens: int,
+    order: Sequence[str] = SECTION_PRIORITY
+) -> Tuple[List[List[Tuple[str, str]]], Dict[str, int]]:
+    """
+    Choose rendered sections for one or more properties within max_tokens.
+    
+    Sections are taken in `order`, each across all properties before the
+    next, so every property gets its most important sections first. A section
+    that does not fit is left out while smaller ones after it may still fit.
+    Returns the kept (section, text) pairs per property, in `order`, and the
+    number of properties each left-out section was dropped for.
+    """
+    remaining = max_tokens
+    kept: List[List[Tuple[str, str]]] = [[] for _ in candidates]
+    omitted: Dict[str, int] = {}
+    by_section = [dict(rendered) for rendered in candidates]
+    
+    for section in order:
+        for idx, texts in enumerate(by_section):
+            text = texts.get(section)
+            if text is None:
+                continue
+            cost = estimate_tokens(text)
+            if cost <= remaining:
+                kept[idx].append((section, text))
+                remaining -= cost
+            else:
+                omitted[section] = omitted.get(section, 0) + 1
+    return kept, omitted
+
+
+def render_omitted_note(omitted: Dict[str, int], per_property: bool = False) -> str:
+    """Tell the model which sections were left out and how to get them ("" when none were)"""
+    if not omitted:
+        return ""
+    if per_property:
+        left_out = ", ".join(f"{section} for {count} properties" for section, count in omitted.items())
+        hint = "Call get_property_details with a property ID and these sections for the rest."
+    else:
+        left_out = ", ".join(omitted)
+        hint = "Call get_property_details again with just these sections for the rest."
+    return f"\nLeft out to stay within the size limit: {left_out}. {hint}\n"
+
+
+def render_unavailable_note(properties: List[Dict[str, Any]]) -> str:
+    """Name the properties whose details could not be loaded ("" when none failed)"""
+    if not properties:
+        return ""
+    names = ", ".join(f"{p.get('name', 'Unknown')} (ID {p.get('id')})" for p in properties)
+    return (
+        f"\nDetails could not be loaded for {len(properties)} properties: {names}. "
+        "Call get_property_details with a property ID to try again.\n"
+    )
@@ -0,0 +1,177 @@
+"""
+Client-side rate limiting for PMS API requests
+
+Every tenant gets one token bucket for reads and one for writes, so a burst
+from one customer (or a retry storm) cannot starve the others. Callers wait
+for a token in FIFO order, and a Retry-After from the upstream pauses the
+bucket for everyone sharing it.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from .retry import DeadlineExceeded, remaining_time
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("PMS_RATE_LIMIT_ENABLED", "true").lower() != "false"
+# Sustained requests per second and burst size, per tenant and endpoint class.
+# Reads are sized for the properties context fan-out (one detail GET per active
+# property): a cold build for ~300 properties fits inside PMS_TOOL_DEADLINE.
+READ_RATE = float(os.getenv("PMS_RATE_LIMIT_READ_RPS", "50"))
+READ_BURST = float(os.getenv("PMS_RATE_LIMIT_READ_BURST", "100"))
+WRITE_RATE = float(os.getenv("PMS_RATE_LIMIT_WRITE_RPS", "2"))
+WRITE_BURST = float(os.getenv("PMS_RATE_LIMIT_WRITE_BURST", "5"))
+# Upper bound on how long a single Retry-After may pause a bucket
+MAX_RETRY_AFTER = float(os.getenv("PMS_RATE_LIMIT_MAX_RETRY_AFTER", "60"))
+MAX_BUCKETS = int(os.getenv("PMS_RATE_LIMIT_MAX_BUCKETS", "1024"))
+
+
+def endpoint_class(method: str) -> str:
+    return "read" if method.upper() in ("GET", "HEAD") else "write"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class TokenBucket:
+    """
+    Async token bucket; waiters are served in arrival order.
+
+    The lock is held while a waiter sleeps for its token, so later callers
+    queue behind it instead of racing for the next refill. Time spent queueing
+    for the lock counts against the caller's deadline too.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def pause(self, seconds: float):
+        """Hold every waiter back for `seconds` (e.g. after a Retry-After)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Resume with an empty bucket so the backlog drains at the sustained rate
+        self.tokens = 0.0
+        self._last_refill = self._paused_until
+
+    def _wait_time(self, now: float) -> float:
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    async def _acquire_lock(self):
+        """Take the queue lock, giving up when the caller's deadline passes first"""
+        remaining = remaining_time()
+        if remaining is None:
+            await self._lock.acquire()
+            return
+        lock_task = asyncio.ensure_future(self._lock.acquire())
+        try:
+            await asyncio.wait({lock_task}, timeout=max(remaining, 0.0))
+        except BaseException:
+            # Caller cancelled: give the lock back if it was already granted
+            if lock_task.done() and not lock_task.cancelled():
+                self._lock.release()
+            else:
+                lock_task.cancel()
+            raise
+        if not lock_task.done():
+            # Cancelling a waiter that was just handed the lock passes it on to the next one
+            lock_task.cancel()
+            raise DeadlineExceeded("Rate limit queue wait exceeds the tool call deadline")
+
+    async def acquire(self):
+        await self._acquire_lock()
+        try:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self.tokens -= 1.0
+                    return
+                remaining = remaining_time()
+                if remaining is not None and remaining < wait:
+                    raise DeadlineExceeded(f"Rate limit wait of {wait:.2f}s exceeds the tool call deadline")
+                self.waited += wait
+                await asyncio.sleep(wait)
+        finally:
+            self._lock.release()
+
+
+class RateLimiter:
+    """Token buckets keyed by (tenant, endpoint class), least recently used evicted first"""
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_buckets: int = MAX_BUCKETS
+    ):
+        # endpoint class -> (requests per second, burst)
+        self.rates = rates or {
+            "read": (READ_RATE, READ_BURST),
+            "write": (WRITE_RATE, WRITE_BURST),
+        }
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.throttled = 0
+
+    def bucket(self, tenant: str, method: str) -> TokenBucket:
+        key = (tenant, endpoint_class(method))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, burst = self.rates[key[1]]
+            bucket = TokenBucket(rate, burst)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    async def acquire(self, tenant: str, method: str):
+        await self.bucket(tenant, method).acquire()
+
+    def pause(self, tenant: str, method: str, seconds: float):
+        self.throttled += 1
+        logger.warning(f"PMS API throttled {endpoint_class(method)} requests for tenant {tenant}; pausing {seconds:.1f}s")
+        self.bucket(tenant, method).pause(seconds)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "buckets": len(self._buckets),
+            "throttled": self.throttled,
+            "waited_seconds": sum(bucket.waited for bucket in self._buckets.values())
+        }
+
+
+# Shared by every client in the process so all tenant views draw from the same buckets
+default_rate_limiter = RateLimiter() if RATE_LIMIT_ENABLED else None
@@ -0,0 +1,175 @@
+"""
+Record and replay PMS API traffic
+
+RecordingTransport forwards requests to the real API and appends every
+request/response pair to a JSONL fixture file. replay_transport() serves a
+fixture back through httpx.MockTransport with the recorded (or a fixed)
+latency plus jitter, so PMSTools can be tested and benchmarked offline.
+
+Authorization headers are never written to fixtures.
+"""
+
+import os
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Callable
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Record live traffic to this fixture file
+RECORD_PATH = os.getenv("PMS_RECORD_PATH")
+# Serve responses from this fixture file instead of the network
+REPLAY_PATH = os.getenv("PMS_REPLAY_PATH")
+# Fixed replay latency in seconds; unset replays each response's recorded latency
+REPLAY_LATENCY = os.getenv("PMS_REPLAY_LATENCY")
+REPLAY_JITTER = float(os.getenv("PMS_REPLAY_JITTER", "0"))
+
+# Only these response headers are kept in fixtures
+_KEPT_RESPONSE_HEADERS = ("content-type", "etag", "retry-after")
+
+
+def request_key(request: httpx.Request) -> str:
+    """Identify a request by tenant, method, path, query and (for writes) body"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.url.params.multi_items()))
+    key = f"{request.headers.get('customerId', '')} {request.method} {request.url.path}?{query}"
+    if request.method not in ("GET", "HEAD", "DELETE"):
+        key += " " + hashlib.sha256(request.content).hexdigest()[:16]
+    return key
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(response: Dict[str, Any]) -> bytes:
+    if "body_b64" in response:
+        return base64.b64decode(response["body_b64"])
+    return response.get("body", "").encode("utf-8")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through to `transport` and append each exchange to `path`"""
+
+    def __init__(self, path: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.path = path
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self._lock = asyncio.Lock()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.perf_counter() - started
+
+        record = {
+            "key": request_key(request),
+            "request": {"method": request.method, "url": request.url.raw_path.decode("ascii")},
+            "response": {
+                "status": response.status_code,
+                "headers": {k: v for k, v in response.headers.items() if k.lower() in _KEPT_RESPONSE_HEADERS},
+                "elapsed": round(elapsed, 6),
+                **_encode_body(content)
+            }
+        }
+        async with self._lock:
+            await asyncio.to_thread(self._append, json.dumps(record))
+
+        # The body is already decoded, so drop the headers describing its wire encoding
+        headers = [
+            (k, v) for k, v in response.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions=response.extensions
+        )
+
+    def _append(self, line: str):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def load_fixtures(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Recorded responses grouped by request key, in recording order"""
+    fixtures: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                fixtures[record["key"]].append(record["response"])
+    return fixtures
+
+
+def replay_transport(
+    path: str,
+    latency: Optional[float] = None,
+    jitter: float = 0.0,
+    seed: Optional[int] = None
+) -> httpx.MockTransport:
+    """
+    Serve the responses recorded in `path`.
+
+    Repeated requests get the recorded responses in order, then the last one
+    again. Each response is delayed by `latency` seconds (the recorded latency
+    when None) plus uniform jitter of +/- `jitter` seconds. Unknown requests
+    get a 404.
+    """
+    fixtures = load_fixtures(path)
+    served: Dict[str, int] = defaultdict(int)
+    rng = random.Random(seed)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        responses = fixtures.get(key)
+        if not responses:
+            logger.warning(f"No recorded response for {key}")
+            return httpx.Response(404, json={"error": "No recorded response", "key": key})
+
+        recorded = responses[min(served[key], len(responses) - 1)]
+        served[key] += 1
+
+        delay = recorded.get("elapsed", 0.0) if latency is None else latency
+        if jitter:
+            delay += rng.uniform(-jitter, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return httpx.Response(recorded["status"], headers=recorded.get("headers"), content=_decode_body(recorded))
+
+    return httpx.MockTransport(handler)
+
+
+def transport_from_env(
+    network_transport: Optional[Callable[[], httpx.AsyncBaseTransport]] = None
+) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Replay or recording transport selected by PMS_REPLAY_PATH / PMS_RECORD_PATH, if any.
+
+    network_transport builds the transport a recording forwards requests through.
+    """
+    if REPLAY_PATH:
+        logger.info(f"Replaying PMS API responses from {REPLAY_PATH}")
+        latency = float(REPLAY_LATENCY) if REPLAY_LATENCY else None
+        return replay_transport(REPLAY_PATH, latency=latency, jitter=REPLAY_JITTER)
+    if RECORD_PATH:
+        logger.info(f"Recording PMS API traffic to {RECORD_PATH}")
+        return RecordingTransport(RECORD_PATH, network_transport() if network_transport else None)
+    return None
@@ -0,0 +1,148 @@
+"""
+Retry policy for PMS API requests
+
+Backoff uses decorrelated jitter, retries draw from a process-wide budget so
+they cannot multiply load during an outage, and a deadline set by the tool
+call (via deadline_scope) caps every attempt and skips retries that could not
+finish in time.
+"""
+
+import os
+import time
+import random
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a tool call may spend on PMS requests before giving up
+DEFAULT_TOOL_DEADLINE = float(os.getenv("PMS_TOOL_DEADLINE", "8"))
+
+# Absolute time.monotonic() deadline of the current tool call, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("pms_request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot start before the tool call's deadline"""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Bound every PMS request made inside the block (and its tasks) to `seconds` from now"""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def clear_deadline():
+    """Drop any deadline inherited by the current task (for long-lived background tasks)"""
+    _deadline.set(None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries at a fraction of recent requests.
+
+    Each request deposits `ratio` tokens and each retry withdraws one, with a
+    small per-second floor so rarely used processes can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._last_refill = time.monotonic()
+        self.exhausted = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self._last_refill) * self.min_per_second)
+        self._last_refill = now
+
+    def record_request(self):
+        self._refill()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+
+# Shared by every client in the process so retries are budgeted globally
+default_retry_budget = RetryBudget(
+    ratio=float(os.getenv("PMS_RETRY_BUDGET_RATIO", "0.2")),
+    min_per_second=float(os.getenv("PMS_RETRY_BUDGET_MIN_PER_SECOND", "1.0"))
+)
+
+
+class RetryPolicy:
+    """Decides whether and when to retry a failed PMS request"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        attempt_timeout: float = 30.0,
+        min_attempt_time: float = 0.5,
+        budget: Optional[RetryBudget] = None
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        # A retry is pointless if less than this would be left for the attempt itself
+        self.min_attempt_time = min_attempt_time
+        self.budget = budget or default_retry_budget
+
+    def next_delay(self, previous_delay: float) -> float:
+        """Decorrelated jitter: uniform between the base delay and 3x the previous delay"""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def timeout_for_attempt(self, attempt_timeout: Optional[float] = None) -> float:
+        """Per-attempt timeout, shortened to whatever is left of the deadline"""
+        attempt_timeout = attempt_timeout or self.attempt_timeout
+        remaining = remaining_time()
+        if remaining is None:
+            return attempt_timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Tool call deadline exceeded before the request could start")
+        return min(attempt_timeout, remaining)
+
+    def should_retry(self, attempt: int, delay: float) -> bool:
+        """attempt is the 0-based index of the attempt that just failed"""
+        if attempt >= self.max_attempts - 1:
+            return False
+        remaining = remaining_time()
+        if remaining is not None and remaining < delay + self.min_attempt_time:
+            logger.info(f"Skipping retry: {remaining:.2f}s left before the deadline")
+            return False
+        if not self.budget.try_spend():
+            logger.warning("Retry budget exhausted, not retrying")
+            return False
+        return True
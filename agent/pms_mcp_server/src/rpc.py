@@ -0,0 +1,87 @@
+"""
+Plain JSON-RPC dispatch for the MCP tools
+
+Shared by http_server and sse_server's /rpc route. A body may be a single
+request or a batch (a list of requests); batch items run concurrently and
+are answered in one response.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from .tools import PMSTools
+
+logger = logging.getLogger(__name__)
+
+
+def rpc_error(code: int, message: str, request_id: Any) -> Dict[str, Any]:
+    """Build a JSON-RPC error response"""
+    return {
+        "jsonrpc": "2.0",
+        "error": {"code": code, "message": message},
+        "id": request_id
+    }
+
+
+def deadline_from_params(params: Dict[str, Any]) -> Optional[float]:
+    """Read the caller's remaining time budget from params._meta.deadlineMs"""
+    deadline_ms = (params.get("_meta") or {}).get("deadlineMs")
+    return deadline_ms / 1000.0 if deadline_ms else None
+
+
+async def dispatch_rpc(pms_tools: Optional[PMSTools], data: Any) -> Tuple[Dict[str, Any], int]:
+    """Execute a single JSON-RPC request and return the response with its HTTP status"""
+    if not isinstance(data, dict):
+        return rpc_error(-32600, "Invalid request", None), 400
+
+    method = data.get("method")
+    params = data.get("params", {})
+    request_id = data.get("id", 1)
+
+    if pms_tools is None:
+        return rpc_error(-32603, "Tools not initialized", request_id), 500
+
+    try:
+        # Route methods
+        if method == "tools/list":
+            tools = pms_tools.get_available_tools()
+            result = {"tools": [tool.dict() for tool in tools]}
+
+        elif method == "tools/call":
+            tool_name = params.get("name")
+            arguments = params.get("arguments", {})
+
+            if not tool_name:
+                return rpc_error(-32602, "Tool name required", request_id), 400
+
+            # Execute tool within the caller's deadline, if one was sent
+            result = await pms_tools.execute_tool(tool_name, arguments, deadline=deadline_from_params(params))
+            # Convert TextContent to dict
+            result = {"content": [{"type": item.type, "text": item.text} for item in result]}
+
+        else:
+            return rpc_error(-32601, f"Method not found: {method}", request_id), 404
+
+        # Return success response
+        return {
+            "jsonrpc": "2.0",
+            "result": result,
+            "id": request_id
+        }, 200
+
+    except Exception as e:
+        logger.error(f"Error handling RPC request: {e}")
+        return rpc_error(-32603, f"Internal error: {str(e)}", request_id), 500
+
+
+async def dispatch_rpc_body(pms_tools: Optional[PMSTools], data: Any) -> Tuple[Any, int]:
+    """Execute a request or a batch; per-item failures are reported inside the batch"""
+    if not isinstance(data, list):
+        return await dispatch_rpc(pms_tools, data)
+
+    if not data:
+        return rpc_error(-32600, "Invalid request: empty batch", None), 400
+
+    responses = await asyncio.gather(*(dispatch_rpc(pms_tools, item) for item in data))
+    return [response for response, _ in responses], 200
@@ -0,0 +1,247 @@
+"""
+Precomputed properties context per customer
+
+get_customer_properties_context is served from a rendered snapshot. A
+background task refreshes every snapshot that is still being read: it lists
+the properties again and re-renders only those whose modified timestamp (or,
+without one, the hash of their detail response) changed. A refresh whose
+listing fails or comes back short keeps the previous snapshot. Background
+refreshes revalidate every cached GET with the server, so an edit shows up
+within one refresh interval instead of waiting out the response cache TTLs.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from .property_renderer import NO_PROPERTIES_TEXT, render_unavailable_note
+from .cache import revalidate_scope
+from .retry import clear_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_ENABLED = os.getenv("PMS_CONTEXT_SNAPSHOTS", "true").lower() != "false"
+# Seconds between background refreshes
+REFRESH_INTERVAL = float(os.getenv("PMS_SNAPSHOT_REFRESH_INTERVAL", "60"))
+# A snapshot older than this (e.g. the refresher keeps failing) is rebuilt on read
+MAX_STALENESS = float(os.getenv("PMS_SNAPSHOT_MAX_STALENESS", "600"))
+# Snapshots not read for this long stop being refreshed and are dropped
+IDLE_TTL = float(os.getenv("PMS_SNAPSHOT_IDLE_TTL", "3600"))
+# Deadline for one background refresh
+REFRESH_DEADLINE = float(os.getenv("PMS_SNAPSHOT_REFRESH_DEADLINE", "120"))
+
+# Property summary fields that change whenever the property is edited, checked in order
+MODIFIED_FIELDS = ("updatedAt", "modifiedAt", "lastModified", "lastModifiedDate", "modifiedDate")
+
+SnapshotKey = Tuple[str, bool]
+
+
+def _modified_marker(summary: Dict[str, Any]) -> Optional[str]:
+    for field in MODIFIED_FIELDS:
+        value = summary.get(field)
+        if value:
+            return str(value)
+    return None
+
+
+def _digest(detail: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(detail, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ContextSnapshot:
+    __slots__ = ("text", "built_at", "last_access", "markers", "hashes", "fragments")
+
+    def __init__(
+        self,
+        text: str,
+        markers: Optional[Dict[str, str]] = None,
+        hashes: Optional[Dict[str, str]] = None,
+        fragments: Optional[Dict[str, str]] = None
+    ):
+        self.text = text
+        self.built_at = time.monotonic()
+        self.last_access = self.built_at
+        # Per property id: modified timestamp, detail hash and rendered detail text
+        self.markers = markers or {}
+        self.hashes = hashes or {}
+        self.fragments = fragments or {}
+
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+
+class ContextSnapshotStore:
+    """Rendered properties context per (customer, include_inactive), refreshed incrementally"""
+
+    def __init__(
+        self,
+        tools: Any,
+        refresh_interval: float = REFRESH_INTERVAL,
+        max_staleness: float = MAX_STALENESS,
+        idle_ttl: float = IDLE_TTL
+    ):
+        # The PMSTools instance whose listing, fetching and rendering steps are reused
+        self.tools = tools
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.idle_ttl = idle_ttl
+        self._snapshots: Dict[SnapshotKey, ContextSnapshot] = {}
+        self._building: Dict[SnapshotKey, asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self.rendered = 0
+        self.reused = 0
+
+    def _key(self, include_inactive: bool) -> SnapshotKey:
+        return (self.tools.api_client.customer_id, bool(include_inactive))
+
+    async def get_context(self, include_inactive: bool = False) -> str:
+        self._ensure_refresher()
+        key = self._key(include_inactive)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None or snapshot.age() > self.max_staleness:
+            try:
+                snapshot = await self._refresh(key)
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                logger.warning(f"Rebuilding properties context snapshot for customer {key[0]} failed, serving the previous one: {e}")
+        snapshot.last_access = time.monotonic()
+        return snapshot.text
+
+    async def _refresh(self, key: SnapshotKey) -> ContextSnapshot:
+        """Rebuild the snapshot for key; concurrent callers share one rebuild"""
+        task = self._building.get(key)
+        if task is None:
+            task = asyncio.create_task(self._rebuild(key))
+            self._building[key] = task
+            task.add_done_callback(lambda _t, k=key: self._building.pop(k, None))
+        return await asyncio.shield(task)
+
+    async def _rebuild(self, key: SnapshotKey) -> ContextSnapshot:
+        started = time.perf_counter()
+        include_inactive = key[1]
+        previous = self._snapshots.get(key)
+        tools = self.tools
+
+        # A failed or short listing raises, leaving the previous snapshot in place
+        properties, total_count = await tools._list_properties(include_inactive, strict=True)
+        if not properties:
+            snapshot = ContextSnapshot(NO_PROPERTIES_TEXT)
+            self._snapshots[key] = snapshot
+            return snapshot
+
+        markers: Dict[str, str] = {}
+        hashes: Dict[str, str] = {}
+        fragments: Dict[str, str] = {}
+        to_fetch: List[str] = []
+        reused = 0
+
+        for summary in properties:
+            property_id = summary.get("id")
+            if not property_id or not summary.get("status", False):
+                continue
+            marker = _modified_marker(summary)
+            if marker is not None:
+                markers[property_id] = marker
+            if (
+                previous is not None and marker is not None
+                and previous.markers.get(property_id) == marker
+                and property_id in previous.fragments
+            ):
+                # Unchanged since the last build: no detail request at all
+                hashes[property_id] = previous.hashes.get(property_id, "")
+                fragments[property_id] = previous.fragments[property_id]
+                reused += 1
+            else:
+                to_fetch.append(property_id)
+
+        rendered = 0
+        unavailable = set()
+        details = await tools._fetch_property_details(to_fetch)
+        for property_id, detail in zip(to_fetch, details):
+            if detail is None:
+                # Keep the last good details (if any) and try again next refresh
+                markers.pop(property_id, None)
+                if previous is not None and property_id in previous.fragments:
+                    fragments[property_id] = previous.fragments[property_id]
+                    hashes[property_id] = previous.hashes.get(property_id, "")
+                else:
+                    unavailable.add(property_id)
+                continue
+
+            digest = _digest(detail)
+            hashes[property_id] = digest
+            if previous is not None and previous.hashes.get(property_id) == digest and property_id in previous.fragments:
+                fragments[property_id] = previous.fragments[property_id]
+                reused += 1
+            else:
+                fragments[property_id] = tools._render_detail_fragment(property_id, detail)
+                rendered += 1
+
+        text = tools._assemble_context(
+            properties, total_count, [fragments.get(p.get("id"), "") for p in properties]
+        ) + render_unavailable_note([p for p in properties if p.get("id") in unavailable])
+        snapshot = ContextSnapshot(text, markers, hashes, fragments)
+        if previous is not None:
+            snapshot.last_access = previous.last_access
+        self._snapshots[key] = snapshot
+        self.rendered += rendered
+        self.reused += reused
+        logger.info(
+            f"Properties context snapshot for customer {key[0]} rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms: "
+            f"{rendered} rendered, {reused} reused, {len(to_fetch)} details fetched"
+        )
+        return snapshot
+
+    def _ensure_refresher(self):
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        # Started from inside a tool call; don't inherit that call's deadline
+        clear_deadline()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            now = time.monotonic()
+            for key, snapshot in list(self._snapshots.items()):
+                if now - snapshot.last_access > self.idle_ttl:
+                    logger.info(f"Dropping idle properties context snapshot for customer {key[0]}")
+                    del self._snapshots[key]
+                    continue
+                try:
+                    with deadline_scope(REFRESH_DEADLINE), revalidate_scope():
+                        await self._refresh(key)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Refreshing properties context snapshot for customer {key[0]} failed: {e}")
+
+    async def start(self, prewarm: Optional[List[bool]] = None):
+        """Start the refresher and build snapshots for the given include_inactive values"""
+        self._ensure_refresher()
+        for include_inactive in prewarm or []:
+            try:
+                with deadline_scope(REFRESH_DEADLINE):
+                    await self._refresh(self._key(include_inactive))
+            except Exception as e:
+                logger.warning(f"Prewarming properties context snapshot failed: {e}")
+
+    async def close(self):
+        tasks = list(self._building.values())
+        if self._refresher is not None:
+            tasks.append(self._refresher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresher = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": len(self._snapshots),
+            "rendered": self.rendered,
+            "reused": self.reused
+        }
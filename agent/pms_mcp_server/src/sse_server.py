@@ -13,6 +13,8 @@ import os
 
 from .api_client import PMSAPIClient
 from .tools import PMSTools
+from .metrics import metrics
+from .rpc import rpc_error, dispatch_rpc_body
 
 # Load environment variables
 load_dotenv()
@@ -30,6 +32,13 @@ async def health_check(request: web.Request) -> web.Response:
     return web.json_response({"status": "healthy", "service": "pms-mcp-sse-server"})
 
 
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    """PMS API request metrics in the Prometheus text format (?format=json for a summary)"""
+    if request.query.get("format") == "json":
+        return web.json_response(metrics.snapshot())
+    return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+
 async def handle_sse(request: web.Request) -> web.Response:
     """Handle SSE connection for MCP protocol
     
@@ -128,8 +137,12 @@ async def handle_messages(request: web.Request) -> web.Response:
                 tool_name = params.get("name")
                 arguments = params.get("arguments", {})
                 
+                # Optional caller deadline in params._meta.deadlineMs
+                deadline_ms = (params.get("_meta") or {}).get("deadlineMs")
+                deadline = deadline_ms / 1000.0 if deadline_ms else None
+                
                 try:
-                    tool_result = await pms_tools.execute_tool(tool_name, arguments)
+                    tool_result = await pms_tools.execute_tool(tool_name, arguments, deadline=deadline)
                     # Convert TextContent objects to dictionaries
                     if isinstance(tool_result, list):
                         content = [{"type": item.type, "text": item.text} for item in tool_result]
@@ -163,6 +176,20 @@ async def handle_messages(request: web.Request) -> web.Response:
         return web.json_response({"error": str(e)}, status=500)
 
 
+async def handle_rpc(request: web.Request) -> web.Response:
+    """Plain JSON-RPC over POST (a request or a batch) for clients that don't hold an SSE session
+    
+    Used by the agent's PMSMCPClient; same-container only, like the SSE endpoints.
+    """
+    try:
+        data = await request.json()
+    except json.JSONDecodeError:
+        return web.json_response(rpc_error(-32700, "Parse error", None), status=400)
+    
+    response, status = await dispatch_rpc_body(pms_tools, data)
+    return web.json_response(response, status=status)
+
+
 async def init_app() -> web.Application:
     """Initialize the web application"""
     global api_client, pms_tools
@@ -183,8 +210,10 @@ async def init_app() -> web.Application:
     
     # Add routes
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics_endpoint)
     app.router.add_get("/sse", handle_sse)
     app.router.add_post("/messages/", handle_messages)
+    app.router.add_post("/rpc", handle_rpc)
     
     # Add CORS middleware
     async def cors_middleware(app, handler):
@@ -198,8 +227,19 @@ async def init_app() -> web.Application:
     
     app.middlewares.append(cors_middleware)
     
+    # Build the default customer's properties context snapshot in the background
+    async def start_snapshots(app):
+        app["snapshot_prewarm"] = asyncio.create_task(pms_tools.start())
+    
+    app.on_startup.append(start_snapshots)
+    
     # Cleanup on shutdown
     async def cleanup(app):
+        prewarm = app.get("snapshot_prewarm")
+        if prewarm and not prewarm.done():
+            prewarm.cancel()
+        if pms_tools:
+            await pms_tools.close()
         if api_client:
             await api_client.close()
     
@@ -211,15 +251,21 @@ async def init_app() -> web.Application:
 def main():
     """Main entry point"""
     port = int(os.getenv("PORT", "3001"))
+    unix_socket = os.getenv("PMS_MCP_UNIX_SOCKET") or None
     
     logging.basicConfig(level=logging.INFO)
     logger.info(f"Starting PMS MCP SSE Server on port {port}")
     logger.info(f"SSE endpoint: http://localhost:{port}/sse")
     logger.info(f"Messages endpoint: http://localhost:{port}/messages/")
+    logger.info(f"RPC endpoint: http://localhost:{port}/rpc")
+    
+    if unix_socket:
+        logger.info(f"Also listening on Unix socket: {unix_socket}")
     
     app = init_app()
-    # Only listen on localhost for security (same container access only)
-    web.run_app(app, host="127.0.0.1", port=port)
+    # Only listen on localhost for security (same container access only).
+    # The optional Unix socket serves local clients that can connect over UDS.
+    web.run_app(app, host="127.0.0.1", port=port, path=unix_socket)
 
 
 if __name__ == "__main__":
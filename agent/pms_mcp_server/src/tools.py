@@ -1,22 +1,82 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from mcp.types import Tool, TextContent
 from .api_client import PMSAPIClient
+from .retry import deadline_scope, DEFAULT_TOOL_DEADLINE
+from .property_renderer import (
+    render_property_detail, render_property_index, render_sections, render_omitted_note, render_unavailable_note,
+    fit_to_budget, estimate_tokens, NO_PROPERTIES_TEXT, SECTIONS, SECTION_PRIORITY, DESCRIPTION_MAX_CHARS
+)
+from .snapshots import ContextSnapshotStore, SNAPSHOTS_ENABLED
+from .occupancy import (
+    OccupancyIndex, OccupancyStore, fetch_reservations, OCCUPANCY_ENABLED, OCCUPANCY_PREWARM,
+    ALTERNATIVE_HORIZON_DAYS
+)
+import asyncio
 import json
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Property detail requests in flight at once while building the properties context
+DETAIL_CONCURRENCY = int(os.getenv("PMS_PROPERTY_DETAIL_CONCURRENCY", "8"))
+
+# Sections get_property_details returns when none are requested
+DEFAULT_DETAIL_SECTIONS = ["overview", "location", "pricing"]
+
+# Default token budget for full contexts and property details (0 = unlimited)
+CONTEXT_MAX_TOKENS = int(os.getenv("PMS_CONTEXT_MAX_TOKENS", "0"))
+
+# Properties listed by search_available_properties unless the call asks for more
+SEARCH_MAX_RESULTS = int(os.getenv("PMS_SEARCH_MAX_RESULTS", "5"))
+
+# Alternative dates suggested when a checked stay is unavailable (0 = none)
+SUGGESTED_ALTERNATIVES = int(os.getenv("PMS_SUGGESTED_ALTERNATIVES", "3"))
+
 
 class PMSTools:
-    def __init__(self, api_client: PMSAPIClient):
+    def __init__(
+        self,
+        api_client: PMSAPIClient,
+        detail_concurrency: int = DETAIL_CONCURRENCY,
+        snapshots: Optional[bool] = None,
+        occupancy: Optional[bool] = None
+    ):
         self.api_client = api_client
+        self.detail_concurrency = max(detail_concurrency, 1)
+        # Precomputed properties context per customer, refreshed in the background
+        use_snapshots = SNAPSHOTS_ENABLED if snapshots is None else snapshots
+        self.snapshots: Optional[ContextSnapshotStore] = ContextSnapshotStore(self) if use_snapshots else None
+        # Booked nights per property for availability checks
+        use_occupancy = OCCUPANCY_ENABLED if occupancy is None else occupancy
+        self.occupancy: Optional[OccupancyStore] = OccupancyStore(api_client) if use_occupancy else None
+    
+    async def start(self):
+        """Build the default customer's context snapshot and occupancy indexes and start refreshing them"""
+        if self.snapshots is not None:
+            await self.snapshots.start(prewarm=[False])
+        if self.occupancy is not None and OCCUPANCY_PREWARM:
+            properties, _ = await self._list_properties(False)
+            await self.occupancy.prewarm(
+                [p["id"] for p in properties if p.get("id") and p.get("status", False)],
+                concurrency=self.detail_concurrency
+            )
+    
+    async def close(self):
+        if self.snapshots is not None:
+            await self.snapshots.close()
+        if self.occupancy is not None:
+            await self.occupancy.close()
     
     def get_available_tools(self) -> List[Tool]:
         """Return list of available tools"""
         return [
             Tool(
                 name="get_customer_properties_context",
-                description="Fetch all properties for the customer and their detailed information to provide context to the LLM",
+                description=(
+                    "List the customer's properties, one line each (name, ID, type, city, capacity). "
+                    "Use get_property_details for anything more about a property"
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -24,10 +84,54 @@ class PMSTools:
                             "type": "boolean",
                             "description": "Include inactive properties (default: false)",
                             "default": False
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["index", "full"],
+                            "description": "index (default): one line per property; full: every property with all of its details",
+                            "default": "index"
+                        },
+                        "max_tokens": {
+                            "type": "integer",
+                            "description": "Approximate size limit for the full format; the most important sections are kept",
+                            "minimum": 1
+                        },
+                        "language": {
+                            "type": "string",
+                            "description": "Only keep descriptions in this language code, e.g. en"
                         }
                     }
                 }
             ),
+            Tool(
+                name="get_property_details",
+                description="Fetch selected sections of one property's details, e.g. amenities or access instructions",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "property_id": {
+                            "type": "string",
+                            "description": "The property ID from get_customer_properties_context"
+                        },
+                        "sections": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": list(SECTIONS)},
+                            "description": f"Sections to return (default: {', '.join(DEFAULT_DETAIL_SECTIONS)})",
+                            "default": DEFAULT_DETAIL_SECTIONS
+                        },
+                        "max_tokens": {
+                            "type": "integer",
+                            "description": "Approximate size limit; sections are kept in the order requested",
+                            "minimum": 1
+                        },
+                        "language": {
+                            "type": "string",
+                            "description": "Only keep descriptions in this language code, e.g. en"
+                        }
+                    },
+                    "required": ["property_id"]
+                }
+            ),
             Tool(
                 name="check_property_availability_and_pricing",
                 description="Check property availability and calculate pricing for specific dates and guest count",
@@ -55,577 +159,420 @@ class PMSTools:
                             "type": "boolean",
                             "description": "Whether pets will be included (default: false)",
                             "default": False
+                        },
+                        "suggest_alternatives": {
+                            "type": "integer",
+                            "description": "When the dates are taken, how many of the nearest free stays of the same length to suggest (0 for none)",
+                            "minimum": 0,
+                            "default": SUGGESTED_ALTERNATIVES
                         }
                     },
                     "required": ["property_id", "check_in_date", "check_out_date", "guest_count"]
                 }
+            ),
+            Tool(
+                name="search_available_properties",
+                description="Find every active property free for the given dates and guest count, cheapest first, with total prices",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "check_in_date": {
+                            "type": "string",
+                            "description": "Check-in date in YYYY-MM-DD format"
+                        },
+                        "check_out_date": {
+                            "type": "string",
+                            "description": "Check-out date in YYYY-MM-DD format"
+                        },
+                        "guest_count": {
+                            "type": "integer",
+                            "description": "Number of guests",
+                            "minimum": 1
+                        },
+                        "include_pets": {
+                            "type": "boolean",
+                            "description": "Whether pets will be included (default: false)",
+                            "default": False
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": f"Maximum number of properties to list (default: {SEARCH_MAX_RESULTS})",
+                            "minimum": 1
+                        }
+                    },
+                    "required": ["check_in_date", "check_out_date", "guest_count"]
+                }
             )
         ]
     
-    async def execute_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Execute a tool by name"""
+    async def execute_tool(self, name: str, arguments: Dict[str, Any], deadline: Optional[float] = None) -> List[TextContent]:
+        """Execute a tool by name
         
-        if name == "get_customer_properties_context":
-            return await self._get_customer_properties_context(arguments)
-        elif name == "check_property_availability_and_pricing":
-            return await self._check_property_availability_and_pricing(arguments)
+        All PMS requests made by the tool are bounded by ``deadline`` seconds
+        (PMS_TOOL_DEADLINE by default) so a slow API cannot stall a voice turn.
+        """
+        
+        with deadline_scope(deadline if deadline is not None else DEFAULT_TOOL_DEADLINE):
+            if name == "get_customer_properties_context":
+                return await self._get_customer_properties_context(arguments)
+            elif name == "get_property_details":
+                return await self._get_property_details(arguments)
+            elif name == "check_property_availability_and_pricing":
+                return await self._check_property_availability_and_pricing(arguments)
+            elif name == "search_available_properties":
+                return await self._search_available_properties(arguments)
         
         raise ValueError(f"Unknown tool: {name}")
     
+    async def _fetch_property_details(self, property_ids: List[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        GET /api/Property/Get for each id, at most detail_concurrency at a time.
+        
+        Returns one entry per id in the same order; None ids and failed
+        fetches yield None. Failed fetches are counted in the metrics as
+        missing "property_details".
+        """
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        
+        async def fetch(property_id: Optional[str]) -> Optional[Dict[str, Any]]:
+            if not property_id:
+                return None
+            async with semaphore:
+                try:
+                    return await self.api_client.get("/api/Property/Get", params={
+                        "Id": property_id
+                    })
+                except Exception as e:
+                    logger.warning(f"Could not fetch details for property {property_id}: {e}")
+                    if self.api_client.metrics:
+                        self.api_client.metrics.record_missing("property_details")
+                    return None
+        
+        return await asyncio.gather(*(fetch(property_id) for property_id in property_ids))
+    
+    async def _list_properties(self, include_inactive: bool, strict: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        All property summaries for the customer, plus the total count the API reports.
+        
+        By default a failed page ends the listing with what was read so far.
+        With strict, a failed page is raised and a listing shorter than the
+        reported total raises RuntimeError, so callers never mistake a partial
+        listing for the full one.
+        """
+        # Stream pages with read-ahead
+        # The customerId is already in the headers, so the API should filter automatically
+        all_properties = []
+        pages = self.api_client.iter_all_properties(include_inactive=include_inactive)
+        
+        try:
+            async for page_items in pages:
+                all_properties.extend(page_items)
+                logger.info(f"Retrieved {len(page_items)} properties, total so far: {len(all_properties)}")
+        except Exception as e:
+            logger.error(f"Error fetching properties page: {e}")
+            if strict:
+                raise
+            # Continue with what we have so far
+        
+        total_count = pages.total_count or 0
+        logger.info(f"Successfully fetched {len(all_properties)} out of {total_count} total properties")
+        if strict and len(all_properties) < total_count:
+            raise RuntimeError(f"Property listing incomplete: {len(all_properties)} of {total_count} properties")
+        return all_properties, total_count
+    
+    @staticmethod
+    def _render_detail_fragment(property_id: Optional[str], property_detail: Optional[Dict[str, Any]]) -> str:
+        """Rendered detail text for one property ("" without details)"""
+        parts: List[str] = []
+        if property_detail:
+            try:
+                render_property_detail(property_detail, parts)
+            except Exception as e:
+                logger.warning(f"Could not render details for property {property_id}: {e}")
+        return "".join(parts)
+    
+    def _assemble_context(self, properties: List[Dict[str, Any]], total_count: int, fragments: List[str]) -> str:
+        """Join per-property detail fragments (one per property, in order) into the full context text"""
+        context_parts = [
+            f"Customer Property Context\n",
+            f"You have {total_count} properties in total.\n",
+            f"{len([p for p in properties if p.get('status', False)])} properties are active.\n",
+            f"{len([p for p in properties if not p.get('status', False)])} properties are inactive.\n\n"
+        ]
+        
+        for idx, (property_summary, fragment) in enumerate(zip(properties, fragments), 1):
+            property_id = property_summary.get("id")
+            property_name = property_summary.get("name", "Unknown")
+            property_status = "Active" if property_summary.get("status", False) else "Inactive"
+            
+            context_parts.append(f"\nProperty number {idx} is called {property_name}.\n")
+            context_parts.append(f"This property is currently {property_status.lower()}.\n")
+            context_parts.append(f"Property ID is {property_id}.\n")
+            
+            # Add internal name if different from display name
+            internal_name = property_summary.get("internalName")
+            if internal_name and internal_name != property_name:
+                context_parts.append(f"It is also known internally as {internal_name}.\n")
+            
+            context_parts.append(fragment)
+            context_parts.append("\n")
+        
+        # Summary statistics
+        context_parts.append("\n" + "=" * 50 + "\n")
+        context_parts.append("SUMMARY & STATISTICS\n")
+        context_parts.append("=" * 50 + "\n")
+        
+        context_parts.append(f"Total Properties: {total_count}\n")
+        
+        active_count = len([p for p in properties if p.get('status', False)])
+        inactive_count = total_count - active_count
+        context_parts.append(f"Status Breakdown:\n")
+        context_parts.append(f"  - Active: {active_count} properties\n")
+        context_parts.append(f"  - Inactive: {inactive_count} properties\n")
+        
+        # Property types summary
+        property_types = {}
+        for prop in properties:
+            prop_type = prop.get('typeCode', 'Unknown')
+            property_types[prop_type] = property_types.get(prop_type, 0) + 1
+        
+        if property_types:
+            context_parts.append(f"\nProperty Types:\n")
+            for ptype, count in property_types.items():
+                context_parts.append(f"  - {ptype}: {count}\n")
+        
+        # Location summary
+        cities = {}
+        for prop in properties:
+            city = prop.get('city', 'Unknown')
+            if city:
+                cities[city] = cities.get(city, 0) + 1
+        
+        if cities:
+            context_parts.append(f"\nLocations:\n")
+            for city, count in cities.items():
+                context_parts.append(f"  - {city}: {count} properties\n")
+        
+        # Capacity summary
+        total_max_occupancy = sum(p.get('maxOccupancy', 0) for p in properties if p.get('maxOccupancy'))
+        total_bedrooms = sum(p.get('bedrooms', 0) for p in properties if p.get('bedrooms'))
+        
+        if total_max_occupancy > 0:
+            context_parts.append(f"\nTotal Capacity:\n")
+            context_parts.append(f"  - Combined Max Occupancy: {total_max_occupancy} guests\n")
+            context_parts.append(f"  - Total Bedrooms: {total_bedrooms}\n")
+        
+        # Integration summary
+        integrations_count = {}
+        for prop in properties:
+            for integration in prop.get('integrations', []):
+                source = integration.get('source', 'unknown')
+                integrations_count[source] = integrations_count.get(source, 0) + 1
+        
+        if integrations_count:
+            context_parts.append(f"\nOTA Integrations:\n")
+            for source, count in integrations_count.items():
+                context_parts.append(f"  - {source.title()}: {count} properties\n")
+        
+        # Knowledge base summary
+        kb_complete = len([p for p in properties if p.get('knowledgePercentage', 0) >= 80])
+        kb_partial = len([p for p in properties if 0 < p.get('knowledgePercentage', 0) < 80])
+        kb_empty = len([p for p in properties if p.get('knowledgePercentage', 0) == 0])
+        
+        context_parts.append(f"\nKnowledge Base Completion:\n")
+        context_parts.append(f"  - Complete (80%+): {kb_complete} properties\n")
+        context_parts.append(f"  - Partial (1-79%): {kb_partial} properties\n")
+        context_parts.append(f"  - Empty (0%): {kb_empty} properties\n")
+        
+        return "".join(context_parts)
+    
+    async def build_properties_context(
+        self,
+        include_inactive: bool = False,
+        max_tokens: int = 0,
+        language: Optional[str] = None
+    ) -> str:
+        """
+        Fetch every property (and active properties' details) and render the context text.
+        
+        With max_tokens, details are added section by section in
+        SECTION_PRIORITY order while they fit, descriptions are shortened and
+        the text ends with a note on what was left out. With language, only
+        descriptions in that language are kept.
+        """
+        properties, total_count = await self._list_properties(include_inactive)
+        if not properties:
+            return NO_PROPERTIES_TEXT
+        
+        # Details are fetched concurrently and rendered in the original order;
+        # a failed fetch drops that property's details and is named at the end
+        detail_ids = [p.get("id") if p.get("status", False) else None for p in properties]
+        details = await self._fetch_property_details(detail_ids)
+        unavailable_note = render_unavailable_note([
+            p for p, property_id, detail in zip(properties, detail_ids, details) if property_id and detail is None
+        ])
+        if not max_tokens and not language:
+            fragments = [
+                self._render_detail_fragment(p.get("id"), detail) for p, detail in zip(properties, details)
+            ]
+            return self._assemble_context(properties, total_count, fragments) + unavailable_note
+        
+        description_max_chars = DESCRIPTION_MAX_CHARS if max_tokens else None
+        candidates = [
+            render_sections(detail, SECTION_PRIORITY, language, description_max_chars) if detail else []
+            for detail in details
+        ]
+        omitted: Dict[str, int] = {}
+        if max_tokens:
+            # Headers, summary and the longest possible note come out of the budget first
+            fixed = estimate_tokens(self._assemble_context(properties, total_count, [""] * len(properties)))
+            fixed += estimate_tokens(render_omitted_note({s: len(properties) for s in SECTIONS}, per_property=True))
+            fixed += estimate_tokens(unavailable_note)
+            candidates, omitted = fit_to_budget(candidates, max_tokens - fixed)
+        
+        fragments = ["".join(text for _, text in rendered) for rendered in candidates]
+        return (
+            self._assemble_context(properties, total_count, fragments)
+            + unavailable_note
+            + render_omitted_note(omitted, per_property=True)
+        )
+    
     async def _get_customer_properties_context(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """
-        Fetch all properties for the customer and provide detailed context
+        List the customer's properties as a compact index, or with full details
         """
         try:
             include_inactive = arguments.get("include_inactive", False)
+            max_tokens = arguments.get("max_tokens") or CONTEXT_MAX_TOKENS
+            language = arguments.get("language")
+            
+            if arguments.get("format", "index") != "full":
+                properties, total_count = await self._list_properties(include_inactive)
+                context_text = render_property_index(properties, total_count)
+            elif max_tokens or language:
+                # Budgeted contexts are rendered per call from the (cached) property details
+                context_text = await self.build_properties_context(include_inactive, max_tokens, language)
+            elif self.snapshots is not None:
+                # Served from the customer's precomputed snapshot, kept fresh in the background
+                context_text = await self.snapshots.get_context(include_inactive)
+            else:
+                context_text = await self.build_properties_context(include_inactive)
             
-            # Step 1: Get all properties for the customer using pagination to avoid timeouts
-            # The customerId is already in the headers, so the API should filter automatically
-            all_properties = []
-            page_index = 1  # PMS API uses 1-based page indexing
-            page_size = 100  # Smaller page size to prevent timeouts
-            total_count = 0
+            return [TextContent(
+                type="text",
+                text=context_text
+            )]
             
-            while True:
-                try:
-                    logger.info(f"Fetching properties page {page_index} (size: {page_size})")
-                    properties_response = await self.api_client.get("/api/Property/GetAll", params={
-                        "PageIndex": page_index,
-                        "PageSize": page_size,
-                        "Status": None if include_inactive else True  # True = active only, None = all
-                    })
-                    
-                    if not properties_response or "items" not in properties_response:
-                        break
-                    
-                    page_items = properties_response.get("items", [])
-                    total_count = properties_response.get("totalCount", 0)
-                    
-                    if not page_items:
-                        break
-                    
-                    all_properties.extend(page_items)
-                    logger.info(f"Retrieved {len(page_items)} properties, total so far: {len(all_properties)}")
-                    
-                    # Check if we've fetched all properties
-                    if len(all_properties) >= total_count or len(page_items) < page_size:
-                        break
-                    
-                    page_index += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching properties page {page_index}: {e}")
-                    # Continue with what we have so far
-                    break
+        except Exception as e:
+            logger.error(f"Error in get_customer_properties_context: {e}")
+            return [TextContent(
+                type="text",
+                text=f"Error fetching property context: {str(e)}"
+            )]
+    
+    async def _get_property_details(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """
+        Render only the requested sections of one property's details
+        """
+        try:
+            property_id = arguments.get("property_id")
+            sections = arguments.get("sections") or DEFAULT_DETAIL_SECTIONS
+            if isinstance(sections, str):
+                sections = [sections]
+            sections = list(dict.fromkeys(sections))
             
-            if not all_properties:
+            unknown = [s for s in sections if s not in SECTIONS]
+            if unknown:
                 return [TextContent(
                     type="text",
-                    text="No properties found for this customer."
+                    text=f"Error: Unknown sections {', '.join(map(str, unknown))}. Available sections: {', '.join(SECTIONS)}."
                 )]
             
-            properties = all_properties
-            logger.info(f"Successfully fetched {len(properties)} out of {total_count} total properties")
+            property_detail = await self.api_client.get("/api/Property/Get", params={
+                "Id": property_id
+            })
             
-            # Step 2: Build context information
-            context_parts = [
-                f"Customer Property Context\n",
-                f"You have {total_count} properties in total.\n",
-                f"{len([p for p in properties if p.get('status', False)])} properties are active.\n",
-                f"{len([p for p in properties if not p.get('status', False)])} properties are inactive.\n\n"
-            ]
+            if not property_detail:
+                return [TextContent(
+                    type="text",
+                    text=f"Property {property_id} not found."
+                )]
             
-            # Step 3: Get detailed information for each property
-            for idx, property_summary in enumerate(properties, 1):
-                property_id = property_summary.get("id")
-                property_name = property_summary.get("name", "Unknown")
-                property_status = "Active" if property_summary.get("status", False) else "Inactive"
-                
-                context_parts.append(f"\nProperty number {idx} is called {property_name}.\n")
-                context_parts.append(f"This property is currently {property_status.lower()}.\n")
-                context_parts.append(f"Property ID is {property_id}.\n")
-                
-                # Add internal name if different from display name
-                internal_name = property_summary.get("internalName")
-                if internal_name and internal_name != property_name:
-                    context_parts.append(f"It is also known internally as {internal_name}.\n")
-                
-                # Try to get more details for active properties
-                if property_id and property_status == "Active":
-                    try:
-                        # Get full property details
-                        property_detail = await self.api_client.get("/api/Property/Get", params={
-                            "Id": property_id
-                        })
-                        
-                        # Extract key information
-                        if property_detail:
-                            # Basic Location info
-                            street = property_detail.get("street", "")
-                            city = property_detail.get("city", "")
-                            state = property_detail.get("state", "")
-                            country = property_detail.get("countryCode", "")
-                            address = property_detail.get("address", "")
-                            zip_code = property_detail.get("zipCode", "")
-                            region = property_detail.get("region", "")
-                            apt = property_detail.get("apt", "")
-                            
-                            if any([street, city, state, address]):
-                                location_parts = []
-                                if apt:
-                                    location_parts.append(f"Apt {apt}")
-                                location_parts.extend(filter(None, [address, street, city, state, zip_code, country]))
-                                if region:
-                                    location_parts.append(f"Region: {region}")
-                                full_address = ', '.join(location_parts)
-                                context_parts.append(f"The property is located at {full_address}.\n")
-                            
-                            # Capacity and Accommodation info
-                            max_occupancy = property_detail.get("maxOccupancy")
-                            max_adults = property_detail.get("maxAdults")
-                            bedrooms = property_detail.get("bedrooms")
-                            bathrooms = property_detail.get("bathrooms")
-                            beds = property_detail.get("beds")
-                            
-                            if max_occupancy:
-                                context_parts.append(f"The property can accommodate up to {max_occupancy} guests.\n")
-                            if max_adults:
-                                context_parts.append(f"Maximum {max_adults} adults allowed.\n")
-                            if bedrooms:
-                                context_parts.append(f"The property has {int(bedrooms)} bedrooms.\n")
-                            if bathrooms:
-                                context_parts.append(f"There are {bathrooms} bathrooms.\n")
-                            if beds:
-                                context_parts.append(f"The property has {int(beds)} beds.\n")
-                            
-                            # Property type and details
-                            property_type = property_detail.get("typeCode")
-                            if property_type:
-                                context_parts.append(f"This is a {property_type}.\n")
-                            
-                            # Additional property details
-                            classification = property_detail.get("classification")
-                            if classification:
-                                context_parts.append(f"Classification: {classification}\n")
-                            
-                            area_sqft = property_detail.get("areaSquareFeet")
-                            if area_sqft:
-                                context_parts.append(f"Area: {area_sqft} sq ft\n")
-                            
-                            min_occupancy = property_detail.get("minOccupancy")
-                            if min_occupancy:
-                                context_parts.append(f"Min Occupancy: {min_occupancy} guests\n")
-                            
-                            max_pets = property_detail.get("maxPets")
-                            if max_pets is not None:
-                                context_parts.append(f"Max Pets: {max_pets}\n")
-                            
-                            num_units = property_detail.get("numberOfUnits")
-                            if num_units:
-                                context_parts.append(f"Number of Units: {num_units}\n")
-                            
-                            # Check-in/Check-out times
-                            check_in_from = property_detail.get("checkInFrom")
-                            check_in_until = property_detail.get("checkInUntil")
-                            check_out_from = property_detail.get("checkOutFrom")
-                            check_out_until = property_detail.get("checkOutUntil")
-                            
-                            if check_in_from or check_in_until:
-                                check_in_time = f"{check_in_from}" + (f"-{check_in_until}" if check_in_until != check_in_from else "")
-                                context_parts.append(f"Check in time is {check_in_time}.\n")
-                            if check_out_from or check_out_until:
-                                check_out_time = f"{check_out_from}" + (f"-{check_out_until}" if check_out_until != check_out_from else "")
-                                context_parts.append(f"Check out time is {check_out_time}.\n")
-                            
-                            # WiFi and Access Codes
-                            wifi_network = property_detail.get("wifiNetwork")
-                            wifi_password = property_detail.get("wifiPassword")
-                            door_code = property_detail.get("doorCode")
-                            lock_code = property_detail.get("lockCode")
-                            
-                            if wifi_network:
-                                context_parts.append(f"The WiFi network name is {wifi_network}.\n")
-                            if wifi_password:
-                                context_parts.append(f"The WiFi password is {wifi_password}.\n")
-                            if door_code:
-                                context_parts.append(f"The door access code is {door_code}.\n")
-                            if lock_code:
-                                context_parts.append(f"The lock code is {lock_code}.\n")
-                            
-                            # Property Manager
-                            property_manager = property_detail.get("propertyManager")
-                            if property_manager:
-                                context_parts.append(f"The property is managed by {property_manager}.\n")
-                            
-                            # Pricing Settings
-                            pricing_settings = property_detail.get("pricingSettings")
-                            if pricing_settings:
-                                currency = pricing_settings.get("currency", "EUR")
-                                base_price = pricing_settings.get("basePrice")
-                                weekend_base_price = pricing_settings.get("weekendBasePrice")
-                                cleaning_fee = pricing_settings.get("cleaningFee")
-                                security_deposit = pricing_settings.get("securityDepositFee")
-                                pet_fee = pricing_settings.get("petFee")
-                                extra_person_fee = pricing_settings.get("extraPersonFee")
-                                monthly_factor = pricing_settings.get("monthlyPriceFactor")
-                                weekly_factor = pricing_settings.get("weeklyPriceFactor")
-                                guests_included = pricing_settings.get("guestsIncludedInRegularFee")
-                                weekend_days = pricing_settings.get("weekendDays")
-                                
-                                context_parts.append(f"\nHere is the pricing information.\n")
-                                if base_price is not None:
-                                    context_parts.append(f"The base price is {base_price} {currency} per night.\n")
-                                if weekend_base_price and weekend_base_price > 0:
-                                    context_parts.append(f"The weekend price is {weekend_base_price} {currency} per night.\n")
-                                if weekend_days:
-                                    context_parts.append(f"Weekend Days: {weekend_days}\n")
-                                if cleaning_fee:
-                                    context_parts.append(f"Cleaning Fee: {currency} {cleaning_fee}\n")
-                                if security_deposit:
-                                    context_parts.append(f"Security Deposit: {currency} {security_deposit}\n")
-                                if pet_fee:
-                                    context_parts.append(f"Pet Fee: {currency} {pet_fee}\n")
-                                if extra_person_fee:
-                                    context_parts.append(f"Extra Person Fee: {currency} {extra_person_fee}\n")
-                                if guests_included is not None:
-                                    context_parts.append(f"Guests Included in Base Price: {guests_included}\n")
-                                if monthly_factor and monthly_factor != 1.0:
-                                    context_parts.append(f"Monthly Discount: {(1 - monthly_factor) * 100:.0f}%\n")
-                                if weekly_factor and weekly_factor != 1.0:
-                                    context_parts.append(f"Weekly Discount: {(1 - weekly_factor) * 100:.0f}%\n")
-                            
-                            # Additional Fees and Taxes
-                            fees = property_detail.get("fees", [])
-                            if fees:
-                                context_parts.append(f"\nAdditional Fees:\n")
-                                for fee in fees:
-                                    fee_name = fee.get("name", "Unknown Fee")
-                                    fee_amount = fee.get("amount", 0)
-                                    fee_type = fee.get("type", "")
-                                    context_parts.append(f"  - {fee_name}: {currency} {fee_amount} ({fee_type})\n")
-                            
-                            taxes = property_detail.get("taxes", [])
-                            if taxes:
-                                context_parts.append(f"\nTaxes:\n")
-                                for tax in taxes:
-                                    tax_name = tax.get("name", "Unknown Tax")
-                                    tax_rate = tax.get("rate", 0)
-                                    context_parts.append(f"  {tax_name} is {tax_rate} percent.\n")
-                            
-                            # Amenities with full details
-                            amenities = property_detail.get("amenities", [])
-                            if amenities:
-                                context_parts.append(f"\nThis property has {len(amenities)} amenities.\n")
-                                
-                                # Group amenities by category
-                                amenity_categories = {}
-                                for amenity in amenities:
-                                    if isinstance(amenity, dict) and not amenity.get("isDeleted", False):
-                                        type_code = amenity.get("typeCode", "OTHER")
-                                        attributes = amenity.get("attributes", "")
-                                        instruction = amenity.get("instruction", "")
-                                        is_present = amenity.get("isPresent")
-                                        
-                                        # Determine category based on type code
-                                        if "KITCHEN" in type_code or "REFRIGERATOR" in type_code or "OVEN" in type_code or "MICROWAVE" in type_code:
-                                            category = "Kitchen"
-                                        elif "BATHROOM" in type_code or "TUB" in type_code or "SHOWER" in type_code or "BIDET" in type_code:
-                                            category = "Bathroom"
-                                        elif "BEDROOM" in type_code or "BED" in type_code or "LINENS" in type_code:
-                                            category = "Bedroom"
-                                        elif "SAFETY" in type_code or "DETECTOR" in type_code or "EXTINGUISHER" in type_code or "FIRST_AID" in type_code:
-                                            category = "Safety"
-                                        elif "CHILD" in type_code or "BABY" in type_code or "INFANT" in type_code:
-                                            category = "Family"
-                                        elif "PARKING" in type_code or "GARAGE" in type_code:
-                                            category = "Parking"
-                                        elif "POOL" in type_code or "BEACH" in type_code or "WATERFRONT" in type_code:
-                                            category = "Water Features"
-                                        elif "INTERNET" in type_code or "WIFI" in type_code or "WIRELESS" in type_code:
-                                            category = "Internet"
-                                        elif "TV" in type_code or "CABLE" in type_code or "SOUND" in type_code or "VIDEO" in type_code:
-                                            category = "Entertainment"
-                                        elif "AIR_CONDITIONING" in type_code or "HEATING" in type_code or "FAN" in type_code:
-                                            category = "Climate Control"
-                                        elif "OUTDOOR" in type_code or "GARDEN" in type_code or "BALCONY" in type_code or "PATIO" in type_code:
-                                            category = "Outdoor"
-                                        else:
-                                            category = "Other"
-                                        
-                                        if category not in amenity_categories:
-                                            amenity_categories[category] = []
-                                        
-                                        amenity_info = attributes
-                                        if instruction:
-                                            amenity_info += f" (Note: {instruction})"
-                                        if is_present is False:
-                                            amenity_info += " [NOT PRESENT]"
-                                        
-                                        amenity_categories[category].append(amenity_info)
-                                
-                                # Display amenities by category
-                                for category in sorted(amenity_categories.keys()):
-                                    context_parts.append(f"  In the {category} category, there are {len(amenity_categories[category])} items.\n")
-                                    for amenity in amenity_categories[category]:  # Show ALL amenities
-                                        context_parts.append(f"    {amenity}\n")
-                            
-                            # License info
-                            license_code = property_detail.get("licenseCode")
-                            license_date = property_detail.get("licenseDate")
-                            if license_code:
-                                context_parts.append(f"License code is {license_code}")
-                                if license_date:
-                                    context_parts.append(f" issued on {license_date}")
-                                context_parts.append("\n")
-                            
-                            # Currency info
-                            base_currency = property_detail.get("baseCurrency")
-                            if base_currency:
-                                context_parts.append(f"The base currency is {base_currency}.\n")
-                            
-                            # Coordinates
-                            lat = property_detail.get("latitude")
-                            lon = property_detail.get("longitude")
-                            if lat and lon:
-                                context_parts.append(f"The property is located at latitude {lat} and longitude {lon}.\n")
-                            
-                            # Time Zone
-                            time_zone = property_detail.get("timeZone")
-                            if time_zone:
-                                context_parts.append(f"The property is in the {time_zone} time zone.\n")
-                            
-                            # Description (showing FULL descriptions for voice agent context)
-                            descriptions = property_detail.get("descriptions", [])
-                            if descriptions:
-                                context_parts.append(f"\nThe property has {len(descriptions)} descriptions.\n")
-                                for desc_idx, desc in enumerate(descriptions, 1):
-                                    if isinstance(desc, dict) and desc.get("text"):
-                                        description_text = desc["text"]
-                                        desc_type = desc.get("typeCode", "Unknown")
-                                        desc_lang = desc.get("language", "Default")
-                                        context_parts.append(f"  Description {desc_idx} (Type: {desc_type}, Language: {desc_lang}):\n")
-                                        context_parts.append(f"  {description_text}\n\n")
-                            
-                            # Images count only (details removed per user request)
-                            images = property_detail.get("images", [])
-                            if images:
-                                context_parts.append(f"\nTotal Images Available: {len(images)}\n")
-                            
-                            # Integrations (OTA connections)
-                            integrations = property_detail.get("integrations", [])
-                            if integrations:
-                                context_parts.append(f"\nOTA Integrations:\n")
-                                for integration in integrations:
-                                    source = integration.get("source", "Unknown")
-                                    ota_id = integration.get("otaId", "")
-                                    ota_url = integration.get("otaUrl", "")
-                                    if ota_id:
-                                        context_parts.append(f"  - {source.title()}: ID {ota_id}\n")
-                                    if ota_url:
-                                        context_parts.append(f"    URL: {ota_url}\n")
-                            
-                            # Knowledge Base Status
-                            knowledge_percentage = property_detail.get("knowledgePercentage")
-                            knowledge_conflict = property_detail.get("knowledgeConflict")
-                            knowledge_last_sync = property_detail.get("knowledgeLastSync")
-                            conversation_rag = property_detail.get("conversationRagStatus")
-                            document_rag = property_detail.get("documentRagStatus")
-                            kb_rag_status = property_detail.get("knowledgeBaseRagStatus")
-                            
-                            if any([knowledge_percentage is not None, knowledge_conflict is not None, knowledge_last_sync]):
-                                context_parts.append(f"\nKnowledge Base Status:\n")
-                                if knowledge_percentage is not None:
-                                    context_parts.append(f"  Completion: {knowledge_percentage}%\n")
-                                if knowledge_conflict is not None:
-                                    context_parts.append(f"  Conflicts: {knowledge_conflict}\n")
-                                if knowledge_last_sync:
-                                    context_parts.append(f"  Last Sync: {knowledge_last_sync}\n")
-                                if conversation_rag is not None:
-                                    context_parts.append(f"  Conversation RAG Status: {conversation_rag}\n")
-                                if document_rag is not None:
-                                    context_parts.append(f"  Document RAG Status: {document_rag}\n")
-                                if kb_rag_status is not None:
-                                    context_parts.append(f"  KB RAG Status: {'Active' if kb_rag_status else 'Inactive'}\n")
-                            
-                            # Channel and Listing Information
-                            channel_code = property_detail.get("channelCode")
-                            listing_id = property_detail.get("listingId")
-                            customer_channel_id = property_detail.get("customerChannelId")
-                            is_channel = property_detail.get("isChannel")
-                            
-                            if any([channel_code, listing_id, customer_channel_id, is_channel is not None]):
-                                context_parts.append(f"\nChannel Information:\n")
-                                if channel_code:
-                                    context_parts.append(f"  Channel Code: {channel_code}\n")
-                                if listing_id:
-                                    context_parts.append(f"  Listing ID: {listing_id}\n")
-                                if customer_channel_id:
-                                    context_parts.append(f"  Customer Channel ID: {customer_channel_id}\n")
-                                if is_channel is not None:
-                                    context_parts.append(f"  Is Channel: {'Yes' if is_channel else 'No'}\n")
-                            
-                            # Booking Settings
-                            booking_settings = property_detail.get("bookingSettings")
-                            if booking_settings:
-                                context_parts.append(f"\nBooking Settings:\n")
-                                for key, value in booking_settings.items():
-                                    if value is not None:
-                                        context_parts.append(f"  {key}: {value}\n")
-                            
-                            # Nearest Places
-                            nearest_places = property_detail.get("nearestPlaces")
-                            if nearest_places:
-                                context_parts.append(f"\nNearby Attractions:\n")
-                                for place in nearest_places:
-                                    place_name = place.get("name", "Unknown")
-                                    distance = place.get("distance", "")
-                                    context_parts.append(f"  - {place_name}: {distance}\n")
-                            
-                            # Custom Fields
-                            custom_fields = property_detail.get("customFields", [])
-                            if custom_fields:
-                                context_parts.append(f"\nCustom Fields:\n")
-                                for field in custom_fields:
-                                    field_name = field.get("name", "Unknown Field")
-                                    field_value = field.get("value", "")
-                                    context_parts.append(f"  {field_name}: {field_value}\n")
-                            
-                            # Tags
-                            tags = property_detail.get("tags", [])
-                            if tags:
-                                tag_names = [tag.get("name", "") for tag in tags if tag.get("name")]
-                                if tag_names:
-                                    context_parts.append(f"\nTags: {', '.join(tag_names)}\n")
-                            
-                            # Files
-                            files = property_detail.get("files", [])
-                            if files:
-                                context_parts.append(f"\nAdditional Files ({len(files)} total):\n")
-                                for file in files:
-                                    file_name = file.get("name", "Unknown")
-                                    file_type = file.get("type", "")
-                                    file_url = file.get("url", "")
-                                    file_size = file.get("size", "")
-                                    context_parts.append(f"  - {file_name}")
-                                    if file_type:
-                                        context_parts.append(f" (Type: {file_type})")
-                                    if file_size:
-                                        context_parts.append(f" [Size: {file_size}]")
-                                    context_parts.append("\n")
-                                    if file_url:
-                                        context_parts.append(f"    URL: {file_url}\n")
-                            
-                            # Sub-rooms
-                            sub_rooms = property_detail.get("subRooms", [])
-                            if sub_rooms:
-                                context_parts.append(f"\nSub-rooms/Units ({len(sub_rooms)} total):\n")
-                                for room in sub_rooms:  # Show ALL sub-rooms
-                                    room_name = room.get("name", "Unnamed Room")
-                                    room_type = room.get("type", "")
-                                    room_id = room.get("id", "")
-                                    room_desc = room.get("description", "")
-                                    context_parts.append(f"  - {room_name}")
-                                    if room_type:
-                                        context_parts.append(f" (Type: {room_type})")
-                                    if room_id:
-                                        context_parts.append(f" [ID: {room_id}]")
-                                    context_parts.append("\n")
-                                    if room_desc:
-                                        context_parts.append(f"    Description: {room_desc}\n")
-                                
-                    except Exception as e:
-                        logger.warning(f"Could not fetch details for property {property_id}: {e}")
-                
-                context_parts.append("\n")
-            
-            # Step 4: Add comprehensive summary statistics
-            context_parts.append("\n" + "=" * 50 + "\n")
-            context_parts.append("SUMMARY & STATISTICS\n")
-            context_parts.append("=" * 50 + "\n")
-            
-            context_parts.append(f"Total Properties: {total_count}\n")
-            
-            active_count = len([p for p in properties if p.get('status', False)])
-            inactive_count = total_count - active_count
-            context_parts.append(f"Status Breakdown:\n")
-            context_parts.append(f"  - Active: {active_count} properties\n")
-            context_parts.append(f"  - Inactive: {inactive_count} properties\n")
-            
-            # Property types summary
-            property_types = {}
-            for prop in properties:
-                prop_type = prop.get('typeCode', 'Unknown')
-                property_types[prop_type] = property_types.get(prop_type, 0) + 1
-            
-            if property_types:
-                context_parts.append(f"\nProperty Types:\n")
-                for ptype, count in property_types.items():
-                    context_parts.append(f"  - {ptype}: {count}\n")
-            
-            # Location summary
-            cities = {}
-            for prop in properties:
-                city = prop.get('city', 'Unknown')
-                if city:
-                    cities[city] = cities.get(city, 0) + 1
-            
-            if cities:
-                context_parts.append(f"\nLocations:\n")
-                for city, count in cities.items():
-                    context_parts.append(f"  - {city}: {count} properties\n")
-            
-            # Capacity summary
-            total_max_occupancy = sum(p.get('maxOccupancy', 0) for p in properties if p.get('maxOccupancy'))
-            total_bedrooms = sum(p.get('bedrooms', 0) for p in properties if p.get('bedrooms'))
-            
-            if total_max_occupancy > 0:
-                context_parts.append(f"\nTotal Capacity:\n")
-                context_parts.append(f"  - Combined Max Occupancy: {total_max_occupancy} guests\n")
-                context_parts.append(f"  - Total Bedrooms: {total_bedrooms}\n")
-            
-            # Integration summary
-            integrations_count = {}
-            for prop in properties:
-                for integration in prop.get('integrations', []):
-                    source = integration.get('source', 'unknown')
-                    integrations_count[source] = integrations_count.get(source, 0) + 1
-            
-            if integrations_count:
-                context_parts.append(f"\nOTA Integrations:\n")
-                for source, count in integrations_count.items():
-                    context_parts.append(f"  - {source.title()}: {count} properties\n")
-            
-            # Knowledge base summary
-            kb_complete = len([p for p in properties if p.get('knowledgePercentage', 0) >= 80])
-            kb_partial = len([p for p in properties if 0 < p.get('knowledgePercentage', 0) < 80])
-            kb_empty = len([p for p in properties if p.get('knowledgePercentage', 0) == 0])
-            
-            context_parts.append(f"\nKnowledge Base Completion:\n")
-            context_parts.append(f"  - Complete (80%+): {kb_complete} properties\n")
-            context_parts.append(f"  - Partial (1-79%): {kb_partial} properties\n")
-            context_parts.append(f"  - Empty (0%): {kb_empty} properties\n")
-            
-            # Join all parts into final context
-            context_text = "".join(context_parts)
+            parts = [
+                f"Property {property_detail.get('name', 'Unknown')} (ID {property_id})\n",
+                f"Sections: {', '.join(sections)}\n"
+            ]
+            mark = len(parts)
+            max_tokens = arguments.get("max_tokens") or CONTEXT_MAX_TOKENS
+            language = arguments.get("language")
+            omitted: Dict[str, int] = {}
+            if max_tokens or language:
+                rendered = render_sections(
+                    property_detail, sections, language, DESCRIPTION_MAX_CHARS if max_tokens else None
+                )
+                if max_tokens:
+                    fixed = estimate_tokens("".join(parts)) + estimate_tokens(render_omitted_note(dict.fromkeys(sections, 1)))
+                    [rendered], omitted = fit_to_budget([rendered], max_tokens - fixed, sections)
+                parts.extend(text for _, text in rendered)
+            else:
+                render_property_detail(property_detail, parts, sections)
+            if len(parts) == mark and not omitted:
+                parts.append("No information is recorded for these sections.\n")
+            parts.append(render_omitted_note(omitted))
             
             return [TextContent(
                 type="text",
-                text=context_text
+                text="".join(parts)
             )]
             
         except Exception as e:
-            logger.error(f"Error in get_customer_properties_context: {e}")
+            logger.error(f"Error in get_property_details: {e}")
             return [TextContent(
                 type="text",
-                text=f"Error fetching property context: {str(e)}"
+                text=f"Error fetching property details: {str(e)}"
             )]
     
+    @staticmethod
+    def _price_stay(pricing_settings: Dict[str, Any], nights: int, guest_count: int, include_pets: bool) -> Dict[str, Any]:
+        """Price breakdown of a stay from a property's pricingSettings"""
+        base_price = pricing_settings.get("basePrice", 0)
+        cleaning_fee = pricing_settings.get("cleaningFee", 0)
+        pet_fee = pricing_settings.get("petFee", 0) if include_pets else 0
+        extra_person_fee = pricing_settings.get("extraPersonFee", 0)
+        guests_included = pricing_settings.get("guestsIncludedInRegularFee", 0)
+        
+        # Calculate accommodation cost
+        accommodation_total = base_price * nights
+        
+        # Calculate extra person fees
+        extra_persons = max(0, guest_count - guests_included) if guests_included > 0 else 0
+        extra_person_total = extra_persons * extra_person_fee * nights
+        
+        return {
+            "base_price": base_price,
+            "currency": pricing_settings.get("currency", "EUR"),
+            "cleaning_fee": cleaning_fee,
+            "security_deposit": pricing_settings.get("securityDepositFee", 0),
+            "pet_fee": pet_fee,
+            "extra_person_fee": extra_person_fee,
+            "accommodation_total": accommodation_total,
+            "extra_persons": extra_persons,
+            "extra_person_total": extra_person_total,
+            "total": accommodation_total + extra_person_total + cleaning_fee + pet_fee
+        }
+    
+    async def _property_occupancy(self, property_id: str) -> OccupancyIndex:
+        """Booked nights of the property, from the occupancy index when enabled"""
+        if self.occupancy is not None:
+            return await self.occupancy.get(property_id)
+        return OccupancyIndex.from_reservations(await fetch_reservations(self.api_client, property_id))
+    
     async def _check_property_availability_and_pricing(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """
         Check property availability and calculate pricing for specific dates
         """
         try:
-            from datetime import datetime
+            from datetime import date, datetime, timedelta
             
             # Extract arguments
             property_id = arguments.get("property_id")
@@ -633,6 +580,7 @@ class PMSTools:
             check_out_date = arguments.get("check_out_date")
             guest_count = arguments.get("guest_count", 1)
             include_pets = arguments.get("include_pets", False)
+            suggest_alternatives = int(arguments.get("suggest_alternatives", SUGGESTED_ALTERNATIVES) or 0)
             
             # Validate dates
             try:
@@ -683,62 +631,40 @@ class PMSTools:
                 )]
             
             # Step 2: Check for existing reservations (basic availability)
-            try:
-                reservations_response = await self.api_client.get("/api/Reservation/Get", params={
-                    "propertyId": property_id,
-                    "pageSize": 1000  # Get many to check dates
-                })
-            except Exception as e:
-                # If we get a 204 or other error, assume no reservations
-                logger.debug(f"No reservations found or error checking: {e}")
-                reservations_response = None
-            
-            is_available = True
+            # None = the reservations could not be loaded, so availability is unknown
+            is_available: Optional[bool] = True
             conflicting_dates = []
+            alternatives = None
             
-            if reservations_response and isinstance(reservations_response, dict) and "items" in reservations_response:
-                reservations = reservations_response.get("items", [])
-                
-                for reservation in reservations:
-                    # Skip cancelled reservations
-                    if reservation.get("status") in ["Cancelled", "Declined"]:
-                        continue
-                    
-                    res_checkin = reservation.get("checkIn")
-                    res_checkout = reservation.get("checkOut")
-                    
-                    if res_checkin and res_checkout:
-                        try:
-                            res_in = datetime.strptime(res_checkin.split("T")[0], "%Y-%m-%d")
-                            res_out = datetime.strptime(res_checkout.split("T")[0], "%Y-%m-%d")
-                            
-                            # Check for date overlap
-                            if not (check_out <= res_in or check_in >= res_out):
-                                is_available = False
-                                conflicting_dates.append(f"{res_in.strftime('%Y-%m-%d')} to {res_out.strftime('%Y-%m-%d')}")
-                        except:
-                            continue
+            try:
+                occupancy = await self._property_occupancy(property_id)
+            except Exception as e:
+                # A property without reservations yields an empty index, so this is a real failure
+                logger.warning(f"Could not load reservations for property {property_id}: {e}")
+                occupancy = None
+                is_available = None
+            
+            if occupancy is not None:
+                for res_in, res_out in occupancy.conflicts(check_in.date(), check_out.date()):
+                    is_available = False
+                    conflicting_dates.append(f"{res_in.isoformat()} to {res_out.isoformat()}")
+                if not is_available and suggest_alternatives:
+                    alternatives = occupancy.nearest_free_windows(
+                        check_in.date(), nights, suggest_alternatives, earliest=date.today()
+                    )
             
             # Step 3: Calculate pricing
-            pricing_settings = property_detail.get("pricingSettings", {})
-            base_price = pricing_settings.get("basePrice", 0)
-            currency = pricing_settings.get("currency", "EUR")
-            cleaning_fee = pricing_settings.get("cleaningFee", 0)
-            security_deposit = pricing_settings.get("securityDepositFee", 0)
-            pet_fee = pricing_settings.get("petFee", 0) if include_pets else 0
-            extra_person_fee = pricing_settings.get("extraPersonFee", 0)
-            guests_included = pricing_settings.get("guestsIncludedInRegularFee", 0)
-            
-            # Calculate accommodation cost
-            accommodation_total = base_price * nights
-            
-            # Calculate extra person fees
-            extra_persons = max(0, guest_count - guests_included) if guests_included > 0 else 0
-            extra_person_total = extra_persons * extra_person_fee * nights
-            
-            # Calculate total
-            subtotal = accommodation_total + extra_person_total
-            total_cost = subtotal + cleaning_fee + pet_fee
+            quote = self._price_stay(property_detail.get("pricingSettings", {}), nights, guest_count, include_pets)
+            base_price = quote["base_price"]
+            currency = quote["currency"]
+            cleaning_fee = quote["cleaning_fee"]
+            security_deposit = quote["security_deposit"]
+            pet_fee = quote["pet_fee"]
+            extra_person_fee = quote["extra_person_fee"]
+            accommodation_total = quote["accommodation_total"]
+            extra_persons = quote["extra_persons"]
+            extra_person_total = quote["extra_person_total"]
+            total_cost = quote["total"]
             
             # Build response
             response_parts = [
@@ -753,12 +679,23 @@ class PMSTools:
             
             response_parts.append("\nAvailability\n")
             
-            if is_available:
+            if is_available is None:
+                response_parts.append(
+                    "Not Verified - Existing bookings could not be loaded right now, so availability "
+                    "for these dates is unknown. Please check again shortly before confirming.\n"
+                )
+            elif is_available:
                 response_parts.append("Available - These dates are available for booking.\n")
             else:
                 response_parts.append("Not Available - These dates conflict with existing bookings:\n")
                 for conflict in conflicting_dates:
                     response_parts.append(f"   {conflict}\n")
+                if alternatives:
+                    response_parts.append(f"Nearest available dates for {nights} nights:\n")
+                    for alternative in alternatives:
+                        response_parts.append(f"   {alternative.isoformat()} to {(alternative + timedelta(days=nights)).isoformat()}\n")
+                elif alternatives is not None:
+                    response_parts.append(f"No other {nights}-night stay is free within {ALTERNATIVE_HORIZON_DAYS} days of these dates.\n")
             
             response_parts.append("\nPricing Breakdown\n")
             response_parts.append(f"Accommodation: {currency} {accommodation_total:,.2f} ({currency} {base_price}/night × {nights} nights)\n")
@@ -793,4 +730,137 @@ class PMSTools:
             return [TextContent(
                 type="text",
                 text=f"Error checking availability and pricing: {str(e)}"
-            )]
\ No newline at end of file
+            )]
+    
+    async def _search_available_properties(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """
+        Check every active property for the given stay in one call
+        """
+        try:
+            from datetime import datetime
+            
+            check_in_date = arguments.get("check_in_date")
+            check_out_date = arguments.get("check_out_date")
+            guest_count = arguments.get("guest_count", 1)
+            include_pets = arguments.get("include_pets", False)
+            max_results = max(int(arguments.get("max_results") or SEARCH_MAX_RESULTS), 1)
+            
+            try:
+                check_in = datetime.strptime(check_in_date, "%Y-%m-%d").date()
+                check_out = datetime.strptime(check_out_date, "%Y-%m-%d").date()
+            except (TypeError, ValueError):
+                return [TextContent(
+                    type="text",
+                    text="Error: Invalid date format. Please use YYYY-MM-DD format."
+                )]
+            if check_out <= check_in:
+                return [TextContent(
+                    type="text",
+                    text="Error: Check-out date must be after check-in date."
+                )]
+            nights = (check_out - check_in).days
+            
+            # Summaries rule out properties that are too small before any reservation is loaded.
+            # A failed or short listing must not read as "nothing is available"
+            try:
+                properties, _ = await self._list_properties(False, strict=True)
+            except Exception as e:
+                logger.warning(f"Could not list properties for availability search: {e}")
+                return [TextContent(
+                    type="text",
+                    text=(
+                        "Availability Search\n"
+                        f"Dates: {check_in_date} to {check_out_date} ({nights} nights)\n"
+                        f"Guests: {guest_count}\n"
+                        "\nNot Verified - The property list could not be loaded right now, so the search "
+                        "can't be completed. Please try again shortly.\n"
+                    )
+                )]
+            candidates = [
+                p for p in properties
+                if p.get("id") and p.get("status", False) and (p.get("maxOccupancy") or guest_count) >= guest_count
+            ]
+            
+            semaphore = asyncio.Semaphore(self.detail_concurrency)
+            
+            async def load(property_id: str) -> Optional[OccupancyIndex]:
+                async with semaphore:
+                    try:
+                        return await self._property_occupancy(property_id)
+                    except Exception as e:
+                        logger.warning(f"Could not load reservations for property {property_id}: {e}")
+                        return None
+            
+            indexes = await asyncio.gather(*(load(p["id"]) for p in candidates))
+            unchecked = sum(index is None for index in indexes)
+            # Each property's check is a bisect on its occupancy index
+            free_properties = [
+                p for p, index in zip(candidates, indexes)
+                if index is not None and index.is_available(check_in, check_out)
+            ]
+            
+            details = await self._fetch_property_details([p["id"] for p in free_properties])
+            matches = []
+            for summary, detail in zip(free_properties, details):
+                if not detail:
+                    unchecked += 1
+                    continue
+                max_occupancy = detail.get("maxOccupancy") or summary.get("maxOccupancy") or 0
+                if max_occupancy < guest_count:
+                    continue
+                if include_pets and detail.get("maxPets") == 0:
+                    continue
+                quote = self._price_stay(detail.get("pricingSettings") or {}, nights, guest_count, include_pets)
+                matches.append((quote["total"], max_occupancy - guest_count, summary, detail, quote))
+            
+            # Cheapest first; among equal prices the closest fit for the party
+            matches.sort(key=lambda match: (match[0], match[1]))
+            
+            response_parts = [
+                f"Availability Search\n",
+                f"Dates: {check_in_date} to {check_out_date} ({nights} nights)\n",
+                f"Guests: {guest_count}\n"
+            ]
+            if include_pets:
+                response_parts.append("Pets: Yes\n")
+            
+            if not matches and unchecked:
+                response_parts.append(
+                    f"\nNot Verified - No available property was found, but {unchecked} properties could not be "
+                    "checked right now, so availability for these dates is unknown. Please try again shortly.\n"
+                )
+            elif not matches:
+                response_parts.append("\nNo properties are available for these dates and guests.\n")
+            else:
+                response_parts.append(f"\n{len(matches)} of {len(properties)} properties are available:\n")
+                for rank, (total, _, summary, detail, quote) in enumerate(matches[:max_results], 1):
+                    currency = quote["currency"]
+                    line = (
+                        f"{rank}. {detail.get('name') or summary.get('name', 'Unknown')} (ID {summary['id']}): "
+                        f"{currency} {total:,.2f} total ({currency} {quote['base_price']}/night), "
+                        f"up to {detail.get('maxOccupancy') or summary.get('maxOccupancy')} guests"
+                    )
+                    city = detail.get("city") or summary.get("city")
+                    if city:
+                        line += f", {city}"
+                    response_parts.append(line + "\n")
+                if len(matches) > max_results:
+                    response_parts.append(f"{len(matches) - max_results} more available properties are not listed.\n")
+                response_parts.append(
+                    "\nUse check_property_availability_and_pricing with a property ID for the full price breakdown.\n"
+                )
+            
+            if unchecked and matches:
+                response_parts.append(f"\nNote: {unchecked} properties could not be checked right now.\n")
+            
+            return [TextContent(
+                type="text",
+                text="".join(response_parts)
+            )]
+            
+        except Exception as e:
+            logger.error(f"Error in search_available_properties: {e}")
+            return [TextContent(
+                type="text",
+                text=f"Error searching available properties: {str(e)}"
+            )]
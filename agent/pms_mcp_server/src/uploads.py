@@ -0,0 +1,129 @@
+"""
+Streaming request bodies for PMS file uploads
+
+Files are read in fixed-size chunks and encoded on the fly (multipart or a
+base64 field inside a JSON object), so memory use does not grow with the file.
+A source given as a path can be re-read from the start, which lets uploads
+be retried; an async iterator can only be sent once.
+"""
+
+import os
+import json
+import base64
+import asyncio
+import mimetypes
+import uuid
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Optional, Tuple, Union
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("PMS_UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+# A path on disk or an async iterator of bytes
+UploadSource = Union[str, "os.PathLike[str]", AsyncIterable[bytes]]
+
+BodyFactory = Callable[[], AsyncIterator[bytes]]
+
+
+def is_restartable(source: UploadSource) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+async def iter_file(path: Union[str, "os.PathLike[str]"], chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read path in chunks without blocking the event loop"""
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+def _open_source(source: UploadSource) -> AsyncIterator[bytes]:
+    if is_restartable(source):
+        return iter_file(source)
+    return source.__aiter__()
+
+
+async def _base64_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Base64-encode a byte stream, carrying partial 3-byte groups between chunks"""
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk
+        cut = len(data) - len(data) % 3
+        remainder = data[cut:]
+        if cut:
+            yield base64.b64encode(data[:cut])
+    if remainder:
+        yield base64.b64encode(remainder)
+
+
+def base64_length(size: int) -> int:
+    return (size + 2) // 3 * 4
+
+
+def multipart_body(
+    source: UploadSource,
+    filename: str,
+    fields: Optional[Dict[str, Any]] = None,
+    file_field: str = "file",
+    content_type: Optional[str] = None
+) -> Tuple[BodyFactory, Dict[str, str]]:
+    """
+    Build a multipart/form-data upload.
+
+    Returns a factory producing a fresh body stream on every call, and the
+    request headers (with Content-Length when the source is a file).
+    """
+    boundary = uuid.uuid4().hex
+    filename = filename.replace('"', "%22")
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in (fields or {}).items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in _open_source(source):
+            yield chunk
+        yield tail
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    if is_restartable(source):
+        headers["Content-Length"] = str(len(head) + os.path.getsize(source) + len(tail))
+    return body, headers
+
+
+def base64_json_body(
+    source: UploadSource,
+    data_field: str,
+    fields: Dict[str, Any]
+) -> Tuple[BodyFactory, Dict[str, str]]:
+    """
+    Build a JSON object whose `data_field` holds the source base64-encoded.
+
+    Base64 output needs no JSON escaping, so it is streamed between the quotes
+    of the field as it is produced.
+    """
+    other = json.dumps(fields)[1:-1]
+    head = ("{" + (other + ", " if other else "") + json.dumps(data_field) + ': "').encode()
+    tail = b'"}'
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in _base64_chunks(_open_source(source)):
+            yield chunk
+        yield tail
+
+    headers = {"Content-Type": "application/json"}
+    if is_restartable(source):
+        headers["Content-Length"] = str(len(head) + base64_length(os.path.getsize(source)) + len(tail))
+    return body, headers
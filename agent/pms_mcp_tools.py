@@ -9,7 +9,9 @@ import os
 import logging
 import asyncio
 import json
-from typing import Dict, Any, Optional, List
+import itertools
+import time
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Awaitable, Callable
 from livekit.agents import llm
 import aiohttp
 
@@ -18,73 +20,459 @@ logger = logging.getLogger(__name__)
 # MCP Server configuration
 MCP_SERVER_URL = os.getenv("PMS_MCP_SERVER_URL", "http://localhost:3001")
 MCP_SERVER_TOKEN = os.getenv("PMS_MCP_SERVER_TOKEN", "")
+# Unix domain socket of the co-located MCP server; when set it replaces loopback TCP
+MCP_UNIX_SOCKET = os.getenv("PMS_MCP_UNIX_SOCKET", "")
 
 # PMS API configuration (if needed for direct calls)
 PMS_API_URL = os.getenv("PMS_API_URL", "https://api-dev.botel.ai")
 PMS_API_KEY = os.getenv("PMS_API_KEY", "")
 
 
+# Connection pool tuning for the shared MCP client session
+MCP_POOL_LIMIT = int(os.getenv("PMS_MCP_POOL_LIMIT", "20"))
+MCP_KEEPALIVE_TIMEOUT = float(os.getenv("PMS_MCP_KEEPALIVE_TIMEOUT", "60"))
+MCP_DNS_CACHE_TTL = int(os.getenv("PMS_MCP_DNS_CACHE_TTL", "300"))
+MCP_REQUEST_TIMEOUT = float(os.getenv("PMS_MCP_REQUEST_TIMEOUT", "30"))
+# Time budget the server may spend on PMS requests for one tool call (voice turn)
+MCP_TOOL_DEADLINE = float(os.getenv("PMS_TOOL_DEADLINE", "8"))
+# Tool calls issued within this window share one JSON-RPC batch POST (0 sends each on its own)
+MCP_BATCH_WINDOW = float(os.getenv("PMS_MCP_BATCH_WINDOW_MS", "2")) / 1000.0
+
+
 class PMSMCPClient:
     """Client for interacting with the PMS MCP server"""
     
-    def __init__(self, server_url: str = MCP_SERVER_URL, token: str = MCP_SERVER_TOKEN):
+    def __init__(self, server_url: str = MCP_SERVER_URL, token: str = MCP_SERVER_TOKEN, unix_socket: str = MCP_UNIX_SOCKET):
         self.server_url = server_url.rstrip('/')
+        # PMS_MCP_SERVER_URL usually names the SSE endpoint; /rpc sits next to it
+        if self.server_url.endswith("/sse"):
+            self.server_url = self.server_url[:-len("/sse")]
         self.token = token
+        self.unix_socket = unix_socket
         self.session: Optional[aiohttp.ClientSession] = None
+        # JSON-RPC ids must be unique per request so responses can be matched to calls
+        self._request_ids = itertools.count(1)
+        # Calls waiting for the next batch POST, with the futures their callers await
+        self._batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._batch_task: Optional[asyncio.Task] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session on first use (must run inside the event loop)"""
+        if self.session is None or self.session.closed:
+            if self.unix_socket:
+                # Same-container server: skip TCP entirely, the URL host is ignored
+                connector = aiohttp.UnixConnector(
+                    path=self.unix_socket,
+                    limit=MCP_POOL_LIMIT,
+                    keepalive_timeout=MCP_KEEPALIVE_TIMEOUT,
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=MCP_POOL_LIMIT,
+                    limit_per_host=MCP_POOL_LIMIT,
+                    keepalive_timeout=MCP_KEEPALIVE_TIMEOUT,
+                    use_dns_cache=True,
+                    ttl_dns_cache=MCP_DNS_CACHE_TTL,
+                )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=MCP_REQUEST_TIMEOUT, connect=5.0),
+            )
+        return self.session
+    
+    async def close(self):
+        if self._batch_task and not self._batch_task.done():
+            self._batch_task.cancel()
+        self._batch_task = None
+        for _, future in self._batch:
+            if not future.done():
+                future.set_exception(RuntimeError("MCP client closed"))
+        self._batch = []
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
     
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call a tool on the MCP server"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
+    def _headers(self) -> Dict[str, str]:
         headers = {
             "Content-Type": "application/json",
         }
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
-        
-        payload = {
+        return headers
+    
+    def _build_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a tools/call request with a fresh request id"""
+        return {
             "jsonrpc": "2.0",
             "method": "tools/call",
             "params": {
                 "name": tool_name,
-                "arguments": arguments
+                "arguments": arguments,
+                "_meta": {"deadlineMs": int(MCP_TOOL_DEADLINE * 1000)}
             },
-            "id": 1
+            "id": next(self._request_ids)
         }
+    
+    async def _post_rpc(self, payload: Any) -> Any:
+        """POST a JSON-RPC request to the server and return the decoded body"""
+        session = self._ensure_session()
+        async with session.post(
+            f"{self.server_url}/rpc",
+            json=payload,
+            headers=self._headers()
+        ) as response:
+            if response.status != 200:
+                text = await response.text()
+                logger.error(f"MCP server error: {response.status} - {text}")
+                return {"error": f"Server error: {response.status}"}
+            
+            return await response.json()
+    
+    @staticmethod
+    def _unwrap_result(response: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in response:
+            logger.error(f"MCP RPC error: {response['error']}")
+            return {"error": response["error"]}
         
+        return response.get("result", {})
+    
+    async def _send_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """POST queued calls (as a batch when there are several) and resolve their futures"""
         try:
-            async with self.session.post(
-                f"{self.server_url}/rpc",
-                json=payload,
-                headers=headers
-            ) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    logger.error(f"MCP server error: {response.status} - {text}")
-                    return {"error": f"Server error: {response.status}"}
-                
-                result = await response.json()
-                if "error" in result:
-                    logger.error(f"MCP RPC error: {result['error']}")
-                    return {"error": result["error"]}
-                
-                return result.get("result", {})
+            if len(batch) == 1:
+                responses = [await self._post_rpc(batch[0][0])]
+            else:
+                body = await self._post_rpc([request for request, _ in batch])
+                # A failed POST comes back as one error object for the whole batch
+                if isinstance(body, list):
+                    by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+                    responses = [
+                        by_id.get(request["id"], {"error": "Missing response in batch"})
+                        for request, _ in batch
+                    ]
+                else:
+                    responses = [body] * len(batch)
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        except BaseException as e:
+            # Also on cancellation (client closed), so no caller waits forever
+            error = e if isinstance(e, Exception) else RuntimeError("MCP client closed")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+    
+    async def _flush_after_window(self):
+        """Wait for more calls to join, then send everything queued so far"""
+        await asyncio.sleep(MCP_BATCH_WINDOW)
+        batch, self._batch = self._batch, []
+        self._batch_task = None
+        await self._send_batch(batch)
+    
+    async def _call_batched(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a request for the next batch POST and wait for its own response"""
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((request, future))
+        if self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._flush_after_window())
+        return await future
+    
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a tool on the MCP server; concurrent calls are coalesced into one batch POST"""
+        try:
+            request = self._build_call(tool_name, arguments)
+            if MCP_BATCH_WINDOW > 0:
+                response = await self._call_batched(request)
+            else:
+                response = await self._post_rpc(request)
+            return self._unwrap_result(response)
         except Exception as e:
             logger.error(f"Error calling MCP tool: {e}")
             return {"error": str(e)}
+    
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """The server's tool definitions (name, description, inputSchema), raising on any error"""
+        response = await self._post_rpc({
+            "jsonrpc": "2.0",
+            "method": "tools/list",
+            "params": {},
+            "id": next(self._request_ids)
+        })
+        result = self._unwrap_result(response)
+        if "error" in result:
+            raise RuntimeError(f"tools/list failed: {result['error']}")
+        return result.get("tools", [])
+    
+    async def ping(self) -> bool:
+        """Cheap liveness check that exercises the RPC path (tools/list)"""
+        try:
+            response = await self._post_rpc({
+                "jsonrpc": "2.0",
+                "method": "tools/list",
+                "params": {},
+                "id": next(self._request_ids)
+            })
+            return isinstance(response, dict) and "result" in response
+        except Exception:
+            return False
+
+
+# Process-wide client shared by all tool calls so the connection pool survives between calls
+_shared_client: Optional[PMSMCPClient] = None
+
+
+def get_pms_mcp_client() -> PMSMCPClient:
+    """Return the shared PMSMCPClient, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = PMSMCPClient()
+    return _shared_client
+
+
+async def close_pms_mcp_client():
+    """Close the shared client and its connection pool (call on worker shutdown)"""
+    global _shared_client
+    await mcp_circuit_breaker.stop()
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+
+# Circuit breaker configuration for the MCP path
+MCP_LATENCY_BUDGET = float(os.getenv("PMS_MCP_LATENCY_BUDGET", "3.0"))
+MCP_FAILURE_THRESHOLD = int(os.getenv("PMS_MCP_FAILURE_THRESHOLD", "3"))
+MCP_PROBE_INTERVAL = float(os.getenv("PMS_MCP_PROBE_INTERVAL", "10.0"))
+PMS_CUSTOMER_ID = os.getenv("PMS_CUSTOMER_ID", "")
+
+
+class MCPCircuitBreaker:
+    """
+    Runtime circuit breaker around the MCP server.
+    
+    While closed, calls go to MCP and are hedged with the direct PMS API once
+    they exceed the latency budget. Slow or failed MCP calls count as failures;
+    after ``failure_threshold`` consecutive failures the breaker opens, calls go
+    straight to the direct API, and a background task probes MCP until it
+    answers again and the breaker closes.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    
+    def __init__(
+        self,
+        latency_budget: float = MCP_LATENCY_BUDGET,
+        failure_threshold: int = MCP_FAILURE_THRESHOLD,
+        probe_interval: float = MCP_PROBE_INTERVAL
+    ):
+        self.latency_budget = latency_budget
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+    
+    def record_success(self, latency: float):
+        if latency > self.latency_budget:
+            logger.warning(f"MCP call took {latency:.2f}s (budget {self.latency_budget:.2f}s)")
+            self.record_failure()
+        else:
+            self.consecutive_failures = 0
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+    
+    def _open(self):
+        logger.warning(f"MCP circuit opened after {self.consecutive_failures} failures, using direct PMS API")
+        self.state = self.OPEN
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_until_healthy())
+    
+    def _close(self):
+        logger.info("MCP server healthy again, closing circuit")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+    
+    async def _probe_until_healthy(self):
+        while self.state == self.OPEN:
+            await asyncio.sleep(self.probe_interval)
+            started = time.monotonic()
+            healthy = await get_pms_mcp_client().ping()
+            if healthy and time.monotonic() - started <= self.latency_budget:
+                self._close()
+    
+    async def stop(self):
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
+
+
+mcp_circuit_breaker = MCPCircuitBreaker()
+
+
+def _direct_fallback_available() -> bool:
+    return bool(PMS_API_KEY and PMS_CUSTOMER_ID)
+
+
+CONTEXT_TOOL = "get_customer_properties_context"
+
+
+def _result_text(result: Any) -> str:
+    """Text of a tools/call result (all text items joined)"""
+    if isinstance(result, dict) and isinstance(result.get("content"), list):
+        return "\n".join(item.get("text", "") for item in result["content"] if isinstance(item, dict))
+    return str(result)
+
+
+async def _call_via_mcp(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Call a tool through the MCP server, raising on any error"""
+    result = await get_pms_mcp_client().call_tool(tool_name, arguments)
+    if "error" in result:
+        raise RuntimeError(f"Error calling {tool_name}: {result['error']}")
+    return _result_text(result)
+
+
+async def _timed_mcp_call(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Run the MCP call and report its outcome to the circuit breaker"""
+    started = time.monotonic()
+    try:
+        text = await _call_via_mcp(tool_name, arguments)
+    except asyncio.CancelledError:
+        # Cancelled because the hedged direct call won (MCP was over budget) or the caller went away
+        if time.monotonic() - started > mcp_circuit_breaker.latency_budget:
+            mcp_circuit_breaker.record_failure()
+        raise
+    except Exception:
+        mcp_circuit_breaker.record_failure()
+        raise
+    mcp_circuit_breaker.record_success(time.monotonic() - started)
+    return text
+
+
+async def _hedged_call(
+    tool_name: str,
+    arguments: Dict[str, Any],
+    direct: Optional[Callable[[], Awaitable[str]]] = None
+) -> str:
+    """
+    Call a tool through MCP, racing `direct` (the direct PMS API) when MCP is
+    slower than the latency budget, fails, or the circuit is open.
+    
+    Without a direct path the MCP call is only reported to the breaker.
+    """
+    if direct is None:
+        return await _timed_mcp_call(tool_name, arguments)
+    
+    if mcp_circuit_breaker.is_open:
+        return await direct()
+    
+    mcp_task = asyncio.create_task(_timed_mcp_call(tool_name, arguments))
+    pending = {mcp_task}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=mcp_circuit_breaker.latency_budget)
+        if mcp_task in done and not mcp_task.exception():
+            return mcp_task.result()
+        
+        if mcp_task in done:
+            logger.warning(f"MCP call failed ({mcp_task.exception()}), falling back to direct PMS API")
+        else:
+            logger.warning("MCP call over latency budget, hedging with direct PMS API")
+        
+        direct_task = asyncio.create_task(direct())
+        pending = {direct_task} if mcp_task in done else {mcp_task, direct_task}
+        last_error: Optional[BaseException] = mcp_task.exception() if mcp_task in done else None
+        
+        # Take whichever path succeeds first
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        raise last_error
+    finally:
+        # Also runs when the caller is cancelled, so no path outlives the call
+        for task in pending:
+            task.cancel()
+
+
+def _direct_path(tool_name: str, arguments: Dict[str, Any]) -> Optional[Callable[[], Awaitable[str]]]:
+    """Direct PMS API equivalent of a tool call, if there is one"""
+    if tool_name != CONTEXT_TOOL or not _direct_fallback_available():
+        return None
+    include_inactive = bool(arguments.get("include_inactive", False))
+    return lambda: _fetch_context_direct(PMS_CUSTOMER_ID, include_inactive)
+
+
+async def _hedged_properties_context(include_inactive: bool) -> str:
+    """The full property context, MCP first with the direct PMS API as hedge"""
+    # The fallback tool is the agent's only PMS tool, so it needs every detail
+    arguments = {"include_inactive": include_inactive, "format": "full"}
+    return await _hedged_call(CONTEXT_TOOL, arguments, _direct_path(CONTEXT_TOOL, arguments))
+
+
+def _make_mcp_function_tool(name: str, description: str, parameters: Dict[str, Any]):
+    async def call_pms_tool(raw_arguments: Dict[str, Any]) -> str:
+        arguments = raw_arguments or {}
+        try:
+            return await _hedged_call(name, arguments, _direct_path(name, arguments))
+        except Exception as e:
+            logger.error(f"Error in {name}: {e}")
+            return f"I apologize, but I couldn't reach the property system at this moment. Error: {str(e)}"
+    
+    return llm.function_tool(
+        call_pms_tool,
+        raw_schema={
+            "name": name,
+            "description": description,
+            "parameters": parameters,
+        },
+    )
+
+
+async def build_mcp_pms_tools() -> List[Any]:
+    """
+    Register the MCP server's tools as LiveKit function tools.
+    
+    Calls go to the server's /rpc route through the shared PMSMCPClient, so
+    every one passes the circuit breaker and the properties context is hedged
+    with the direct PMS API. If the server can't list its tools, only the
+    fallback context tool is returned.
+    """
+    try:
+        tools = await get_pms_mcp_client().list_tools()
+    except Exception as e:
+        logger.warning(f"Could not list MCP tools ({e}), using the fallback context tool only")
+        return [get_customer_properties_context]
+    
+    logger.info(f"Registering {len(tools)} MCP-backed PMS tools: {', '.join(tool['name'] for tool in tools)}")
+    return [
+        _make_mcp_function_tool(tool["name"], tool.get("description") or "", tool.get("inputSchema") or {})
+        for tool in tools
+    ]
 
 
 # Create the LiveKit tool function
-@llm.ai_callable(
+@llm.function_tool(
     description="""Get comprehensive context about all properties belonging to the current customer.
     This tool fetches property information from the PMS system to provide context for conversations.
     
@@ -112,23 +500,8 @@ async def get_customer_properties_context(
         A formatted string containing comprehensive property context
     """
     try:
-        # Try to use MCP server first
-        async with PMSMCPClient() as client:
-            result = await client.call_tool(
-                "get_customer_properties_context",
-                {"include_inactive": include_inactive}
-            )
-            
-            if "error" in result:
-                return f"Error fetching property context: {result['error']}"
-            
-            # Extract the text content from the result
-            if isinstance(result, dict) and "content" in result:
-                content = result["content"]
-                if isinstance(content, list) and len(content) > 0:
-                    return content[0].get("text", "No property information available")
-            
-            return str(result)
+        # MCP first, with a circuit-breaker guarded fallback to the direct API
+        return await _hedged_properties_context(include_inactive)
             
     except Exception as e:
         logger.error(f"Error in get_customer_properties_context: {e}")
@@ -136,52 +509,119 @@ async def get_customer_properties_context(
 
 
 # Alternative direct API implementation (fallback)
-async def get_customer_properties_direct(
+DIRECT_PAGE_SIZE = 100
+DIRECT_PAGE_CONCURRENCY = int(os.getenv("PMS_DIRECT_PAGE_CONCURRENCY", "4"))
+
+
+async def _iter_property_pages(
+    session: aiohttp.ClientSession,
     customer_id: str,
-    include_inactive: bool = False
-) -> str:
+    include_inactive: bool = False,
+    page_size: int = DIRECT_PAGE_SIZE,
+    concurrency: int = DIRECT_PAGE_CONCURRENCY
+) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
     """
-    Direct API call to PMS system (fallback if MCP server is unavailable)
+    Yield ``(total_count, items)`` for every page of /api/Property/GetAll.
+    
+    The first page is fetched alone to learn ``totalCount``; the remaining
+    pages are then requested concurrently (bounded by ``concurrency``) and
+    yielded in page order as soon as each one is ready. A first page shorter
+    than both ``page_size`` and the total means the server caps the page
+    size, and later pages are requested at that size. Raises if fewer items
+    than ``totalCount`` arrive, so a truncated listing is never taken as complete.
     """
-    try:
-        headers = {
-            "x-api-key": PMS_API_KEY,
-            "x-customer-id": customer_id,
-            "Content-Type": "application/json"
-        }
-        
-        params = {
-            "PageSize": 100,
-            "Status": None if include_inactive else True
-        }
-        
-        async with aiohttp.ClientSession() as session:
+    headers = {
+        "x-api-key": PMS_API_KEY,
+        "x-customer-id": customer_id,
+        "Content-Type": "application/json"
+    }
+    base_params = {"PageSize": page_size}
+    if not include_inactive:
+        base_params["Status"] = "true"
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_page(page_index: int) -> Dict[str, Any]:
+        async with semaphore:
             async with session.get(
                 f"{PMS_API_URL}/api/Property/GetAll",
                 headers=headers,
-                params=params
+                params={**base_params, "PageIndex": page_index}
             ) as response:
                 if response.status != 200:
-                    return f"Error fetching properties: HTTP {response.status}"
-                
-                data = await response.json()
-                properties = data.get("items", [])
-                total_count = data.get("totalCount", 0)
-                
-                # Format the response
-                context_parts = [
-                    f"Customer Property Context\n",
-                    f"Total Properties: {total_count}\n",
-                    f"Active Properties: {len([p for p in properties if p.get('status', False)])}\n\n"
-                ]
-                
-                for idx, prop in enumerate(properties, 1):
-                    context_parts.append(f"Property {idx}: {prop.get('name', 'Unknown')}\n")
-                    context_parts.append(f"Status: {'Active' if prop.get('status', False) else 'Inactive'}\n")
-                    context_parts.append(f"ID: {prop.get('id')}\n\n")
-                
-                return "".join(context_parts)
-                
+                    raise RuntimeError(f"Error fetching properties page {page_index}: HTTP {response.status}")
+                return await response.json()
+    
+    # PMS API uses 1-based page indexing
+    first_page = await fetch_page(1)
+    total_count = first_page.get("totalCount", 0)
+    first_items = first_page.get("items", [])
+    yield total_count, first_items
+    
+    received = len(first_items)
+    if not first_items or received >= total_count:
+        if received < total_count:
+            raise RuntimeError(f"Property listing incomplete: {received} of {total_count} items")
+        return
+    
+    if received < page_size:
+        # The server capped the page size; later page indexes follow its size
+        logger.info(f"Property/GetAll returned {received} of {page_size} requested items per page")
+        page_size = received
+    
+    page_count = -(-total_count // page_size)
+    tasks = [asyncio.create_task(fetch_page(page_index)) for page_index in range(2, page_count + 1)]
+    try:
+        for task in tasks:
+            page = await task
+            items = page.get("items", [])
+            received += len(items)
+            yield total_count, items
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    if received < total_count:
+        raise RuntimeError(f"Property listing incomplete: {received} of {total_count} items")
+
+
+async def _fetch_context_direct(customer_id: str, include_inactive: bool = False) -> str:
+    """Fetch a basic property context straight from the PMS API, raising on any error"""
+    total_count = 0
+    active_count = 0
+    property_parts = []
+    idx = 0
+    
+    async with aiohttp.ClientSession() as session:
+        async for total_count, properties in _iter_property_pages(session, customer_id, include_inactive):
+            for prop in properties:
+                idx += 1
+                is_active = prop.get("status", False)
+                active_count += 1 if is_active else 0
+                property_parts.append(f"Property {idx}: {prop.get('name', 'Unknown')}\n")
+                property_parts.append(f"Status: {'Active' if is_active else 'Inactive'}\n")
+                property_parts.append(f"ID: {prop.get('id')}\n\n")
+    
+    # Format the response
+    context_parts = [
+        f"Customer Property Context\n",
+        f"Total Properties: {total_count}\n",
+        f"Active Properties: {active_count}\n\n"
+    ]
+    context_parts.extend(property_parts)
+    
+    return "".join(context_parts)
+
+
+async def get_customer_properties_direct(
+    customer_id: str,
+    include_inactive: bool = False
+) -> str:
+    """
+    Direct API call to PMS system (fallback if MCP server is unavailable)
+    """
+    try:
+        return await _fetch_context_direct(customer_id, include_inactive)
     except Exception as e:
         logger.error(f"Error in direct API call: {e}")
         return f"Error fetching property information: {str(e)}"
@@ -191,13 +631,12 @@ async def get_customer_properties_direct(
 async def test_mcp_connection():
     """Test if the MCP server is accessible"""
     try:
-        async with PMSMCPClient() as client:
-            # Try to call the tool with a simple request
-            result = await client.call_tool(
-                "get_customer_properties_context",
-                {"include_inactive": False}
-            )
-            return "error" not in result
+        # Try to call the tool with a simple request
+        result = await get_pms_mcp_client().call_tool(
+            "get_customer_properties_context",
+            {"include_inactive": False}
+        )
+        return "error" not in result
     except:
         return False
 